@@ -0,0 +1,68 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from .. import schemas
+from ..core import archive, backup, jobs, profiler, tenants
+from ..core.metrics import TimedRoute
+from ..database import get_db
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], route_class=TimedRoute)
+
+
+@router.get("/profiler", response_model=profiler.ProfilerReport)
+def read_profiler():
+    """SQL 프로파일러 설정 및 라우트별 쿼리 통계, 최근 느린 쿼리/N+1 의심 목록"""
+    return profiler.report()
+
+
+@router.put("/profiler", response_model=profiler.ProfilerSettings)
+def update_profiler(update: profiler.ProfilerSettingsUpdate):
+    """SQL 프로파일러 설정 변경 (실행 중 켜기/끄기, 임계값 조정)"""
+    return profiler.update_settings(update)
+
+
+@router.delete("/profiler", status_code=204)
+def reset_profiler():
+    """SQL 프로파일러 통계 초기화"""
+    profiler.reset()
+
+
+@router.get("/archives", response_model=List[schemas.TransactionArchiveResponse])
+def read_archives(db: Session = Depends(get_db)):
+    """보관된 연도 목록"""
+    return [archived._asdict() for archived in archive.list_archives(db)]
+
+
+@router.post("/archives/{year}", response_model=schemas.TransactionArchiveResponse)
+def archive_year(year: int, db: Session = Depends(get_db)):
+    """마감된 연도의 거래를 읽기 전용 보관 파일로 옮김 (이미 보관된 연도면 이후 추가된 거래를 합침)"""
+    try:
+        archived = archive.archive_year(db, year)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return archived._asdict()
+
+
+@router.get("/backups", response_model=List[schemas.BackupFile])
+def read_backups(db: Session = Depends(get_db)):
+    """저장된 데이터베이스 백업 목록 (최신순)"""
+    return backup.list_backups(tenants.tenant_of(db.get_bind()))
+
+
+@router.post("/backups", response_model=schemas.BackupStatus, status_code=202)
+def create_backup(db: Session = Depends(get_db)):
+    """온라인 백업을 백그라운드에서 시작 (진행률은 GET /api/admin/backups/status)"""
+    if backup.is_running():
+        raise HTTPException(status_code=409, detail="A backup is already running")
+    jobs.submit(backup.run_backup, tenants.tenant_of(db.get_bind()))
+    return backup.status()
+
+
+@router.get("/backups/status", response_model=schemas.BackupStatus)
+def read_backup_status():
+    """진행 중인 백업의 페이지 진행률과 마지막 백업 결과 (소요 시간, 처리량, 쓰기 대기 시간)"""
+    return backup.status()
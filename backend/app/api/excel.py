@@ -1,57 +1,93 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File
 from fastapi.responses import StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-import pandas as pd
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import io
+import logging
+import os
+import shutil
+import uuid
+import zipfile
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import List
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Tuple
 
-from .. import crud, schemas, models
-from ..database import get_db
+from .. import config, crud, schemas, models
+from ..core import archive, compression, jobs, metrics, recurring, reports, snapshot, tenants
+from ..core.metrics import TimedRoute
+from ..database import get_db, open_session
 
-router = APIRouter(prefix="/api/excel", tags=["excel"])
+router = APIRouter(prefix="/api/excel", tags=["excel"], route_class=TimedRoute)
+
+logger = logging.getLogger(__name__)
+
+# pandas/openpyxl은 임포트·내보내기 요청이 처음 들어올 때 로드 (서버 기동 시간 단축)
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def read_kakaopay_frame(file_content: bytes, filename: str) -> "pd.DataFrame":
+    """카카오페이 CSV/Excel 파일을 DataFrame으로 읽기 (필수 컬럼 확인)"""
+    import pandas as pd
+    
+    if filename.endswith('.csv'):
+        df = pd.read_csv(io.BytesIO(file_content), encoding='utf-8')
+    else:
+        df = pd.read_excel(io.BytesIO(file_content))
+    
+    # 카카오페이 포맷 확인
+    if not {'날짜', '사용처', '금액'}.issubset(df.columns):
+        raise ValueError("Unsupported file format")
+    return df
+
+
+def parse_kakaopay_row(row: dict) -> schemas.TransactionCreate:
+    """카카오페이 내보내기 한 행(컬럼명 -> 값)을 거래로 변환 (형식 오류 시 예외)"""
+    # 날짜 파싱 ('2026-01-05 13:27:36', Excel 날짜 셀은 이미 datetime)
+    date = row['날짜']
+    if not isinstance(date, datetime):
+        date = datetime.fromisoformat(str(date))
+    
+    # 금액 파싱 ('+448,300원' -> 448300)
+    amount_str = str(row['금액']).replace('+', '').replace('-', '').replace(',', '').replace('원', '').strip()
+    amount = float(amount_str)
+    
+    # 수입/지출 구분 (+ -> income, - -> expense)
+    is_income = '+' in str(row['금액'])
+    trans_type = models.TransactionType.INCOME if is_income else models.TransactionType.EXPENSE
+    
+    # 상태 (취소 -> cancelled, 그 외 -> completed)
+    status_str = str(row.get('상태', '')).strip()
+    status = models.TransactionStatus.CANCELLED if status_str == '취소' else models.TransactionStatus.COMPLETED
+    
+    # 사용처
+    description = str(row['사용처']).strip()
+    
+    # 카테고리 자동 분류 (간단한 규칙 기반)
+    category = categorize_transaction(description)
+    
+    return schemas.TransactionCreate(
+        date=date,
+        description=description,
+        amount=amount,
+        category=category,
+        type=trans_type,
+        status=status,
+        note=f"Imported from KakaoPay CSV"
+    )
 
 
 def parse_kakaopay_csv(file_content: bytes) -> List[schemas.TransactionCreate]:
     """카카오페이 CSV 파일 파싱"""
-    # CSV 파일 읽기
-    df = pd.read_csv(io.BytesIO(file_content), encoding='utf-8')
+    df = read_kakaopay_frame(file_content, 'kakaopay.csv')
     
     transactions = []
-    for _, row in df.iterrows():
+    for row in df.to_dict('records'):
         try:
-            # 날짜 파싱
-            date_str = row['날짜']
-            date = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-            
-            # 금액 파싱 ('+448,300원' -> 448300)
-            amount_str = str(row['금액']).replace('+', '').replace('-', '').replace(',', '').replace('원', '').strip()
-            amount = float(amount_str)
-            
-            # 수입/지출 구분 (+ -> income, - -> expense)
-            is_income = '+' in str(row['금액'])
-            trans_type = models.TransactionType.INCOME if is_income else models.TransactionType.EXPENSE
-            
-            # 상태 (취소 -> cancelled, 그 외 -> completed)
-            status_str = str(row.get('상태', '')).strip()
-            status = models.TransactionStatus.CANCELLED if status_str == '취소' else models.TransactionStatus.COMPLETED
-            
-            # 사용처
-            description = str(row['사용처']).strip()
-            
-            # 카테고리 자동 분류 (간단한 규칙 기반)
-            category = categorize_transaction(description)
-            
-            transaction = schemas.TransactionCreate(
-                date=date,
-                description=description,
-                amount=amount,
-                category=category,
-                type=trans_type,
-                status=status,
-                note=f"Imported from KakaoPay CSV"
-            )
-            transactions.append(transaction)
+            transactions.append(parse_kakaopay_row(row))
         except Exception as e:
             print(f"Error parsing row: {row}, error: {e}")
             continue
@@ -82,44 +118,335 @@ def categorize_transaction(description: str) -> str:
         return '기타'
 
 
-@router.post("/import")
-async def import_excel(
+# 임포트 작업: 파싱한 거래를 이 단위로 나눠 저장하고 진행률 갱신
+IMPORT_CHUNK_SIZE = 1000
+
+# 작업 진행률 스트림의 상태 조회 간격 (초)
+JOB_EVENTS_INTERVAL = 0.5
+
+JOB_FINISHED = (models.JobStatus.COMPLETED, models.JobStatus.FAILED)
+
+IMPORT_EXTENSIONS = ('.csv', '.xlsx', '.xls')
+
+
+class ParsedFile(NamedTuple):
+    """파일 하나의 파싱 결과"""
+    name: str
+    transactions: List[schemas.TransactionCreate]
+    failed: int
+    error: Optional[str]
+
+
+def parse_import_file(path: str, name: str, member: Optional[str] = None) -> ParsedFile:
+    """업로드 파일 또는 ZIP 안의 파일(member) 하나 파싱 (프로세스 풀에서 실행)"""
+    if member is None and name.lower().endswith('.zip'):
+        return ParsedFile(name, [], 0, "Invalid ZIP archive")
+    try:
+        if member is None:
+            with open(path, 'rb') as f:
+                content = f.read()
+        else:
+            with zipfile.ZipFile(path) as archive:
+                content = archive.read(member)
+        df = read_kakaopay_frame(content, name)
+    except Exception as e:
+        return ParsedFile(name, [], 0, str(e))
+    
+    transactions = []
+    failed = 0
+    for row in df.to_dict('records'):
+        try:
+            transactions.append(parse_kakaopay_row(row))
+        except Exception:
+            failed += 1
+    return ParsedFile(name, transactions, failed, None)
+
+
+def list_import_sources(uploads: List[Tuple[str, str]]) -> List[Tuple[str, str, Optional[str]]]:
+    """(저장 경로, 파일명) 목록을 파싱할 (경로, 이름, ZIP 멤버) 목록으로 펼치기"""
+    sources = []
+    for path, filename in uploads:
+        if not filename.lower().endswith('.zip'):
+            sources.append((path, filename, None))
+            continue
+        try:
+            with zipfile.ZipFile(path) as archive:
+                members = archive.namelist()
+        except zipfile.BadZipFile:
+            sources.append((path, filename, None))  # 파싱 단계에서 파일 오류(Invalid ZIP archive)로 기록됨
+            continue
+        sources += [
+            (path, f"{filename}/{member}", member)
+            for member in members
+            if member.lower().endswith(IMPORT_EXTENSIONS) and not member.startswith('__MACOSX/')
+        ]
+    return sources
+
+
+def merge_parsed_files(files: List[ParsedFile]) -> Tuple[List[schemas.TransactionCreate], int]:
+    """파일별 결과를 합쳐 날짜순으로 정렬, (거래 목록, 제거한 중복 건수) 반환
+
+    기간이 겹치는 내역서에 같은 거래가 함께 들어 있는 경우를 위해 동일 거래(날짜/사용처/금액/타입/상태)는
+    한 파일 안에 나온 최대 횟수만 남긴다 (같은 파일 안의 반복 거래는 유지).
+    """
+    merged = {}
+    parsed = 0
+    for parsed_file in sorted(files, key=lambda f: f.name):
+        per_file = {}
+        for t in parsed_file.transactions:
+            per_file.setdefault((t.date, t.description, t.amount, t.type, t.status), []).append(t)
+        parsed += len(parsed_file.transactions)
+        for key, items in per_file.items():
+            if len(items) > len(merged.get(key, ())):
+                merged[key] = items
+    
+    transactions = sorted(
+        (t for items in merged.values() for t in items), key=lambda t: t.date
+    )
+    return transactions, parsed - len(transactions)
+
+
+def insert_in_chunks(db: Session, job_id: str, transactions: List[schemas.TransactionCreate]) -> int:
+    """거래를 IMPORT_CHUNK_SIZE 단위로 순서대로 저장하며 진행률 갱신, 저장 건수 반환"""
+    inserted = 0
+    for start in range(0, len(transactions), IMPORT_CHUNK_SIZE):
+        inserted += crud.create_transactions(db, transactions[start:start + IMPORT_CHUNK_SIZE])
+        crud.update_import_job(db, job_id, rows_inserted=inserted)
+    return inserted
+
+
+def refresh_recurring(db: Session, transactions: List[schemas.TransactionCreate]):
+    """저장한 거래의 사용처만 정기 거래 후보 재감지 (실패해도 임포트 결과에는 영향 없음)"""
+    try:
+        recurring.refresh_merchants(db, {t.description for t in transactions})
+    except Exception:
+        logger.exception("Recurring payment detection failed")
+
+
+def run_import_job(tenant: Optional[str], job_id: str, path: str, filename: str):
+    """저장된 업로드 파일을 파싱해 거래로 저장 (작업 풀에서 실행, 진행률은 import_jobs에 기록)"""
+    parsed = inserted = failed = 0
+    with open_session(tenant) as db:
+        try:
+            crud.update_import_job(db, job_id, status=models.JobStatus.RUNNING, started_at=func.now())
+            with open(path, 'rb') as f:
+                df = read_kakaopay_frame(f.read(), filename)
+            crud.update_import_job(db, job_id, rows_total=len(df))
+            
+            batch, saved = [], []
+            for row in df.to_dict('records'):
+                try:
+                    batch.append(parse_kakaopay_row(row))
+                    parsed += 1
+                except Exception:
+                    failed += 1
+                if len(batch) >= IMPORT_CHUNK_SIZE:
+                    inserted += crud.create_transactions(db, batch)
+                    saved.extend(batch)
+                    batch = []
+                    crud.update_import_job(
+                        db, job_id, rows_parsed=parsed, rows_inserted=inserted, rows_failed=failed
+                    )
+            if batch:
+                inserted += crud.create_transactions(db, batch)
+                saved.extend(batch)
+            refresh_recurring(db, saved)
+            
+            crud.update_import_job(
+                db, job_id, status=models.JobStatus.COMPLETED, finished_at=func.now(),
+                rows_parsed=parsed, rows_inserted=inserted, rows_failed=failed
+            )
+        except Exception as e:
+            crud.update_import_job(
+                db, job_id, status=models.JobStatus.FAILED, finished_at=func.now(), error=str(e),
+                rows_parsed=parsed, rows_inserted=inserted, rows_failed=failed
+            )
+        finally:
+            remove_uploads([path])
+
+
+def run_batch_import_job(tenant: Optional[str], job_id: str, uploads: List[Tuple[str, str]]):
+    """여러 업로드 파일/ZIP을 프로세스 풀에서 병렬 파싱 후 합쳐 날짜순으로 일괄 저장"""
+    parsed = inserted = failed = 0
+    errors = []
+    with open_session(tenant) as db:
+        try:
+            crud.update_import_job(db, job_id, status=models.JobStatus.RUNNING, started_at=func.now())
+            sources = list_import_sources(uploads)
+            if not sources:
+                raise ValueError("No CSV or Excel files found")
+            
+            pool = jobs.process_pool()
+            futures = [pool.submit(parse_import_file, *source) for source in sources]
+            files = []
+            for future in as_completed(futures):
+                try:
+                    parsed_file = future.result()
+                except BrokenProcessPool:
+                    jobs.discard_process_pool(pool)
+                    raise
+                files.append(parsed_file)
+                parsed += len(parsed_file.transactions)
+                failed += parsed_file.failed
+                if parsed_file.error:
+                    errors.append(f"{parsed_file.name}: {parsed_file.error}")
+                crud.update_import_job(db, job_id, rows_parsed=parsed, rows_failed=failed)
+            
+            if len(errors) == len(sources):
+                raise ValueError("; ".join(errors))
+            
+            transactions, duplicates = merge_parsed_files(files)
+            crud.update_import_job(db, job_id, rows_total=parsed + failed, rows_duplicate=duplicates)
+            inserted = insert_in_chunks(db, job_id, transactions)
+            refresh_recurring(db, transactions)
+            
+            crud.update_import_job(
+                db, job_id, status=models.JobStatus.COMPLETED, finished_at=func.now(),
+                rows_inserted=inserted, error="; ".join(errors) or None
+            )
+        except Exception as e:
+            crud.update_import_job(
+                db, job_id, status=models.JobStatus.FAILED, finished_at=func.now(), error=str(e),
+                rows_parsed=parsed, rows_inserted=inserted, rows_failed=failed
+            )
+        finally:
+            remove_uploads([path for path, _ in uploads])
+
+
+def remove_uploads(paths: List[str]):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def cancel_import_job(tenant: Optional[str], job_id: str, paths: List[str]):
+    """시작 전에 취소된 작업(서버 종료)을 실패로 기록하고 업로드 파일 삭제"""
+    with open_session(tenant) as db:
+        crud.update_import_job(
+            db, job_id, status=models.JobStatus.FAILED, finished_at=func.now(),
+            error="Cancelled before start (server shutdown)"
+        )
+    remove_uploads(paths)
+
+
+def save_upload(file: UploadFile, path: str):
+    """업로드 파일을 작업이 읽을 경로에 저장"""
+    with metrics.phase("file"):
+        os.makedirs(config.UPLOAD_DIR, exist_ok=True)
+        with open(path, 'wb') as out:
+            shutil.copyfileobj(file.file, out)
+
+
+@router.post("/import", status_code=202, response_model=schemas.ImportJobResponse)
+def import_excel(
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
-    """Excel/CSV 파일 임포트"""
-    if not file.filename.endswith(('.csv', '.xlsx', '.xls')):
+    """Excel/CSV 파일 임포트 작업 등록 (업로드 저장 후 바로 작업 반환, 진행률은 /jobs/{job_id})"""
+    if not file.filename.endswith(IMPORT_EXTENSIONS):
         raise HTTPException(status_code=400, detail="Only CSV and Excel files are supported")
     
-    try:
-        content = await file.read()
-        
-        # CSV 파일인 경우 카카오페이 포맷으로 파싱
-        if file.filename.endswith('.csv'):
-            transactions = parse_kakaopay_csv(content)
-        else:
-            # Excel 파일 처리
-            df = pd.read_excel(io.BytesIO(content))
-            # 카카오페이 포맷 확인
-            if '날짜' in df.columns and '사용처' in df.columns and '금액' in df.columns:
-                # CSV와 동일한 처리
-                transactions = parse_kakaopay_csv(content)
-            else:
-                raise HTTPException(status_code=400, detail="Unsupported Excel format")
-        
-        # 데이터베이스에 저장
-        created_count = 0
-        for trans in transactions:
-            crud.create_transaction(db, trans)
-            created_count += 1
-        
-        return {
-            "message": f"Successfully imported {created_count} transactions",
-            "count": created_count
-        }
+    job_id = uuid.uuid4().hex
+    path = os.path.join(config.UPLOAD_DIR, job_id + os.path.splitext(file.filename)[1])
+    save_upload(file, path)
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to import file: {str(e)}")
+    job = crud.create_import_job(db, job_id, file.filename)
+    # 작업은 요청이 끝난 뒤 실행되므로 엔진 대신 테넌트 키를 넘기고 작업 동안 엔진을 다시 잡음
+    tenant = tenants.tenant_of(db.get_bind())
+    jobs.submit(
+        run_import_job, tenant, job_id, path, file.filename,
+        on_cancel=lambda: cancel_import_job(tenant, job_id, [path])
+    )
+    return job
+
+
+@router.post("/import/batch", status_code=202, response_model=schemas.ImportJobResponse)
+def import_excel_batch(
+    files: List[UploadFile] = File(...),
+    db: Session = Depends(get_db)
+):
+    """여러 Excel/CSV 파일 또는 ZIP 묶음 임포트 작업 등록 (파일별 병렬 파싱, 파일 간 중복 거래 제거)"""
+    for file in files:
+        if not file.filename.lower().endswith(IMPORT_EXTENSIONS + ('.zip',)):
+            raise HTTPException(status_code=400, detail=f"Unsupported file: {file.filename}")
+    
+    job_id = uuid.uuid4().hex
+    uploads = []
+    for i, file in enumerate(files):
+        path = os.path.join(config.UPLOAD_DIR, f"{job_id}_{i}{os.path.splitext(file.filename)[1].lower()}")
+        save_upload(file, path)
+        uploads.append((path, file.filename))
+    
+    job = crud.create_import_job(db, job_id, ", ".join(file.filename for file in files))
+    tenant = tenants.tenant_of(db.get_bind())
+    jobs.submit(
+        run_batch_import_job, tenant, job_id, uploads,
+        on_cancel=lambda: cancel_import_job(tenant, job_id, [path for path, _ in uploads])
+    )
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=schemas.ImportJobResponse)
+def read_import_job(job_id: str, db: Session = Depends(get_db)):
+    """임포트 작업 상태/진행률 조회"""
+    job = crud.get_import_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_import_job(job_id: str, db: Session = Depends(get_db)):
+    """임포트 작업 진행률 스트림 (Server-Sent Events, 변경 시 progress 이벤트, 종료 시 done 이벤트)"""
+    if not await run_in_threadpool(crud.get_import_job, db, job_id):
+        raise HTTPException(status_code=404, detail="Import job not found")
+    tenant = tenants.tenant_of(db.get_bind())
+    
+    def load() -> schemas.ImportJobResponse:
+        with open_session(tenant) as session:
+            return schemas.ImportJobResponse.model_validate(crud.get_import_job(session, job_id))
+    
+    async def events():
+        last = None
+        while True:
+            job = await run_in_threadpool(load)
+            data = job.model_dump_json()
+            if job.status in JOB_FINISHED:
+                yield f"event: done\ndata: {data}\n\n"
+                return
+            if data != last:
+                yield f"event: progress\ndata: {data}\n\n"
+                last = data
+            await asyncio.sleep(JOB_EVENTS_INTERVAL)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# 거래 내역 다운로드 최대 건수
+EXPORT_LIMIT = 10000
+
+
+def build_export_frame_from_snapshot(start_date: datetime = None, end_date: datetime = None) -> "pd.DataFrame":
+    """컬럼형 스냅샷에서 거래 내역 다운로드용 DataFrame 생성"""
+    import pandas as pd
+    
+    table = snapshot.load_transactions(start_date, end_date)
+    df = table.to_pandas()
+    df = df.sort_values(['date', 'id'], ascending=False, kind='stable').head(EXPORT_LIMIT)
+    
+    return pd.DataFrame({
+        '날짜': df['date'].dt.strftime('%Y-%m-%d %H:%M:%S'),
+        '설명': df['description'],
+        '금액': df['amount'],
+        '카테고리': df['category'].fillna(''),
+        '타입': df['type'].map({models.TransactionType.INCOME.value: '수입'}).fillna('지출'),
+        '상태': df['status'].map({models.TransactionStatus.COMPLETED.value: '완료'}).fillna('취소'),
+        '메모': df['note'].fillna('')
+    })
 
 
 @router.get("/export/transactions")
@@ -129,29 +456,37 @@ def export_transactions(
     db: Session = Depends(get_db)
 ):
     """거래 내역 Excel 다운로드"""
-    transactions = crud.get_transactions(
-        db, skip=0, limit=10000,
-        start_date=start_date, end_date=end_date
-    )
+    import pandas as pd
     
-    # DataFrame 생성
-    data = []
-    for trans in transactions:
-        data.append({
-            '날짜': trans.date.strftime('%Y-%m-%d %H:%M:%S'),
-            '설명': trans.description,
-            '금액': trans.amount,
-            '카테고리': trans.category or '',
-            '타입': '수입' if trans.type == models.TransactionType.INCOME else '지출',
-            '상태': '완료' if trans.status == models.TransactionStatus.COMPLETED else '취소',
-            '메모': trans.note or ''
-        })
-    
-    df = pd.DataFrame(data)
+    # 스냅샷은 현재 테이블만 담으므로 기간이 보관 연도에 닿으면 SQLite에서 함께 읽음
+    if (snapshot.is_available() and snapshot.covers(db.get_bind())
+            and not archive.archives_in_range(db, start_date, end_date)):
+        with metrics.phase("file"):
+            df = build_export_frame_from_snapshot(start_date, end_date)
+    else:
+        transactions = crud.get_transactions(
+            db, skip=0, limit=EXPORT_LIMIT,
+            start_date=start_date, end_date=end_date
+        )
+        
+        # DataFrame 생성
+        data = []
+        for trans in transactions:
+            data.append({
+                '날짜': trans.date.strftime('%Y-%m-%d %H:%M:%S'),
+                '설명': trans.description,
+                '금액': trans.amount,
+                '카테고리': trans.category or '',
+                '타입': '수입' if trans.type == models.TransactionType.INCOME else '지출',
+                '상태': '완료' if trans.status == models.TransactionStatus.COMPLETED else '취소',
+                '메모': trans.note or ''
+            })
+        
+        df = pd.DataFrame(data)
     
     # Excel 파일 생성
     output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+    with metrics.phase("file"), pd.ExcelWriter(output, engine='openpyxl') as writer:
         df.to_excel(writer, index=False, sheet_name='거래내역')
     output.seek(0)
     
@@ -167,52 +502,33 @@ def export_transactions(
 
 @router.get("/export/monthly-report")
 def export_monthly_report(
+    request: Request,
     year: int,
-    month: int,
+    month: int = Query(..., ge=1, le=12),
+    format: str = Query("xlsx", pattern="^(xlsx|csv)$"),
     db: Session = Depends(get_db)
 ):
-    """월별 리포트 Excel 다운로드"""
-    # 월별 통계
-    stats = crud.get_monthly_stats(db, year, month)
-    
-    # 카테고리별 통계
-    income_stats = crud.get_category_stats(db, year, month, models.TransactionType.INCOME)
-    expense_stats = crud.get_category_stats(db, year, month, models.TransactionType.EXPENSE)
-    
-    # Excel 파일 생성
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        # 요약 시트
-        summary_data = {
-            '항목': ['총 수입', '총 지출', '순 금액', '거래 건수'],
-            '금액': [stats.total_income, stats.total_expense, stats.net_amount, stats.transaction_count]
-        }
-        pd.DataFrame(summary_data).to_excel(writer, index=False, sheet_name='요약')
-        
-        # 수입 카테고리 시트
-        if income_stats:
-            income_data = {
-                '카테고리': [s.category for s in income_stats],
-                '금액': [s.total_amount for s in income_stats],
-                '비율(%)': [round(s.percentage, 2) for s in income_stats]
-            }
-            pd.DataFrame(income_data).to_excel(writer, index=False, sheet_name='수입 카테고리')
-        
-        # 지출 카테고리 시트
-        if expense_stats:
-            expense_data = {
-                '카테고리': [s.category for s in expense_stats],
-                '금액': [s.total_amount for s in expense_stats],
-                '비율(%)': [round(s.percentage, 2) for s in expense_stats]
-            }
-            pd.DataFrame(expense_data).to_excel(writer, index=False, sheet_name='지출 카테고리')
-    
-    output.seek(0)
-    
-    filename = f"monthly_report_{year}_{month:02d}.xlsx"
-    
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    """월별 리포트 Excel/CSV 다운로드 (데이터가 바뀌지 않았으면 캐시된 파일 전송)"""
+    with metrics.phase("file"):
+        path = reports.monthly_report(db, year, month, format)
+    return compression.file_response(
+        request, path, media_type=reports.REPORT_FORMATS[format],
+        filename=f"monthly_report_{year}_{month:02d}.{format}"
+    )
+
+
+@router.get("/export/period-report")
+def export_period_report(
+    request: Request,
+    year: int,
+    quarter: Optional[int] = Query(None, ge=1, le=4),
+    format: str = Query("xlsx", pattern="^(xlsx|csv)$"),
+    db: Session = Depends(get_db)
+):
+    """분기/연간 리포트 Excel/CSV 다운로드 (quarter 생략 시 연간, 월별 시트 + 요약, CSV는 월 열이 있는 한 표)"""
+    name = reports.period_name(year, quarter)
+    with metrics.phase("file"):
+        path = reports.period_report(db, year, quarter, format)
+    return compression.file_response(
+        request, path, media_type=reports.REPORT_FORMATS[format], filename=f"{name}_report.{format}"
     )
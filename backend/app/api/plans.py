@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from .. import crud, schemas
+from ..core.metrics import TimedRoute
 from ..database import get_db
 
-router = APIRouter(prefix="/api/plans", tags=["budget_plans"])
+router = APIRouter(prefix="/api/plans", tags=["budget_plans"], route_class=TimedRoute)
+
+DUPLICATE_PLAN = "Budget plan for this month and category already exists"
 
 
 @router.get("/", response_model=List[schemas.BudgetPlanResponse])
@@ -36,7 +40,39 @@ def create_plan(
     db: Session = Depends(get_db)
 ):
     """재무 계획 생성"""
-    return crud.create_budget_plan(db, plan)
+    try:
+        return crud.create_budget_plan(db, plan)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail=DUPLICATE_PLAN)
+
+
+@router.post("/bulk", response_model=List[schemas.BudgetPlanResponse])
+def upsert_plans(
+    plans: List[schemas.BudgetPlanCreate],
+    db: Session = Depends(get_db)
+):
+    """재무 계획 일괄 저장 (같은 연-월-카테고리 계획은 갱신)"""
+    return crud.upsert_budget_plans(db, plans)
+
+
+@router.post("/rollover", response_model=List[schemas.BudgetPlanResponse])
+def rollover_plans(
+    rollover: schemas.BudgetPlanRollover,
+    db: Session = Depends(get_db)
+):
+    """템플릿 월의 계획을 한 해의 여러 달로 복사/조정"""
+    if not crud.get_budget_plans(db, limit=1, year=rollover.template_year, month=rollover.template_month):
+        raise HTTPException(status_code=404, detail="Template month has no budget plans")
+    return crud.rollover_budget_plans(db, rollover)
+
+
+@router.post("/from-history", response_model=List[schemas.BudgetPlanResponse])
+def plans_from_history(
+    plan: schemas.BudgetPlanFromHistory,
+    db: Session = Depends(get_db)
+):
+    """과거 월평균 지출로 한 해 계획 생성/갱신"""
+    return crud.upsert_budget_plans(db, crud.derive_budget_plans(db, plan))
 
 
 @router.put("/{plan_id}", response_model=schemas.BudgetPlanResponse)
@@ -46,7 +82,10 @@ def update_plan(
     db: Session = Depends(get_db)
 ):
     """재무 계획 수정"""
-    updated = crud.update_budget_plan(db, plan_id, plan)
+    try:
+        updated = crud.update_budget_plan(db, plan_id, plan)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail=DUPLICATE_PLAN)
     if not updated:
         raise HTTPException(status_code=404, detail="Budget plan not found")
     return updated
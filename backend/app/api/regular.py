@@ -3,9 +3,11 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from .. import crud, schemas
+from ..core import recurring
+from ..core.metrics import TimedRoute
 from ..database import get_db
 
-router = APIRouter(prefix="/api/regular", tags=["regular_transactions"])
+router = APIRouter(prefix="/api/regular", tags=["regular_transactions"], route_class=TimedRoute)
 
 
 @router.get("/", response_model=List[schemas.RegularTransactionResponse])
@@ -18,6 +20,43 @@ def read_regular_transactions(
     return crud.get_regular_transactions(db, skip=skip, limit=limit)
 
 
+@router.get("/candidates", response_model=List[schemas.RecurringCandidateResponse])
+def read_recurring_candidates(
+    min_confidence: float = Query(0, ge=0, le=1),
+    db: Session = Depends(get_db)
+):
+    """거래 내역에서 감지한 정기 거래 후보 조회 (신뢰도 높은 순)"""
+    return crud.get_recurring_candidates(db, min_confidence=min_confidence)
+
+
+@router.post("/candidates/detect", response_model=List[schemas.RecurringCandidateResponse])
+def detect_recurring_candidates(db: Session = Depends(get_db)):
+    """전체 거래 내역으로 정기 거래 후보 다시 감지 (임포트 후에는 자동으로 증분 감지됨)"""
+    recurring.detect_all(db)
+    return crud.get_recurring_candidates(db)
+
+
+@router.post(
+    "/candidates/{candidate_id}/accept",
+    response_model=schemas.RegularTransactionResponse,
+    status_code=201
+)
+def accept_recurring_candidate(candidate_id: int, db: Session = Depends(get_db)):
+    """정기 거래 후보를 정기 거래로 등록"""
+    regular = crud.accept_recurring_candidate(db, candidate_id)
+    if not regular:
+        raise HTTPException(status_code=404, detail="Recurring candidate not found")
+    return regular
+
+
+@router.delete("/candidates/{candidate_id}", status_code=204)
+def delete_recurring_candidate(candidate_id: int, db: Session = Depends(get_db)):
+    """정기 거래 후보 삭제"""
+    success = crud.delete_recurring_candidate(db, candidate_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Recurring candidate not found")
+
+
 @router.get("/{regular_id}", response_model=schemas.RegularTransactionResponse)
 def read_regular_transaction(regular_id: int, db: Session = Depends(get_db)):
     """특정 정기 거래 조회"""
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from .. import schemas
+from ..core import sync
+from ..core.metrics import TimedRoute
+from ..database import get_db
+
+router = APIRouter(prefix="/api/sync", tags=["sync"], route_class=TimedRoute)
+
+
+@router.get("/", response_model=schemas.SyncResponse)
+def read_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """since(이전 응답의 seq) 이후 바뀐 거래/재무 계획/정기 거래와 삭제된 id 조회"""
+    return sync.get_changes(db, since=since, limit=limit)
@@ -2,9 +2,10 @@ from fastapi import APIRouter, Query, HTTPException
 from pydantic import BaseModel
 from typing import Literal, Dict, Optional
 
+from ..core.metrics import TimedRoute
 from ..core.tax_calculator import TaxCalculator, TaxResult
 
-router = APIRouter(prefix="/api/tax", tags=["tax"])
+router = APIRouter(prefix="/api/tax", tags=["tax"], route_class=TimedRoute)
 
 class TaxRequest(BaseModel):
     amount: float
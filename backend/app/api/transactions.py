@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime
+from starlette.concurrency import run_in_threadpool
+from typing import List, Literal, Optional
+from datetime import date, datetime, timedelta
 
 from .. import crud, schemas, models
+from ..core import anomalies, daily_index, reports
+from ..core.metrics import TimedRoute
 from ..database import get_db
 
-router = APIRouter(prefix="/api/transactions", tags=["transactions"])
+router = APIRouter(prefix="/api/transactions", tags=["transactions"], route_class=TimedRoute)
+
+# 스트리밍 조회 시 한 번에 읽어 보내는 거래 수
+STREAM_CHUNK_SIZE = 500
 
 
 @router.get("/", response_model=List[schemas.TransactionResponse])
@@ -17,17 +24,88 @@ def read_transactions(
     end_date: Optional[datetime] = None,
     category: Optional[str] = None,
     type: Optional[models.TransactionType] = None,
+    q: Optional[str] = Query(None, min_length=1, max_length=100),
     db: Session = Depends(get_db)
 ):
-    """거래 내역 목록 조회"""
+    """거래 내역 목록 조회 (q: 설명/메모 검색어)"""
     transactions = crud.get_transactions(
         db, skip=skip, limit=limit,
         start_date=start_date, end_date=end_date,
-        category=category, type=type
+        category=category, type=type, q=q
     )
     return transactions
 
 
+@router.get("/stream")
+def stream_transactions(
+    request: Request,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category: Optional[str] = None,
+    type: Optional[models.TransactionType] = None,
+    q: Optional[str] = Query(None, min_length=1, max_length=100),
+    db: Session = Depends(get_db)
+):
+    """조건에 맞는 거래 전체를 NDJSON(한 줄에 거래 하나)으로 스트리밍 (날짜, id 내림차순)
+
+    STREAM_CHUNK_SIZE건씩 키셋 페이지로 읽어 바로 전송하므로 서버 메모리는 결과 크기와 무관하다.
+    - 페이지마다 짧은 세션을 열고 닫아 긴 읽기 트랜잭션을 유지하지 않음
+    - 다음 페이지는 이전 청크 전송(send)이 끝난 뒤에 읽으므로 느린 클라이언트에 맞춰 조회 속도가 조절됨
+    - 클라이언트 연결이 끊기면 다음 페이지를 읽기 전에 중단
+    """
+    bind = db.get_bind()
+
+    def read_chunk(after):
+        with Session(bind=bind) as session:
+            rows = crud.get_transactions_after(
+                session, after=after, limit=STREAM_CHUNK_SIZE,
+                start_date=start_date, end_date=end_date,
+                category=category, type=type, q=q
+            )
+            lines = "".join(
+                schemas.TransactionResponse.model_validate(row).model_dump_json() + "\n" for row in rows
+            )
+            last = (rows[-1].date, rows[-1].id) if rows else None
+            return lines, last, len(rows)
+
+    async def generate():
+        after = None
+        while not await request.is_disconnected():
+            lines, after, count = await run_in_threadpool(read_chunk, after)
+            if lines:
+                yield lines
+            if count < STREAM_CHUNK_SIZE:
+                break
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@router.get("/balance-series", response_model=schemas.BalanceSeries)
+def get_balance_series(
+    interval: Literal["day", "month"] = "month",
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    opening_balance: float = 0,
+    exclude_category: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """일/월별 누적 잔액 시계열 (exclude_category: 제외할 카테고리, 여러 번 지정 가능)"""
+    return crud.get_balance_series(
+        db, interval=interval, start_date=start_date, end_date=end_date,
+        opening_balance=opening_balance, exclude_categories=exclude_category
+    )
+
+
+@router.get("/anomalies", response_model=List[schemas.SpendingAnomaly])
+def get_spending_anomalies(
+    start_date: Optional[datetime] = None,
+    limit: int = Query(100, le=1000),
+    db: Session = Depends(get_db)
+):
+    """저장 시점에 감지된 지출 이상치 목록 (카테고리 평균 대비 큰 지출)"""
+    return anomalies.get_anomalies(db, start_date=start_date, limit=limit)
+
+
 @router.get("/{transaction_id}", response_model=schemas.TransactionResponse)
 def read_transaction(transaction_id: int, db: Session = Depends(get_db)):
     """특정 거래 조회"""
@@ -73,8 +151,32 @@ def get_monthly_stats(
     month: int = Query(..., ge=1, le=12),
     db: Session = Depends(get_db)
 ):
-    """월별 통계 조회"""
-    return crud.get_monthly_stats(db, year, month)
+    """월별 통계 조회 (데이터가 바뀌지 않았으면 캐시된 결과)"""
+    return reports.monthly_stats(db, year, month)
+
+
+@router.get("/stats/spending", response_model=List[schemas.SpendingStats])
+def get_spending_stats(
+    months: int = Query(3, ge=1, le=24),
+    db: Session = Depends(get_db)
+):
+    """카테고리별 지출 누적 통계와 최근 months개월 통계"""
+    return anomalies.get_spending_stats(db, months=months)
+
+
+@router.get("/stats/range", response_model=schemas.RangeStats)
+def get_range_stats(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    days: int = Query(30, ge=1, le=3660),
+    db: Session = Depends(get_db)
+):
+    """임의 기간 통계 (start_date 미지정 시 end_date(기본: 오늘)까지 최근 days일)"""
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=days - 1)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    return daily_index.get_range_stats(db, start_date, end_date)
 
 
 @router.get("/stats/category", response_model=List[schemas.CategoryStats])
@@ -84,5 +186,5 @@ def get_category_stats(
     type: models.TransactionType = Query(...),
     db: Session = Depends(get_db)
 ):
-    """카테고리별 통계 조회"""
-    return crud.get_category_stats(db, year, month, type)
+    """카테고리별 통계 조회 (데이터가 바뀌지 않았으면 캐시된 결과)"""
+    return reports.category_stats(db, year, month, type)
@@ -0,0 +1,63 @@
+import os
+
+# SQLite 데이터베이스 경로
+DATABASE_URL = os.getenv("FINANCE_DATABASE_URL", "sqlite:///./backend/finance.db")
+
+# 컬럼형 스냅샷 저장 경로
+SNAPSHOT_DIR = os.getenv("FINANCE_SNAPSHOT_DIR", "./backend/snapshots/transactions")
+
+# 통계/리포트 집계 엔진: "sqlite" (기본) 또는 "duckdb" (컬럼형 스냅샷 기반, duckdb + pyarrow 필요)
+ANALYTICS_ENGINE = os.getenv("FINANCE_ANALYTICS_ENGINE", "sqlite").lower()
+
+# SQL 쿼리 프로파일러 초기 설정 (실행 중 /api/admin/profiler 로 변경 가능)
+SQL_PROFILER_ENABLED = os.getenv("FINANCE_SQL_PROFILER", "0") == "1"
+SQL_SLOW_QUERY_MS = float(os.getenv("FINANCE_SLOW_QUERY_MS", "100"))
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("FINANCE_N_PLUS_ONE_THRESHOLD", "10"))
+
+# 쓰기 그룹 커밋: 이 시간(ms) 안에 도착한 쓰기를 한 트랜잭션으로 묶음, 배치당 최대 작업 수
+WRITE_BATCH_WINDOW_MS = float(os.getenv("FINANCE_WRITE_BATCH_WINDOW_MS", "2"))
+WRITE_BATCH_MAX = int(os.getenv("FINANCE_WRITE_BATCH_MAX", "256"))
+# 쓰기 작업 결과를 기다리는 최대 시간(초), 넘으면 요청이 실패함 (writer가 멈춰도 요청이 무한히 대기하지 않도록)
+WRITE_TIMEOUT_S = float(os.getenv("FINANCE_WRITE_TIMEOUT_S", "300"))
+
+# 파일 임포트 작업: 업로드 임시 저장 경로, 프로세스별 동시 실행 작업 수,
+# 여러 파일 임포트 시 파싱 프로세스 수 (0이면 CPU 수)
+UPLOAD_DIR = os.getenv("FINANCE_UPLOAD_DIR", "./backend/uploads")
+IMPORT_WORKERS = int(os.getenv("FINANCE_IMPORT_WORKERS", "2"))
+IMPORT_PROCESSES = int(os.getenv("FINANCE_IMPORT_PROCESSES", "0"))
+
+# 분기/연간 리포트: 생성된 파일 캐시 경로와 최대 용량(MB, 초과 시 LRU 삭제), 월별 집계 병렬 스레드 수
+REPORT_CACHE_DIR = os.getenv("FINANCE_REPORT_CACHE_DIR", "./backend/reports")
+REPORT_CACHE_MAX_MB = float(os.getenv("FINANCE_REPORT_CACHE_MAX_MB", "200"))
+REPORT_WORKERS = int(os.getenv("FINANCE_REPORT_WORKERS", "4"))
+
+# 응답 압축: 이 크기(bytes) 이상인 JSON/텍스트 응답을 Accept-Encoding에 맞춰 gzip/zstd/br로 압축 (음수면 끔)
+COMPRESSION_MIN_BYTES = int(os.getenv("FINANCE_COMPRESSION_MIN_BYTES", "1024"))
+
+# 지출 이상치: 카테고리 평균보다 이 표준편차 배수 넘게 큰 지출을 기록, 판단에 필요한 최소 표본 수
+ANOMALY_Z_THRESHOLD = float(os.getenv("FINANCE_ANOMALY_Z_THRESHOLD", "3"))
+ANOMALY_MIN_SAMPLES = int(os.getenv("FINANCE_ANOMALY_MIN_SAMPLES", "10"))
+
+# 멀티 테넌트 모드: 지정하면 요청의 테넌트 키(헤더)별로 이 디렉터리의 <테넌트>.db를 사용,
+# 동시에 열어 두는 테넌트 엔진 수 (초과 시 사용 중이 아닌 가장 오래된 엔진부터 닫음)
+TENANT_DB_DIR = os.getenv("FINANCE_TENANT_DB_DIR", "")
+TENANT_HEADER = os.getenv("FINANCE_TENANT_HEADER", "X-Tenant-ID")
+TENANT_CACHE_SIZE = int(os.getenv("FINANCE_TENANT_CACHE_SIZE", "32"))
+
+# 마감된 연도의 거래를 옮겨 두는 읽기 전용 보관 파일 경로 (python -m backend.app.core.archive <연도>)
+ARCHIVE_DIR = os.getenv("FINANCE_ARCHIVE_DIR", "./backend/archive")
+
+# 온라인 백업: 저장 경로, 예약 주기(시간, 0이면 예약 안 함), 보관 개수,
+# 단계당 복사 페이지 수와 단계 사이 쉬는 시간(ms), 쓰기로 다시 시작된 횟수가 이를 넘으면 쓰기를 잠시 멈추고 마저 복사
+BACKUP_DIR = os.getenv("FINANCE_BACKUP_DIR", "./backend/backups")
+BACKUP_INTERVAL_HOURS = float(os.getenv("FINANCE_BACKUP_INTERVAL_HOURS", "0"))
+BACKUP_KEEP = int(os.getenv("FINANCE_BACKUP_KEEP", "7"))
+BACKUP_PAGES_PER_STEP = int(os.getenv("FINANCE_BACKUP_PAGES_PER_STEP", "256"))
+BACKUP_STEP_SLEEP_MS = float(os.getenv("FINANCE_BACKUP_STEP_SLEEP_MS", "5"))
+BACKUP_MAX_RESTARTS = int(os.getenv("FINANCE_BACKUP_MAX_RESTARTS", "3"))
+
+# 기동 후 캐시 예열: 켜기/끄기, 처리 중인 요청이 없고 마지막 요청 후 이 시간(ms)이 지나야 한 단계 실행,
+# 단계 사이 쉬는 시간(ms)
+WARMUP_ENABLED = os.getenv("FINANCE_WARMUP", "1") == "1"
+WARMUP_IDLE_MS = float(os.getenv("FINANCE_WARMUP_IDLE_MS", "500"))
+WARMUP_STEP_SLEEP_MS = float(os.getenv("FINANCE_WARMUP_STEP_SLEEP_MS", "100"))
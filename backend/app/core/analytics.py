@@ -0,0 +1,220 @@
+"""
+DuckDB 분석 엔진
+
+OLTP 쓰기는 SQLite에 그대로 두고, 집계 쿼리만 컬럼형 스냅샷(core.snapshot)을 적재한
+인메모리 DuckDB의 transactions 테이블에서 실행한다.
+config.ANALYTICS_ENGINE = "duckdb" 일 때 crud의 통계 함수가 이 모듈을 사용한다.
+
+- 적재: 처음 조회할 때 스냅샷 전체를 테이블로 만들고, 이후에는 데이터 버전
+  (core.reports.month_versions)이 바뀐 달만 스냅샷을 갱신해 그 달의 행을 교체
+  (버전이 그대로면 조회 경로에서 스냅샷 갱신/파일 읽기 없음)
+- 조회: 모든 집계는 임의 기간 [start_date, end_date]를 받음 (여러 달에 걸친 집계도 한 쿼리)
+"""
+import calendar
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .. import config, models
+from . import snapshot
+
+# duckdb는 DuckDB 엔진을 처음 사용할 때 로드 (_load_duckdb), 미설치 시 SQLite 집계만 사용 가능
+duckdb = None
+_duckdb_missing = False
+
+ENGINES = ("sqlite", "duckdb")
+
+_connection = None
+_connection_lock = threading.Lock()
+
+# transactions 테이블에 적재한 달별 데이터 버전 (None이면 아직 적재 전)
+_loaded_versions: Optional[Dict[str, int]] = None
+_load_lock = threading.Lock()
+
+
+def _load_duckdb() -> bool:
+    global duckdb, _duckdb_missing
+    if duckdb is None and not _duckdb_missing:
+        try:
+            import duckdb as duckdb_module
+        except ImportError:
+            _duckdb_missing = True
+            return False
+        duckdb = duckdb_module
+    return duckdb is not None
+
+
+def is_available() -> bool:
+    """duckdb 및 pyarrow 사용 가능 여부"""
+    return _load_duckdb() and snapshot.is_available()
+
+
+def is_enabled(analytics_engine: Optional[str] = None, bind=None) -> bool:
+    """집계에 DuckDB 엔진을 사용할지 여부 (설정값 검증 포함, 스냅샷이 없는 bind(테넌트 DB)는 제외)"""
+    analytics_engine = analytics_engine or config.ANALYTICS_ENGINE
+    if analytics_engine not in ENGINES:
+        raise ValueError(f"Unknown analytics engine: {analytics_engine}")
+    if analytics_engine != "duckdb" or (bind is not None and not snapshot.covers(bind)):
+        return False
+    if not is_available():
+        raise RuntimeError("duckdb analytics engine requires the duckdb and pyarrow packages")
+    return True
+
+
+def _cursor():
+    """스레드별 DuckDB 커서 (공유 인메모리 데이터베이스)"""
+    global _connection
+    with _connection_lock:
+        if _connection is None:
+            _connection = duckdb.connect(database=":memory:")
+    return _connection.cursor()
+
+
+def month_range(year: int, month: int) -> Tuple[datetime, datetime]:
+    """해당 월의 [첫 순간, 마지막 순간]"""
+    last_day = calendar.monthrange(year, month)[1]
+    return datetime(year, month, 1), datetime(year, month, last_day, 23, 59, 59, 999999)
+
+
+def _sync(db: Session):
+    """데이터 버전이 바뀐 달만 스냅샷을 갱신하고 transactions 테이블의 그 달 행을 교체"""
+    global _loaded_versions
+    from . import reports  # reports -> crud -> analytics 순환 임포트
+
+    # 적재 전에 버전을 읽으므로 적재 중에 바뀐 달은 다음 조회에서 다시 적재됨
+    versions = reports.month_versions(db)
+    with _load_lock:
+        if versions == _loaded_versions:
+            return
+        snapshot.refresh_snapshot()
+        cur = _cursor()
+        try:
+            if _loaded_versions is None:
+                cur.register("snapshot_rows", snapshot.load_transactions(refresh=False))
+                cur.execute("CREATE OR REPLACE TABLE transactions AS SELECT * FROM snapshot_rows")
+            else:
+                changed = [
+                    month for month in sorted(versions.keys() | _loaded_versions.keys())
+                    if versions.get(month) != _loaded_versions.get(month)
+                ]
+                # 다른 스레드의 조회가 일부만 교체된 테이블을 보지 않도록 한 트랜잭션으로 교체
+                cur.begin()
+                for month in changed:
+                    start, end = month_range(*map(int, month.split("-")))
+                    cur.register("snapshot_rows", snapshot.load_transactions(start, end, refresh=False))
+                    cur.execute("DELETE FROM transactions WHERE date BETWEEN ? AND ?", [start, end])
+                    cur.execute("INSERT INTO transactions SELECT * FROM snapshot_rows")
+                    cur.unregister("snapshot_rows")
+                cur.commit()
+        finally:
+            cur.close()
+        _loaded_versions = versions
+
+
+def invalidate():
+    """적재한 테이블 버리기 (데이터베이스를 복원한 뒤 다음 조회 때 전체 재적재)"""
+    global _loaded_versions
+    with _load_lock:
+        _loaded_versions = None
+
+
+def _query(db: Session, sql: str, params: list):
+    """transactions 테이블을 최신 데이터 버전으로 맞춘 뒤 쿼리 실행"""
+    _sync(db)
+    cur = _cursor()
+    try:
+        return cur.execute(sql, params).fetchall()
+    finally:
+        cur.close()
+
+
+def _period(start_date: Optional[datetime], end_date: Optional[datetime]) -> Tuple[str, list]:
+    """기간 조건 (WHERE 뒤에 붙일 AND 절, 파라미터)"""
+    clause, params = "", []
+    if start_date:
+        clause += " AND date >= ?"
+        params.append(start_date)
+    if end_date:
+        clause += " AND date <= ?"
+        params.append(end_date)
+    return clause, params
+
+
+def totals(
+    db: Session,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Tuple[int, int, int]:
+    """기간 (수입 합계, 지출 합계, 완료 거래 건수), 금액은 원 단위 정수"""
+    period, period_params = _period(start_date, end_date)
+    row = _query(db, f"""
+        SELECT
+            coalesce(sum(amount) FILTER (WHERE type = ?), 0),
+            coalesce(sum(amount) FILTER (WHERE type = ?), 0),
+            count(*)
+        FROM transactions
+        WHERE status = ?{period}
+    """, [
+        models.TransactionType.INCOME.value,
+        models.TransactionType.EXPENSE.value,
+        models.TransactionStatus.COMPLETED.value,
+        *period_params,
+    ])[0]
+    return row[0], row[1], row[2]
+
+
+def category_totals(
+    db: Session,
+    type: models.TransactionType,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> List[Tuple[str, int, int]]:
+    """기간 카테고리별 (카테고리, 합계, 건수), 카테고리 순 정렬"""
+    period, period_params = _period(start_date, end_date)
+    return _query(db, f"""
+        SELECT category, sum(amount) AS total, count(*) AS count
+        FROM transactions
+        WHERE type = ? AND status = ? AND category IS NOT NULL{period}
+        GROUP BY category
+        ORDER BY category
+    """, [
+        type.value,
+        models.TransactionStatus.COMPLETED.value,
+        *period_params,
+    ])
+
+
+# 잔액 시계열 구간 -> 구간 키 형식 (crud.BALANCE_INTERVALS의 날짜 문자열 앞부분과 같은 값)
+BALANCE_PERIOD_FORMATS = {"day": "%Y-%m-%d", "month": "%Y-%m"}
+
+
+def balance_buckets(
+    db: Session,
+    interval: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    exclude_categories: Optional[List[str]] = None
+) -> List[Tuple[str, int, int]]:
+    """기간 구간별 (구간, 수입 합계, 지출 합계), 구간 순 정렬 (exclude_categories의 거래 제외)"""
+    period, period_params = _period(start_date, end_date)
+    excluded = ""
+    if exclude_categories:
+        excluded = " AND (category IS NULL OR NOT list_contains(?, category))"
+        period_params.append(list(exclude_categories))
+    return _query(db, f"""
+        SELECT strftime(date, ?) AS period,
+               coalesce(sum(amount) FILTER (WHERE type = ?), 0),
+               coalesce(sum(amount) FILTER (WHERE type = ?), 0)
+        FROM transactions
+        WHERE status = ?{period}{excluded}
+        GROUP BY period
+        ORDER BY period
+    """, [
+        BALANCE_PERIOD_FORMATS[interval],
+        models.TransactionType.INCOME.value,
+        models.TransactionType.EXPENSE.value,
+        models.TransactionStatus.COMPLETED.value,
+        *period_params,
+    ])
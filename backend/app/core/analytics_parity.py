@@ -0,0 +1,107 @@
+"""
+SQLite / DuckDB 집계 결과 일치 검증
+
+저장된 모든 연-월에 대해 월별 통계와 카테고리별 통계를, 전체 기간에 대해 일/월별 잔액 시계열을
+두 엔진으로 계산해 비교한다 (자동 검증은 backend/tests/test_analytics.py).
+실행: python -m backend.app.core.analytics_parity
+"""
+import math
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .. import crud, models
+from ..database import SessionLocal
+
+# 합산 순서 차이로 생기는 부동소수점 오차만 허용
+REL_TOLERANCE = 1e-9
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, rel_tol=REL_TOLERANCE, abs_tol=REL_TOLERANCE)
+    return a == b
+
+
+def _compare(label: str, sqlite_value: dict, duckdb_value: dict) -> List[str]:
+    return [
+        f"{label} {key}: sqlite={sqlite_value[key]!r} duckdb={duckdb_value[key]!r}"
+        for key in sqlite_value
+        if not _same(sqlite_value[key], duckdb_value[key])
+    ]
+
+
+def compare_balance(
+    db: Session,
+    interval: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    exclude_categories: Optional[List[str]] = None
+) -> List[str]:
+    """두 엔진의 잔액 시계열 차이 목록"""
+    label = f"balance {interval}"
+    sqlite_series, duckdb_series = (
+        crud.get_balance_series(
+            db, interval=interval, start_date=start_date, end_date=end_date,
+            exclude_categories=exclude_categories, analytics_engine=engine
+        )
+        for engine in ("sqlite", "duckdb")
+    )
+    sqlite_periods = [p.period for p in sqlite_series.points]
+    duckdb_periods = [p.period for p in duckdb_series.points]
+    if sqlite_periods != duckdb_periods:
+        return [f"{label} periods: sqlite={sqlite_periods} duckdb={duckdb_periods}"]
+    mismatches = []
+    for s, d in zip(sqlite_series.points, duckdb_series.points):
+        mismatches += _compare(f"{label} {s.period}", s.model_dump(), d.model_dump())
+    return mismatches
+
+
+def check_parity(db: Session) -> List[str]:
+    """두 엔진의 통계 결과 차이 목록 반환 (빈 목록이면 일치)"""
+    periods = db.execute(text(
+        "SELECT DISTINCT CAST(substr(date, 1, 4) AS INTEGER), CAST(substr(date, 6, 2) AS INTEGER) "
+        "FROM transactions ORDER BY 1, 2"
+    )).all()
+
+    mismatches = []
+    for year, month in periods:
+        label = f"{year}-{month:02d}"
+        mismatches += _compare(
+            f"{label} monthly",
+            crud.get_monthly_stats(db, year, month, analytics_engine="sqlite").model_dump(),
+            crud.get_monthly_stats(db, year, month, analytics_engine="duckdb").model_dump()
+        )
+
+        for type in models.TransactionType:
+            sqlite_stats = crud.get_category_stats(db, year, month, type, analytics_engine="sqlite")
+            duckdb_stats = crud.get_category_stats(db, year, month, type, analytics_engine="duckdb")
+            if [s.category for s in sqlite_stats] != [s.category for s in duckdb_stats]:
+                mismatches.append(
+                    f"{label} {type.value} categories: "
+                    f"sqlite={[s.category for s in sqlite_stats]} duckdb={[s.category for s in duckdb_stats]}"
+                )
+                continue
+            for s, d in zip(sqlite_stats, duckdb_stats):
+                mismatches += _compare(f"{label} {type.value} {s.category}", s.model_dump(), d.model_dump())
+
+    for interval in crud.BALANCE_INTERVALS:
+        mismatches += compare_balance(db, interval)
+
+    return mismatches
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        mismatches = check_parity(db)
+    finally:
+        db.close()
+
+    for line in mismatches:
+        print(line)
+    print("parity OK" if not mismatches else f"{len(mismatches)} mismatches")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,269 @@
+"""
+카테고리별 지출 이상치 감지 (증분 통계)
+
+- 누적 통계: category_spending_stats에 카테고리별 건수/평균/M2(Welford) 유지
+- 기간 통계: category_spending_months에 카테고리 x 연-월별 건수/합계 유지 (최근 N개월 창 계산용)
+- 갱신: transactions 트리거가 추가/수정/삭제마다 해당 거래의 기여분만 더하거나 빼므로
+  crud의 단건/일괄 쓰기, 수정, 삭제 어느 경로로 바뀌어도 통계가 전체 재계산 없이 일치
+- 감지: 완료된 지출이 저장될 때 (그 거래를 반영하기 전) 카테고리 평균보다
+  config.ANOMALY_Z_THRESHOLD 표준편차 넘게 크면 spending_anomalies에 기록
+  (표본이 config.ANOMALY_MIN_SAMPLES건 미만인 카테고리는 판단하지 않음)
+- 보관: core.archive가 거래를 보관 파일로 옮기며 지우는 동안은 archiving_years에 그 연도가 있어
+  삭제 트리거가 통계/이상치 기록을 그대로 두므로 보관 연도도 통계에 남고, 이상치 목록은 보관 파일의 거래도 읽음
+  (rebuild()는 현재 테이블만 다시 집계하므로 보관 연도의 기여분은 빠짐)
+"""
+import math
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.orm import Session
+
+from .. import config, models, schemas
+from . import archive
+
+EXPENSE = models.TRANSACTION_TYPE_CODES[models.TransactionType.EXPENSE]
+COMPLETED = models.TRANSACTION_STATUS_CODES[models.TransactionStatus.COMPLETED]
+
+# 카테고리가 없는 거래는 category_id 0으로 집계
+_NEW_KEY = "ifnull(new.category_id, 0)"
+_OLD_KEY = "ifnull(old.category_id, 0)"
+_NEW_COUNTED = f"new.type = {EXPENSE} AND new.status = {COMPLETED}"
+_OLD_COUNTED = f"old.type = {EXPENSE} AND old.status = {COMPLETED}"
+
+ANOMALY_TABLES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS category_spending_stats (
+        category_id INTEGER PRIMARY KEY,
+        count INTEGER NOT NULL,
+        mean REAL NOT NULL,
+        m2 REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS category_spending_months (
+        category_id INTEGER NOT NULL,
+        month TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        total INTEGER NOT NULL,
+        PRIMARY KEY (category_id, month)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS spending_anomalies (
+        transaction_id INTEGER PRIMARY KEY,
+        category_id INTEGER NOT NULL,
+        amount INTEGER NOT NULL,
+        mean REAL NOT NULL,
+        variance REAL NOT NULL,
+        detected_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # 보관 중인 연도 (core.archive의 삭제 트랜잭션 안에서만 행이 있음)
+    """
+    CREATE TABLE IF NOT EXISTS archiving_years (
+        year INTEGER PRIMARY KEY
+    )
+    """,
+]
+
+
+def _add_statements() -> str:
+    """new 거래를 이상치 판단 후 통계에 더하는 트리거 본문 (판단은 반영 전 통계 기준)"""
+    threshold = config.ANOMALY_Z_THRESHOLD ** 2
+    return f"""
+        INSERT OR REPLACE INTO spending_anomalies (transaction_id, category_id, amount, mean, variance)
+        SELECT new.id, s.category_id, new.amount, s.mean, s.m2 / (s.count - 1)
+        FROM category_spending_stats s
+        WHERE {_NEW_COUNTED} AND s.category_id = {_NEW_KEY}
+          AND s.count >= {config.ANOMALY_MIN_SAMPLES} AND s.m2 > 0 AND new.amount > s.mean
+          AND (new.amount - s.mean) * (new.amount - s.mean) > {threshold} * s.m2 / (s.count - 1);
+        INSERT INTO category_spending_stats (category_id, count, mean, m2)
+        SELECT {_NEW_KEY}, 1, new.amount, 0 WHERE {_NEW_COUNTED}
+        ON CONFLICT(category_id) DO UPDATE SET
+            count = count + 1,
+            mean = mean + (excluded.mean - mean) / (count + 1),
+            m2 = m2 + (excluded.mean - mean) * (excluded.mean - mean - (excluded.mean - mean) / (count + 1));
+        INSERT INTO category_spending_months (category_id, month, count, total)
+        SELECT {_NEW_KEY}, substr(new.date, 1, 7), 1, new.amount WHERE {_NEW_COUNTED}
+        ON CONFLICT(category_id, month) DO UPDATE SET
+            count = count + 1,
+            total = total + excluded.total;
+    """
+
+
+def _remove_statements() -> str:
+    """old 거래의 기여분을 통계에서 빼는 트리거 본문 (Welford 역연산)"""
+    return f"""
+        UPDATE category_spending_stats SET
+            count = count - 1,
+            mean = CASE WHEN count > 1 THEN (mean * count - old.amount) / (count - 1) ELSE 0 END,
+            m2 = CASE WHEN count > 1
+                 THEN max(m2 - (old.amount - mean) * (old.amount - (mean * count - old.amount) / (count - 1)), 0)
+                 ELSE 0 END
+        WHERE {_OLD_COUNTED} AND category_id = {_OLD_KEY};
+        UPDATE category_spending_months SET count = count - 1, total = total - old.amount
+        WHERE {_OLD_COUNTED} AND category_id = {_OLD_KEY} AND month = substr(old.date, 1, 7);
+        DELETE FROM spending_anomalies WHERE transaction_id = old.id;
+    """
+
+
+def _trigger_ddl() -> List[str]:
+    # 임계값이 트리거 본문에 들어가므로 설정 변경이 반영되도록 매번 다시 만듦
+    return [
+        "DROP TRIGGER IF EXISTS spending_stats_ai",
+        "DROP TRIGGER IF EXISTS spending_stats_ad",
+        "DROP TRIGGER IF EXISTS spending_stats_au",
+        f"""
+        CREATE TRIGGER spending_stats_ai AFTER INSERT ON transactions BEGIN
+            {_add_statements()}
+        END
+        """,
+        f"""
+        CREATE TRIGGER spending_stats_ad AFTER DELETE ON transactions
+        WHEN NOT EXISTS (SELECT 1 FROM archiving_years WHERE year = CAST(substr(old.date, 1, 4) AS INTEGER))
+        BEGIN
+            {_remove_statements()}
+        END
+        """,
+        f"""
+        CREATE TRIGGER spending_stats_au AFTER UPDATE OF date, amount, category_id, type, status
+        ON transactions BEGIN
+            {_remove_statements()}
+            {_add_statements()}
+        END
+        """,
+    ]
+
+
+def create_anomaly_tracking(bind):
+    """통계/이상치 테이블 및 트리거 생성 (통계 테이블을 처음 만들 때 기존 거래로 채움)"""
+    with bind.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'category_spending_stats'")
+        ).first()
+        for ddl in ANOMALY_TABLES_DDL + _trigger_ddl():
+            conn.execute(text(ddl))
+        if not exists:
+            _rebuild(conn)
+
+
+def _rebuild(conn):
+    conn.execute(text("DELETE FROM category_spending_stats"))
+    conn.execute(text("DELETE FROM category_spending_months"))
+    # 평균을 먼저 구한 뒤 편차 제곱합을 구하는 2단계 계산 (합과 제곱합 방식보다 정확)
+    conn.execute(text(f"""
+        INSERT INTO category_spending_stats (category_id, count, mean, m2)
+        SELECT t.key, a.count, a.mean, sum((t.amount - a.mean) * (t.amount - a.mean))
+        FROM (
+            SELECT ifnull(category_id, 0) AS key, amount FROM transactions
+            WHERE type = {EXPENSE} AND status = {COMPLETED}
+        ) t
+        JOIN (
+            SELECT ifnull(category_id, 0) AS key, count(*) AS count, avg(amount) AS mean FROM transactions
+            WHERE type = {EXPENSE} AND status = {COMPLETED}
+            GROUP BY key
+        ) a ON a.key = t.key
+        GROUP BY t.key
+    """))
+    conn.execute(text(f"""
+        INSERT INTO category_spending_months (category_id, month, count, total)
+        SELECT ifnull(category_id, 0), substr(date, 1, 7), count(*), sum(amount) FROM transactions
+        WHERE type = {EXPENSE} AND status = {COMPLETED}
+        GROUP BY 1, 2
+    """))
+
+
+def rebuild(bind):
+    """누적/기간 통계를 거래 테이블에서 다시 계산 (부동소수점 오차 정리, 이상치 기록은 유지)"""
+    with bind.begin() as conn:
+        _rebuild(conn)
+
+
+def _std(m2: float, count: int) -> float:
+    return math.sqrt(m2 / (count - 1)) if count > 1 and m2 > 0 else 0.0
+
+
+def _month_key(year: int, month: int) -> str:
+    return f"{year}-{month:02d}"
+
+
+def get_spending_stats(db: Session, months: int = 3, until: Optional[datetime] = None) -> List[schemas.SpendingStats]:
+    """카테고리별 누적 지출 통계와 until(기본: 이번 달)까지 최근 months개월 통계"""
+    until = until or datetime.now()
+    end_index = until.year * 12 + until.month - 1
+    start_index = end_index - months + 1
+    window_start = _month_key(start_index // 12, start_index % 12 + 1)
+    window_end = _month_key(until.year, until.month)
+
+    rows = db.execute(text("""
+        SELECT s.category_id, c.name, s.count, s.mean, s.m2,
+               ifnull(w.count, 0) AS window_count, ifnull(w.total, 0) AS window_total
+        FROM category_spending_stats s
+        LEFT JOIN categories c ON c.id = s.category_id
+        LEFT JOIN (
+            SELECT category_id, sum(count) AS count, sum(total) AS total
+            FROM category_spending_months
+            WHERE month BETWEEN :start AND :end
+            GROUP BY category_id
+        ) w ON w.category_id = s.category_id
+        WHERE s.count > 0
+        ORDER BY c.name
+    """), {"start": window_start, "end": window_end}).all()
+
+    return [
+        schemas.SpendingStats(
+            category=r.name,
+            count=r.count,
+            mean=r.mean,
+            std=_std(r.m2, r.count),
+            window_months=months,
+            window_count=r.window_count,
+            window_total=r.window_total,
+            window_mean=r.window_total / r.window_count if r.window_count else 0.0,
+        )
+        for r in rows
+    ]
+
+
+def get_anomalies(
+    db: Session,
+    start_date: Optional[datetime] = None,
+    limit: int = 100
+) -> List[schemas.SpendingAnomaly]:
+    """감지된 지출 이상치 (거래 날짜 최신순, 기간이 보관 연도에 닿으면 보관된 거래 포함)"""
+    sources = ["SELECT id, date, description FROM main.transactions"]
+    for archived in archive.archives_in_range(db, start_date):
+        archive.attach(db, archived)
+        sources.append(f"SELECT id, date, description FROM {archived.schema}.transactions")
+    query = f"""
+        SELECT a.transaction_id, t.date, t.description, c.name AS category,
+               a.amount, a.mean, a.variance, a.detected_at
+        FROM spending_anomalies a
+        JOIN ({" UNION ALL ".join(sources)}) t ON t.id = a.transaction_id
+        LEFT JOIN categories c ON c.id = a.category_id
+    """
+    params = {"limit": limit}
+    if start_date:
+        query += " WHERE t.date >= :start_date"
+        params["start_date"] = start_date
+    query += " ORDER BY t.date DESC, a.transaction_id DESC LIMIT :limit"
+    statement = text(query)
+    if start_date:
+        statement = statement.bindparams(bindparam("start_date", type_=DateTime))
+
+    anomalies = []
+    for r in db.execute(statement, params):
+        std = math.sqrt(r.variance)
+        anomalies.append(schemas.SpendingAnomaly(
+            transaction_id=r.transaction_id,
+            date=r.date,
+            description=r.description,
+            category=r.category,
+            amount=r.amount,
+            mean=r.mean,
+            std=std,
+            z_score=(r.amount - r.mean) / std,
+            detected_at=r.detected_at,
+        ))
+    return anomalies
@@ -0,0 +1,313 @@
+"""
+마감된 연도의 거래를 읽기 전용 보관 파일로 옮기고 조회 시 필요한 연도만 붙여 함께 읽기
+
+- 보관: archive_year()가 한 해의 거래를 config.ARCHIVE_DIR의 SQLite 파일(transactions + 일별 합계,
+  날짜 인덱스만 유지)로 복사한 뒤 writer에서 현재 테이블의 해당 연도 거래를 삭제하고
+  transaction_archives에 등록 (복사 후 그 해 거래가 바뀌었으면 월별 데이터 버전으로 감지해 취소)
+- 크기: 보관 파일은 압축하지 않은 일반 SQLite 파일이고, 전문 검색 색인과 날짜 외 인덱스를 두지 않고
+  VACUUM으로 빈 페이지를 없애 크기를 줄임 (표준 sqlite3에는 페이지 압축이 없고, 압축 파일은 ATTACH할 때마다
+  임시 파일로 풀어야 해서 조회할 때 드는 비용이 커짐)
+- 조회: crud의 거래 목록/통계는 요청한 기간이 보관 연도에 닿을 때만 그 파일을 연결에 읽기 전용으로
+  ATTACH해 함께 읽음 (연결마다 최근 사용한 MAX_ATTACHED개까지 유지)
+- 보관 이후 그 해에 추가된 거래는 현재 테이블에 남고 조회 시 함께 합쳐지며, 같은 연도를 다시 보관하면
+  기존 보관 파일과 합친 새 파일로 교체
+- 보관된 거래는 수정/삭제할 수 없고, 전문 검색 색인/정기 거래 감지/컬럼형 스냅샷은 현재 테이블만 대상
+  (보관 연도 검색은 LIKE 조건으로 처리), 지출 이상치 통계와 이상치 기록은 보관한 거래도 유지 (core.anomalies)
+- 백업: 보관 파일은 만든 뒤 바뀌지 않으며, core.backup이 데이터베이스와 함께 등록된 파일을 복사
+  (복사하는 동안 files_locked()로 보관 파일 교체/삭제를 막음)
+- 실행: python -m backend.app.core.archive [연도 ...] (연도 없이 실행하면 보관 목록 출력)
+"""
+import os
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+from sqlalchemy import DateTime, Integer, MetaData, String, Table, text
+from sqlalchemy.orm import Query, Session, aliased, selectinload
+from sqlalchemy.schema import CreateTable
+
+from .. import config, models
+from . import tenants, writer
+
+COMPLETED = models.TRANSACTION_STATUS_CODES[models.TransactionStatus.COMPLETED]
+
+# 연결 하나에 동시에 붙여 두는 보관 파일 수 (SQLite 기본 한도 10개 안에서 여유를 둠)
+MAX_ATTACHED = 8
+
+ARCHIVE_REGISTRY_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS transaction_archives (
+        year INTEGER PRIMARY KEY,
+        path TEXT NOT NULL,
+        row_count INTEGER NOT NULL,
+        archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+]
+
+_COLUMNS = ", ".join(column.name for column in models.Transaction.__table__.columns)
+
+# 보관 연도별 거래 테이블/엔티티 (스키마 이름: archive_<연도>)
+_metadata = MetaData()
+_entities: Dict[str, object] = {}
+_entities_lock = threading.Lock()
+_archive_lock = threading.Lock()
+
+
+class Archive(NamedTuple):
+    """보관된 연도"""
+    year: int
+    path: str
+    row_count: int
+    archived_at: datetime
+
+    @property
+    def schema(self) -> str:
+        return f"archive_{self.year}"
+
+
+def create_archive_registry(bind):
+    """보관 목록 테이블 생성"""
+    with bind.begin() as conn:
+        for ddl in ARCHIVE_REGISTRY_DDL:
+            conn.execute(text(ddl))
+
+
+@contextmanager
+def files_locked():
+    """블록 안에서는 이 프로세스의 보관(파일 교체/삭제)이 진행되지 않음 (진행 중인 보관은 끝날 때까지 기다림)"""
+    with _archive_lock:
+        yield
+
+
+def registered_paths(conn) -> List[str]:
+    """DB-API 연결(sqlite3)의 보관 목록에 등록된 파일 경로 (목록 테이블이 없으면 빈 목록)"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transaction_archives'"
+    ).fetchone()
+    if not exists:
+        return []
+    return [row[0] for row in conn.execute("SELECT path FROM transaction_archives ORDER BY year")]
+
+
+def _year_range(year: int) -> Tuple[datetime, datetime]:
+    return datetime(year, 1, 1), datetime(year + 1, 1, 1)
+
+
+def list_archives(db: Session) -> List[Archive]:
+    """보관된 연도 목록 (최신 연도부터)"""
+    rows = db.execute(text(
+        "SELECT year, path, row_count, archived_at FROM transaction_archives ORDER BY year DESC"
+    ).columns(year=Integer, path=String, row_count=Integer, archived_at=DateTime)).all()
+    return [Archive(*row) for row in rows]
+
+
+def archives_in_range(
+    db: Session,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> List[Archive]:
+    """[start_date, end_date] 기간이 닿는 보관 연도 (최신 연도부터, 기간 끝이 없으면 그쪽 전체)"""
+    return [
+        archived for archived in list_archives(db)
+        if (start_date is None or start_date < _year_range(archived.year)[1])
+        and (end_date is None or end_date >= _year_range(archived.year)[0])
+    ]
+
+
+def find(db: Session, year: int) -> Optional[Archive]:
+    """year가 보관된 연도면 Archive"""
+    return next((archived for archived in list_archives(db) if archived.year == year), None)
+
+
+def _table(schema: str) -> Table:
+    table = _metadata.tables.get(f"{schema}.transactions")
+    if table is None:
+        table = models.Transaction.__table__.to_metadata(_metadata, schema=schema)
+    return table
+
+
+def entity(schema: str):
+    """보관 테이블에 매핑한 Transaction 엔티티 (조회 결과는 Transaction 객체)"""
+    with _entities_lock:
+        mapped = _entities.get(schema)
+        if mapped is None:
+            mapped = _entities[schema] = aliased(models.Transaction, _table(schema), adapt_on_names=True)
+        return mapped
+
+
+def _uri(path: str) -> str:
+    return f"file:{quote(os.path.abspath(path))}?mode=ro"
+
+
+def attach(db: Session, archived: Archive):
+    """db 세션 연결에 보관 파일을 읽기 전용으로 붙이고 엔티티 반환"""
+    conn = db.connection()
+    attached: "OrderedDict[str, str]" = conn.connection.info.setdefault("archives", OrderedDict())
+    schema = archived.schema
+    if attached.get(schema) == archived.path:
+        attached.move_to_end(schema)
+        return entity(schema)
+
+    # 다시 보관되어 파일이 바뀐 연도나 가장 오래 쓰지 않은 파일은 떼어냄
+    if schema in attached:
+        conn.exec_driver_sql(f"DETACH DATABASE {schema}")
+        del attached[schema]
+    while len(attached) >= MAX_ATTACHED:
+        oldest, _ = attached.popitem(last=False)
+        conn.exec_driver_sql(f"DETACH DATABASE {oldest}")
+    conn.exec_driver_sql(f"ATTACH DATABASE ? AS {schema}", (_uri(archived.path),))
+    attached[schema] = archived.path
+    return entity(schema)
+
+
+def query(db: Session, archived_entity) -> Query:
+    """보관 테이블의 거래 조회 (카테고리 이름은 id 목록으로 한 번 더 읽음)"""
+    # 엔티티가 이름으로 열을 맞추므로(adapt_on_names) 조인한 카테고리의 id 열도 거래 id로 바뀜 -> 조인하지 않음
+    return db.query(archived_entity).options(selectinload(archived_entity.category_ref))
+
+
+def _archive_dir(bind) -> str:
+    tenant = tenants.tenant_of(bind)
+    return os.path.join(config.ARCHIVE_DIR, tenant) if tenant else config.ARCHIVE_DIR
+
+
+def _build_file(bind, year: int, previous: Optional[Archive], path: str) -> Tuple[int, str]:
+    """year 거래(+ 이전 보관분)를 path 파일로 복사, (건수, 복사 시점의 월별 데이터 버전) 반환"""
+    from . import reports
+
+    start, end = _year_range(year)
+    table = _table("archive_new")
+    with bind.connect() as conn:
+        dbapi_conn = conn.connection.driver_connection
+        isolation_level = dbapi_conn.isolation_level
+        dbapi_conn.isolation_level = None
+        try:
+            conn.exec_driver_sql("ATTACH DATABASE ? AS archive_new", (path,))
+            if previous:
+                conn.exec_driver_sql("ATTACH DATABASE ? AS archive_old", (_uri(previous.path),))
+            # 버전 확인과 복사를 한 읽기 트랜잭션에서 (복사 중인 데이터가 바뀌지 않음)
+            conn.exec_driver_sql("BEGIN")
+            with Session(bind=conn) as db:
+                version = reports.data_version(db, reports.period_months(year))
+            conn.execute(CreateTable(table, include_foreign_key_constraints=[]))
+            conn.exec_driver_sql("CREATE INDEX archive_new.ix_transactions_date ON transactions (date)")
+            conn.execute(
+                text(f"INSERT INTO archive_new.transactions ({_COLUMNS}) "
+                     f"SELECT {_COLUMNS} FROM main.transactions WHERE date >= :start AND date < :end"),
+                {"start": start, "end": end}
+            )
+            if previous:
+                conn.exec_driver_sql(
+                    f"INSERT INTO archive_new.transactions ({_COLUMNS}) "
+                    f"SELECT {_COLUMNS} FROM archive_old.transactions"
+                )
+            # 임의 기간 통계(core.daily_index)용 일별 합계
+            conn.exec_driver_sql("""
+                CREATE TABLE archive_new.daily_category_totals (
+                    category_id INTEGER NOT NULL,
+                    type INTEGER NOT NULL,
+                    day TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    total INTEGER NOT NULL,
+                    PRIMARY KEY (category_id, type, day)
+                ) WITHOUT ROWID
+            """)
+            conn.exec_driver_sql(f"""
+                INSERT INTO archive_new.daily_category_totals
+                SELECT ifnull(category_id, 0), type, substr(date, 1, 10), count(*), sum(amount)
+                FROM archive_new.transactions
+                WHERE status = {COMPLETED}
+                GROUP BY 1, 2, 3
+            """)
+            row_count = conn.exec_driver_sql("SELECT count(*) FROM archive_new.transactions").scalar()
+            conn.exec_driver_sql("COMMIT")
+            conn.exec_driver_sql("VACUUM archive_new")
+        except Exception:
+            if dbapi_conn.in_transaction:
+                conn.exec_driver_sql("ROLLBACK")
+            raise
+        finally:
+            for schema in ("archive_new", "archive_old"):
+                if schema in {row[1] for row in conn.exec_driver_sql("PRAGMA database_list")}:
+                    conn.exec_driver_sql(f"DETACH DATABASE {schema}")
+            dbapi_conn.isolation_level = isolation_level
+    return row_count, version
+
+
+def _register(session: Session, year: int, path: str, row_count: int, version: str) -> int:
+    """writer 작업: 복사 이후 변경이 없으면 현재 테이블의 year 거래를 삭제하고 보관 목록에 등록"""
+    from . import reports
+
+    if reports.data_version(session, reports.period_months(year)) != version:
+        raise RuntimeError(f"Transactions of {year} changed while archiving, try again")
+    start, end = _year_range(year)
+    # 옮기는 거래는 지출 통계/이상치 기록에서 빼지 않음 (core.anomalies 삭제 트리거가 archiving_years를 확인)
+    session.execute(text("INSERT INTO archiving_years (year) VALUES (:year)"), {"year": year})
+    deleted = session.execute(
+        text("DELETE FROM transactions WHERE date >= :start AND date < :end"), {"start": start, "end": end}
+    ).rowcount
+    session.execute(text("DELETE FROM archiving_years WHERE year = :year"), {"year": year})
+    session.execute(text("""
+        INSERT INTO transaction_archives (year, path, row_count) VALUES (:year, :path, :row_count)
+        ON CONFLICT(year) DO UPDATE SET
+            path = excluded.path, row_count = excluded.row_count, archived_at = CURRENT_TIMESTAMP
+    """), {"year": year, "path": path, "row_count": row_count})
+    return deleted
+
+
+def archive_year(db: Session, year: int) -> Archive:
+    """마감된 연도(올해 이전)의 거래를 보관 파일로 옮김 (이미 보관된 연도면 새로 생긴 거래를 합침)"""
+    if year >= date.today().year:
+        raise ValueError(f"{year} is not a closed year")
+
+    bind = db.get_bind()
+    with _archive_lock:
+        previous = find(db, year)
+        start, end = _year_range(year)
+        pending = db.execute(
+            text("SELECT count(*) FROM transactions WHERE date >= :start AND date < :end"),
+            {"start": start, "end": end}
+        ).scalar()
+        if not pending:
+            if previous:
+                return previous
+            raise ValueError(f"No transactions in {year}")
+
+        directory = _archive_dir(bind)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.abspath(os.path.join(directory, f"transactions_{year}_{uuid.uuid4().hex[:8]}.db"))
+        try:
+            row_count, version = _build_file(bind, year, previous, path)
+            writer.execute(db, _register, year, path, row_count, version)
+        except Exception:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+
+    # 이전 파일을 붙여 둔 연결은 경로가 바뀐 것을 보고 새 파일로 다시 붙임
+    if previous and os.path.exists(previous.path):
+        os.remove(previous.path)
+    db.rollback()
+    return find(db, year)
+
+
+if __name__ == "__main__":
+    from ..database import SessionLocal, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        for year in map(int, sys.argv[1:]):
+            archived = archive_year(db, year)
+            print(f"Archived {year}: {archived.row_count} transactions -> {archived.path}")
+        if len(sys.argv) == 1:
+            for archived in list_archives(db):
+                print(f"{archived.year}\t{archived.row_count}\t{archived.archived_at}\t{archived.path}")
+    finally:
+        db.close()
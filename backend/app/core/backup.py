@@ -0,0 +1,375 @@
+"""
+SQLite 온라인 백업 (앱을 멈추지 않고)
+
+- 복사: SQLite 백업 API로 config.BACKUP_PAGES_PER_STEP 페이지씩 복사하고 단계 사이마다
+  config.BACKUP_STEP_SLEEP_MS만큼 쉼 (단계마다 읽기 잠금을 잡았다 놓으므로 그 사이 요청/쓰기가 진행됨)
+- 다른 연결이 쓰면 SQLite가 백업을 처음부터 다시 시작하므로, config.BACKUP_MAX_RESTARTS번 넘게 다시 시작되면
+  이 프로세스의 writer를 잠시 멈추고(core.writer paused, 읽기는 계속) 한 번에 복사
+- 검증/저장: PRAGMA quick_check 후 임시 파일을 교체해 config.BACKUP_DIR(테넌트는 하위 디렉터리)에
+  finance_<시각>.db로 저장하고 최근 config.BACKUP_KEEP개만 유지
+- 보관 파일: 백업의 보관 목록(core.archive)에 등록된 파일을 finance_<시각>.archives/에 함께 저장
+  (보관 파일은 바뀌지 않으므로 가능하면 하드 링크), 오래된 백업을 지울 때 함께 삭제
+- 예약: config.BACKUP_INTERVAL_HOURS > 0이면 lifespan에서 시작한 스레드가 마지막 백업 시각 기준으로 주기 실행
+- 진행률/영향: status()가 진행 중 백업의 페이지 진행률과 마지막 결과(소요 시간, 처리량, 다시 시작 횟수,
+  쓰기를 멈춘 시간) 반환
+- 복원: python -m backend.app.core.backup restore <백업 파일> [테넌트] (앱을 멈춘 상태에서 실행,
+  현재 데이터베이스를 먼저 백업하고 없어진 보관 파일을 되살린 뒤 백업 API로 덮어쓰고
+  컬럼형 스냅샷/리포트 캐시를 비움)
+- 실행: python -m backend.app.core.backup [테넌트] (백업), python -m backend.app.core.backup list [테넌트]
+"""
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from urllib.parse import quote
+
+from .. import config, schemas
+from . import analytics, archive, reports, snapshot, tenants, writer
+
+logger = logging.getLogger(__name__)
+
+BACKUP_PREFIX = "finance_"
+ARCHIVES_SUFFIX = ".archives"
+
+
+class _Restart(Exception):
+    """단계 복사 중 다시 시작된 횟수가 한도를 넘음"""
+
+
+class _Cancelled(Exception):
+    """앱 종료로 백업 취소"""
+
+
+_backup_lock = threading.Lock()
+_status_lock = threading.Lock()
+_status = schemas.BackupStatus(running=False)
+_stop = threading.Event()
+_scheduler: Optional[threading.Thread] = None
+
+
+def status() -> schemas.BackupStatus:
+    """진행 중인 백업의 진행률과 마지막 백업 결과"""
+    with _status_lock:
+        return _status.model_copy()
+
+
+def _update_status(**fields):
+    global _status
+    with _status_lock:
+        _status = _status.model_copy(update=fields)
+
+
+def backup_dir(tenant: Optional[str] = None) -> str:
+    return os.path.join(config.BACKUP_DIR, tenant) if tenant else config.BACKUP_DIR
+
+
+def list_backups(tenant: Optional[str] = None) -> List[schemas.BackupFile]:
+    """저장된 백업 (최신순)"""
+    directory = backup_dir(tenant)
+    try:
+        entries = [
+            entry for entry in os.scandir(directory)
+            if entry.name.startswith(BACKUP_PREFIX) and entry.name.endswith(".db")
+        ]
+    except FileNotFoundError:
+        return []
+    backups = [
+        schemas.BackupFile(
+            name=entry.name,
+            path=os.path.abspath(entry.path),
+            size=entry.stat().st_size,
+            created_at=datetime.fromtimestamp(entry.stat().st_mtime),
+        )
+        for entry in entries
+    ]
+    # 파일 이름의 시각 순 (mtime은 복사/복원으로 바뀔 수 있음)
+    return sorted(backups, key=lambda b: b.name, reverse=True)
+
+
+def archives_dir(backup_path: str) -> str:
+    """백업과 함께 저장한 보관 파일 디렉터리 (finance_<시각>.db -> finance_<시각>.archives)"""
+    return os.path.splitext(backup_path)[0] + ARCHIVES_SUFFIX
+
+
+def prune(tenant: Optional[str] = None, keep: Optional[int] = None) -> List[str]:
+    """최근 keep개를 넘는 오래된 백업(과 함께 저장한 보관 파일) 삭제, 삭제한 경로 반환"""
+    keep = config.BACKUP_KEEP if keep is None else keep
+    removed = []
+    for old in list_backups(tenant)[max(keep, 1):]:
+        shutil.rmtree(archives_dir(old.path), ignore_errors=True)
+        try:
+            os.remove(old.path)
+            removed.append(old.path)
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def _copy_archives(paths: List[str], directory: str):
+    """보관 파일을 directory로 복사 (같은 파일 시스템이면 하드 링크)"""
+    os.makedirs(directory, exist_ok=True)
+    for path in paths:
+        if not os.path.exists(path):
+            raise RuntimeError(f"Archive file is missing: {path}")
+        target = os.path.join(directory, os.path.basename(path))
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copy2(path, target)
+
+
+def _database_path(bind) -> str:
+    path = bind.url.database
+    if not path or path == ":memory:":
+        raise ValueError("Only file-based SQLite databases can be backed up")
+    return os.path.abspath(path)
+
+
+def backup_database(
+    bind,
+    pages_per_step: Optional[int] = None,
+    step_sleep_ms: Optional[float] = None,
+    prune_old: bool = True
+) -> schemas.BackupResult:
+    """bind 데이터베이스를 온라인으로 백업하고 (prune_old면) 보관 개수를 넘는 이전 백업 삭제 (동시에 하나만 실행)"""
+    pages_per_step = pages_per_step or config.BACKUP_PAGES_PER_STEP
+    step_sleep = (config.BACKUP_STEP_SLEEP_MS if step_sleep_ms is None else step_sleep_ms) / 1000
+    if not _backup_lock.acquire(blocking=False):
+        raise RuntimeError("A backup is already running")
+
+    tenant = tenants.tenant_of(bind)
+    created_at = datetime.now()
+    path = os.path.abspath(os.path.join(
+        backup_dir(tenant), f"{BACKUP_PREFIX}{created_at:%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}.db"
+    ))
+    partial = f"{path}.tmp"
+    partial_archives = f"{archives_dir(path)}.tmp"
+    try:
+        source_path = _database_path(bind)
+        os.makedirs(backup_dir(tenant), exist_ok=True)
+        _update_status(
+            running=True, tenant=tenant, pages_done=0, pages_total=0, restarts=0,
+            started_at=created_at, error=None
+        )
+
+        started = time.perf_counter()
+        steps = restarts = 0
+        remaining_before = None
+        write_pause = 0.0
+
+        def progress(status, remaining, total):
+            nonlocal steps, restarts, remaining_before
+            steps += 1
+            # 남은 페이지가 늘었으면 다른 연결의 쓰기로 처음부터 다시 시작된 것
+            if remaining_before is not None and remaining > remaining_before:
+                restarts += 1
+            remaining_before = remaining
+            _update_status(pages_done=total - remaining, pages_total=total, restarts=restarts)
+            if _stop.is_set():
+                raise _Cancelled("Backup cancelled by shutdown")
+            if remaining and restarts > config.BACKUP_MAX_RESTARTS:
+                raise _Restart()
+            if remaining:
+                time.sleep(step_sleep)
+
+        source = sqlite3.connect(source_path, check_same_thread=False)
+        target = sqlite3.connect(partial)
+        # 백업이 가리키는 보관 파일을 복사할 때까지 보관 파일이 교체/삭제되지 않도록
+        with archive.files_locked():
+            try:
+                try:
+                    source.backup(target, pages=pages_per_step, progress=progress)
+                except _Restart:
+                    # 이 프로세스의 쓰기만 멈춤 (다른 워커 프로세스의 쓰기는 잠금 대기 후 진행)
+                    paused = time.perf_counter()
+                    with writer.get_writer(bind).paused():
+                        source.backup(target)
+                    write_pause = time.perf_counter() - paused
+                pages = target.execute("PRAGMA page_count").fetchone()[0]
+                check = target.execute("PRAGMA quick_check").fetchone()[0]
+                if check != "ok":
+                    raise RuntimeError(f"Backup failed integrity check: {check}")
+                archive_paths = archive.registered_paths(target)
+            finally:
+                target.close()
+                source.close()
+            if archive_paths:
+                _copy_archives(archive_paths, partial_archives)
+
+        os.replace(partial, path)
+        if archive_paths:
+            os.replace(partial_archives, archives_dir(path))
+        duration = time.perf_counter() - started
+        size = os.path.getsize(path)
+        result = schemas.BackupResult(
+            path=path,
+            tenant=tenant,
+            size=size,
+            pages=pages,
+            steps=steps,
+            restarts=restarts,
+            write_pause_ms=round(write_pause * 1000, 2),
+            duration_ms=round(duration * 1000, 2),
+            throughput_mb_s=round(size / (1024 * 1024) / duration, 2) if duration else 0.0,
+            created_at=created_at,
+        )
+        _update_status(running=False, pages_done=pages, pages_total=pages, last=result)
+        if prune_old:
+            prune(tenant)
+        return result
+    except Exception as e:
+        _update_status(running=False, error=str(e) or type(e).__name__)
+        if os.path.exists(partial):
+            os.remove(partial)
+        shutil.rmtree(partial_archives, ignore_errors=True)
+        raise
+    finally:
+        _backup_lock.release()
+
+
+def restore(backup_path: str, tenant: Optional[str] = None) -> str:
+    """백업 파일로 데이터베이스 복원 (앱을 멈춘 상태에서 실행), 복원 전 데이터베이스의 백업 경로 반환"""
+    from ..database import engine
+
+    backup_path = os.path.abspath(backup_path)
+    source = sqlite3.connect(f"file:{quote(backup_path)}?mode=ro", uri=True)
+    try:
+        check = source.execute("PRAGMA quick_check").fetchone()[0]
+        if check != "ok":
+            raise RuntimeError(f"Backup failed integrity check: {check}")
+
+        # 백업 이후 다시 보관되어 지워진 보관 파일은 백업과 함께 저장한 사본에서 되살림
+        saved_archives = archives_dir(backup_path)
+        missing = [path for path in archive.registered_paths(source) if not os.path.exists(path)]
+        unavailable = [
+            path for path in missing
+            if not os.path.exists(os.path.join(saved_archives, os.path.basename(path)))
+        ]
+        if unavailable:
+            raise RuntimeError(f"Archive files of the backup are missing: {', '.join(unavailable)}")
+
+        bind = tenants.get_engines().acquire(tenant) if tenant else engine
+        try:
+            # 잘못 복원해도 되돌릴 수 있도록 현재 데이터베이스를 먼저 백업 (복원할 백업이 정리되지 않도록 prune 생략)
+            previous = backup_database(bind, prune_old=False).path
+            for path in missing:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                shutil.copy2(os.path.join(saved_archives, os.path.basename(path)), path)
+            target = sqlite3.connect(_database_path(bind))
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+        finally:
+            if tenant:
+                tenants.get_engines().release(bind)
+    finally:
+        source.close()
+
+    # 복원한 데이터와 맞지 않는 파생 파일 정리 (스냅샷은 기본 데이터베이스만 사용)
+    if not tenant:
+        snapshot.invalidate()
+        analytics.invalidate()
+    reports.clear_cache(tenant)
+    return previous
+
+
+def _targets() -> List[Optional[str]]:
+    """예약 백업 대상 (멀티 테넌트 모드에서는 테넌트 디렉터리의 모든 <테넌트>.db)"""
+    if not tenants.is_enabled():
+        return [None]
+    try:
+        return sorted(
+            entry.name[:-3] for entry in os.scandir(config.TENANT_DB_DIR) if entry.name.endswith(".db")
+        )
+    except FileNotFoundError:
+        return []
+
+
+def is_running() -> bool:
+    return _backup_lock.locked()
+
+
+def run_backup(tenant: Optional[str] = None) -> schemas.BackupResult:
+    """기본 데이터베이스 또는 tenant 데이터베이스 백업"""
+    from ..database import engine
+
+    if not tenant:
+        return backup_database(engine)
+    bind = tenants.get_engines().acquire(tenant)
+    try:
+        return backup_database(bind)
+    finally:
+        tenants.get_engines().release(bind)
+
+
+def _seconds_until_due(tenant: Optional[str], interval: float) -> float:
+    # 마지막 백업 시각 기준 (재시작하거나 다른 워커가 먼저 백업했으면 그만큼 미룸)
+    backups = list_backups(tenant)
+    if not backups:
+        return 0.0
+    elapsed = (datetime.now() - backups[0].created_at).total_seconds()
+    return max(0.0, interval - elapsed)
+
+
+def _run_scheduler(interval: float):
+    while not _stop.is_set():
+        wait = min((_seconds_until_due(tenant, interval) for tenant in _targets()), default=interval)
+        if _stop.wait(wait):
+            return
+        for tenant in _targets():
+            if _stop.is_set() or _seconds_until_due(tenant, interval) > 0:
+                continue
+            try:
+                result = run_backup(tenant)
+                logger.info("Backup %s: %d bytes in %.0f ms", result.path, result.size, result.duration_ms)
+            except _Cancelled:
+                return
+            except Exception:
+                logger.exception("Scheduled backup failed (tenant=%s)", tenant)
+        # 실패한 대상이 바로 다시 시도되지 않도록 잠시 대기
+        if _stop.wait(60):
+            return
+
+
+def start_scheduler():
+    """config.BACKUP_INTERVAL_HOURS > 0이면 예약 백업 스레드 시작 (lifespan에서 호출)"""
+    global _scheduler
+    _stop.clear()
+    if config.BACKUP_INTERVAL_HOURS <= 0 or _scheduler is not None:
+        return
+    _scheduler = threading.Thread(
+        target=_run_scheduler, args=(config.BACKUP_INTERVAL_HOURS * 3600,), name="backup", daemon=True
+    )
+    _scheduler.start()
+
+
+def shutdown():
+    """예약 스레드 종료 및 진행 중인 백업 취소 (앱 종료 시 lifespan에서 호출)"""
+    global _scheduler
+    _stop.set()
+    thread, _scheduler = _scheduler, None
+    if thread is not None:
+        thread.join()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["restore"] and len(args) >= 2:
+        previous = restore(args[1], args[2] if len(args) > 2 else None)
+        print(f"Restored {args[1]} (previous database saved to {previous})")
+    elif args[:1] == ["list"]:
+        for b in list_backups(args[1] if len(args) > 1 else None):
+            print(f"{b.created_at:%Y-%m-%d %H:%M:%S}\t{b.size}\t{b.path}")
+    else:
+        result = run_backup(args[0] if args else None)
+        print(
+            f"Backed up to {result.path}: {result.size} bytes, {result.steps} steps, "
+            f"{result.restarts} restarts, {result.duration_ms:.0f} ms ({result.throughput_mb_s} MB/s)"
+        )
@@ -0,0 +1,225 @@
+"""
+응답 압축 (Accept-Encoding 협상)
+
+- 인코딩: zstd(zstandard 설치 시) > br(brotli 설치 시) > gzip 순으로 클라이언트가 받는 것 중 q값이 가장 높은 것
+- CompressionMiddleware: JSON/NDJSON/텍스트 응답 중 config.COMPRESSION_MIN_BYTES 이상인 것만 압축
+  스트리밍 응답은 버퍼링하지 않고 청크마다 압축해 flush한 뒤 바로 전송 (클라이언트가 즉시 풀 수 있음)
+  이미 압축된 형식(XLSX 등 zip 컨테이너)과 이벤트 스트림, 이미 Content-Encoding이 있는 응답은 그대로 전송
+- 캐시 파일: precompress()가 생성 시점에 최고 압축률로 압축본(.gz/.zst/.br)을 한 번 만들어 두고
+  file_response()가 받을 수 있는 압축본을 그대로 보내므로 반복 다운로드에 CPU를 쓰지 않음
+  (core.reports는 CSV 리포트에만 사용, XLSX는 zip 컨테이너라 압축본이 PRECOMPRESS_MAX_RATIO 안으로 작아지지 않음)
+"""
+import os
+import uuid
+import zlib
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import FileResponse
+
+from .. import config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 선호 순서 (q값이 같을 때 앞쪽 우선)
+PREFERENCE = ["zstd", "br", "gzip"]
+
+# 캐시 파일 압축본 확장자
+SUFFIXES = {"zstd": ".zst", "br": ".br", "gzip": ".gz"}
+
+# 압축본이 원본의 이 비율보다 크면 저장하지 않음 (이미 압축된 파일은 이득이 거의 없음)
+PRECOMPRESS_MAX_RATIO = 0.9
+
+# 압축할 응답 형식 (text/event-stream은 이벤트마다 바로 전달되어야 하므로 제외)
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript", "application/xml",
+    "text/plain", "text/csv", "text/html", "text/css", "text/xml",
+)
+
+
+class _Gzip:
+    def __init__(self, level: int = 6):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        )
+
+
+class _Zstd:
+    def __init__(self, level: int = 3):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+
+class _Brotli:
+    def __init__(self, quality: int = 4):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.process(data)
+        return output + (self._compressor.finish() if final else self._compressor.flush())
+
+
+# 인코딩 -> (요청마다 쓰는 압축기, 캐시 파일용 최고 압축률 압축기)
+_ENCODERS = {"gzip": (lambda: _Gzip(6), lambda: _Gzip(9))}
+if zstandard is not None:
+    _ENCODERS["zstd"] = (lambda: _Zstd(3), lambda: _Zstd(19))
+if brotli is not None:
+    _ENCODERS["br"] = (lambda: _Brotli(4), lambda: _Brotli(11))
+
+
+def available_encodings() -> List[str]:
+    """사용 가능한 인코딩 (선호 순서)"""
+    return [encoding for encoding in PREFERENCE if encoding in _ENCODERS]
+
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    """Accept-Encoding 헤더에서 받을 수 있는 인코딩 목록 (q값 높은 순, 같으면 선호 순서)"""
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+
+    def weight(encoding: str) -> float:
+        return weights.get(encoding, weights.get("*", 0.0))
+
+    encodings = [encoding for encoding in available_encodings() if weight(encoding) > 0]
+    return sorted(encodings, key=lambda encoding: -weight(encoding))
+
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.split(";")[0].strip().lower() in COMPRESSIBLE_TYPES
+
+
+class CompressionMiddleware:
+    """Accept-Encoding에 맞춰 응답 본문 압축 (순수 ASGI 미들웨어)"""
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = config.COMPRESSION_MIN_BYTES if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.minimum_size < 0:
+            await self.app(scope, receive, send)
+            return
+
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        encoding = accepted[0] if accepted else None
+        start = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (not _is_compressible(headers.get("content-type", ""))
+                        or "content-encoding" in headers or message["status"] in (204, 206, 304)):
+                    passthrough = True
+                    await send(message)
+                    return
+                # 압축 여부와 관계없이 캐시가 인코딩별로 구분하도록
+                MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+                if encoding is None:
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                # 한 번에 끝나는 작은 응답은 압축 이득보다 비용이 커서 그대로 전송
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = _ENCODERS[encoding][0]()
+                headers = MutableHeaders(scope=start)
+                headers["Content-Encoding"] = encoding
+                del headers["Content-Length"]
+                if not more_body:
+                    compressed = compressor.compress(body, final=True)
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                await send(start)
+
+            await send({
+                "type": "http.response.body",
+                "body": compressor.compress(body, final=not more_body),
+                "more_body": more_body,
+            })
+
+        await self.app(scope, receive, send_compressed)
+
+
+def variant_paths(path: str) -> List[str]:
+    """path의 저장된 압축본 경로 목록"""
+    return [path + suffix for suffix in SUFFIXES.values() if os.path.exists(path + suffix)]
+
+
+def precompress(path: str):
+    """캐시 파일의 압축본을 인코딩마다 최고 압축률로 만들어 둠 (원본보다 충분히 작을 때만 저장)"""
+    with open(path, "rb") as f:
+        data = f.read()
+    for encoding in available_encodings():
+        compressed = _ENCODERS[encoding][1]().compress(data, final=True)
+        if len(compressed) > len(data) * PRECOMPRESS_MAX_RATIO:
+            continue
+        target = path + SUFFIXES[encoding]
+        partial = f"{target}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(partial, "wb") as f:
+                f.write(compressed)
+            os.replace(partial, target)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+
+def file_response(request: Request, path: str, media_type: str, filename: str) -> FileResponse:
+    """캐시 파일 응답 (클라이언트가 받을 수 있는 압축본이 있으면 압축 없이 그대로 전송)"""
+    for encoding in accepted_encodings(request.headers.get("accept-encoding", "")):
+        variant = path + SUFFIXES[encoding]
+        if os.path.exists(variant):
+            return FileResponse(
+                variant, media_type=media_type, filename=filename,
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+            )
+    return FileResponse(path, media_type=media_type, filename=filename, headers={"Vary": "Accept-Encoding"})
@@ -0,0 +1,375 @@
+"""
+일별 누적합 인덱스: 임의 기간의 카테고리별 합계를 두 누적값의 차로 계산
+
+- 저장: transactions 트리거가 (카테고리, 수입/지출, 날짜) 칸마다 완료된 거래의 건수/합계를
+  daily_category_totals에 유지 (쓰기마다 한 칸만 갱신, 칸을 바꾼 시점의 변경 버전도 기록)
+- 메모리: 엔진마다 (카테고리, 타입) x 날짜 누적합 배열을 두고, 조회 시 마지막으로 읽은 버전 이후
+  바뀐 칸만 읽어 그 날짜부터 누적합을 다시 계산 (보통 최근 날짜라 뒤쪽 몇 칸만 계산)
+- 조회: 기간 [start, end]의 합계 = 누적합[end] - 누적합[start - 1], 카테고리 수만큼의 배열 연산
+- 보관 연도(core.archive)는 보관 파일에 저장된 일별 합계를 기간이 닿을 때만 더함
+- 검증: python -m backend.app.core.daily_index 로 거래 테이블 원시 집계와 비교
+"""
+import random
+import sys
+import threading
+import weakref
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .. import crud, models, schemas
+from . import archive
+
+# numpy는 기동 시간을 줄이려고 인덱스를 처음 만들 때 로드
+if TYPE_CHECKING:
+    import numpy as np
+
+INCOME = models.TRANSACTION_TYPE_CODES[models.TransactionType.INCOME]
+EXPENSE = models.TRANSACTION_TYPE_CODES[models.TransactionType.EXPENSE]
+COMPLETED = models.TRANSACTION_STATUS_CODES[models.TransactionStatus.COMPLETED]
+
+# 카테고리가 없는 거래는 category_id 0으로 집계
+_NEW_COUNTED = f"new.status = {COMPLETED}"
+_OLD_COUNTED = f"old.status = {COMPLETED}"
+_CURRENT_VERSION = "(SELECT version FROM daily_totals_version)"
+
+_ADD_STATEMENTS = f"""
+    UPDATE daily_totals_version SET version = version + 1 WHERE {_NEW_COUNTED};
+    INSERT INTO daily_category_totals (category_id, type, day, count, total, version)
+    SELECT ifnull(new.category_id, 0), new.type, substr(new.date, 1, 10), 1, new.amount, {_CURRENT_VERSION}
+    WHERE {_NEW_COUNTED}
+    ON CONFLICT(category_id, type, day) DO UPDATE SET
+        count = count + 1,
+        total = total + excluded.total,
+        version = excluded.version;
+"""
+
+_REMOVE_STATEMENTS = f"""
+    UPDATE daily_totals_version SET version = version + 1 WHERE {_OLD_COUNTED};
+    UPDATE daily_category_totals SET
+        count = count - 1,
+        total = total - old.amount,
+        version = {_CURRENT_VERSION}
+    WHERE {_OLD_COUNTED} AND category_id = ifnull(old.category_id, 0)
+      AND type = old.type AND day = substr(old.date, 1, 10);
+"""
+
+DAILY_INDEX_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS daily_category_totals (
+        category_id INTEGER NOT NULL,
+        type INTEGER NOT NULL,
+        day TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        total INTEGER NOT NULL,
+        version INTEGER NOT NULL,
+        PRIMARY KEY (category_id, type, day)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS daily_totals_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO daily_totals_version VALUES (1, 0)",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS daily_totals_ai AFTER INSERT ON transactions BEGIN
+        {_ADD_STATEMENTS}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS daily_totals_ad AFTER DELETE ON transactions BEGIN
+        {_REMOVE_STATEMENTS}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS daily_totals_au AFTER UPDATE OF date, amount, category_id, type, status
+    ON transactions BEGIN
+        {_REMOVE_STATEMENTS}
+        {_ADD_STATEMENTS}
+    END
+    """,
+]
+
+# 원시 집계 (트리거 결과와 같은 형태): 검증과 재계산에 사용
+_RAW_TOTALS = f"""
+    SELECT ifnull(category_id, 0) AS category_id, type, substr(date, 1, 10) AS day,
+           count(*) AS count, sum(amount) AS total
+    FROM transactions
+    WHERE status = {COMPLETED}
+    GROUP BY 1, 2, 3
+"""
+
+
+def create_daily_index(bind):
+    """일별 합계 테이블 및 트리거 생성 (테이블을 처음 만들 때 기존 거래로 채움)"""
+    with bind.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_category_totals'")
+        ).first()
+        for ddl in DAILY_INDEX_DDL:
+            conn.execute(text(ddl))
+        if not exists:
+            _rebuild(conn)
+
+
+def _rebuild(conn):
+    conn.execute(text("UPDATE daily_totals_version SET version = version + 1"))
+    conn.execute(text("DELETE FROM daily_category_totals"))
+    conn.execute(text(
+        "INSERT INTO daily_category_totals (category_id, type, day, count, total, version) "
+        f"SELECT category_id, type, day, count, total, {_CURRENT_VERSION} FROM ({_RAW_TOTALS})"
+    ))
+
+
+def rebuild(bind):
+    """일별 합계를 거래 테이블에서 다시 계산 (메모리 인덱스는 다음 조회 때 전체를 다시 읽음)"""
+    with bind.begin() as conn:
+        _rebuild(conn)
+    with _indexes_lock:
+        _indexes.pop(bind, None)
+
+
+def _day_number(day: date) -> int:
+    import numpy as np
+
+    return int(np.datetime64(day, "D").astype(np.int64))
+
+
+class DailyIndex:
+    """한 엔진의 (카테고리, 타입) x 날짜 누적 건수/합계 배열"""
+
+    def __init__(self):
+        import numpy as np
+
+        self.version = -1
+        self.keys: List[Tuple[int, int]] = []
+        self._rows = {}
+        self.origin = 0  # 첫 열의 날짜 (1970-01-01 기준 일수)
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+        self.totals = np.zeros((0, 0), dtype=np.int64)
+        # 누적 배열은 한 열 더 길고 첫 열이 0: cum[:, i]는 origin부터 i일치 합
+        self.cum_counts = np.zeros((0, 1), dtype=np.int64)
+        self.cum_totals = np.zeros((0, 1), dtype=np.int64)
+        self.lock = threading.Lock()
+
+    def refresh(self, conn):
+        """마지막으로 읽은 버전 이후 바뀐 칸을 반영"""
+        # 버전을 먼저 읽음: 그 사이 바뀐 칸은 다음에 다시 읽혀도 값을 덮어쓰므로 결과가 같음
+        # (version 인덱스는 쓰기마다 갱신 비용이 커서 두지 않음, 칸 수가 작아 스캔으로 충분)
+        version = conn.execute(text("SELECT version FROM daily_totals_version")).scalar()
+        if version == self.version:
+            return
+        rows = conn.execute(
+            text("SELECT category_id, type, day, count, total FROM daily_category_totals WHERE version > :version"),
+            {"version": self.version}
+        ).all()
+        if self.version < 0:
+            self._reset()
+        self.version = version
+        if rows:
+            self._apply(rows)
+
+    def _reset(self):
+        import numpy as np
+
+        self.keys, self._rows = [], {}
+        self.origin = 0
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+        self.totals = np.zeros((0, 0), dtype=np.int64)
+
+    def _apply(self, rows):
+        import numpy as np
+
+        for category_id, type, _, _, _ in rows:
+            if (category_id, type) not in self._rows:
+                self._rows[(category_id, type)] = len(self.keys)
+                self.keys.append((category_id, type))
+        days = np.array([r.day for r in rows], dtype="datetime64[D]").astype(np.int64)
+        key_rows = np.array([self._rows[(r.category_id, r.type)] for r in rows], dtype=np.int64)
+
+        # 키/날짜 범위가 늘었으면 배열 확장 (기존 값은 그대로 옮김)
+        width = self.counts.shape[1]
+        start = min(int(days.min()), self.origin) if width else int(days.min())
+        end = max(int(days.max()) + 1, self.origin + width) if width else int(days.max()) + 1
+        if len(self.keys) != self.counts.shape[0] or start != self.origin or end - start != width:
+            shift = self.origin - start if width else 0
+            for name in ("counts", "totals"):
+                resized = np.zeros((len(self.keys), end - start), dtype=np.int64)
+                old = getattr(self, name)
+                resized[:old.shape[0], shift:shift + width] = old
+                setattr(self, name, resized)
+            self.origin = start
+            first = 0
+        else:
+            first = int(days.min()) - start
+
+        columns = days - self.origin
+        self.counts[key_rows, columns] = [r.count for r in rows]
+        self.totals[key_rows, columns] = [r.total for r in rows]
+
+        # 바뀐 가장 이른 날짜부터 누적합 다시 계산
+        if first == 0:
+            self.cum_counts = np.zeros((len(self.keys), self.counts.shape[1] + 1), dtype=np.int64)
+            self.cum_totals = np.zeros_like(self.cum_counts)
+        self.cum_counts[:, first + 1:] = self.cum_counts[:, [first]] + np.cumsum(self.counts[:, first:], axis=1)
+        self.cum_totals[:, first + 1:] = self.cum_totals[:, [first]] + np.cumsum(self.totals[:, first:], axis=1)
+
+    def range_totals(self, start: date, end: date) -> Tuple["np.ndarray", "np.ndarray"]:
+        """키별 [start, end] 기간 (건수, 합계) 배열 (self.keys 순서)"""
+        width = self.counts.shape[1]
+        lo = min(max(_day_number(start) - self.origin, 0), width)
+        hi = min(max(_day_number(end) - self.origin + 1, 0), width)
+        hi = max(hi, lo)
+        return (
+            self.cum_counts[:, hi] - self.cum_counts[:, lo],
+            self.cum_totals[:, hi] - self.cum_totals[:, lo],
+        )
+
+
+# 엔진별 인덱스 (테넌트 엔진이 정리되면 함께 해제)
+_indexes: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_index(bind) -> DailyIndex:
+    with _indexes_lock:
+        index = _indexes.get(bind)
+        if index is None:
+            index = _indexes[bind] = DailyIndex()
+        return index
+
+
+def range_totals(db: Session, start: date, end: date) -> List[Tuple[int, int, int, int]]:
+    """[start, end] 기간의 (category_id, 타입 코드, 건수, 합계) 목록 (건수 0인 키 제외)"""
+    index = get_index(db.get_bind())
+    with index.lock:
+        index.refresh(db.connection())
+        counts, totals = index.range_totals(start, end)
+        keys = list(index.keys)
+    merged = {key: (int(count), int(total)) for key, count, total in zip(keys, counts, totals) if count}
+
+    # 보관 연도는 보관 파일의 일별 합계로 (현재 테이블에는 보관 이후 그 해에 추가된 거래만 남음)
+    for archived in _archives_in_range(db, start, end):
+        archive.attach(db, archived)
+        for category_id, type, count, total in db.execute(text(f"""
+            SELECT category_id, type, sum(count), sum(total) FROM {archived.schema}.daily_category_totals
+            WHERE day BETWEEN :start AND :end
+            GROUP BY 1, 2
+        """), {"start": start.isoformat(), "end": end.isoformat()}):
+            previous_count, previous_total = merged.get((category_id, type), (0, 0))
+            merged[(category_id, type)] = (previous_count + count, previous_total + total)
+
+    return [(category_id, type, count, total) for (category_id, type), (count, total) in merged.items() if count]
+
+
+def _archives_in_range(db: Session, start: date, end: date) -> List[archive.Archive]:
+    return archive.archives_in_range(db, datetime.combine(start, time.min), datetime.combine(end, time.max))
+
+
+def get_range_stats(db: Session, start: date, end: date) -> schemas.RangeStats:
+    """[start, end] 기간 수입/지출 합계와 카테고리별 통계 (완료된 거래 기준)"""
+    totals = range_totals(db, start, end)
+    names = dict(db.query(models.Category.id, models.Category.name))
+
+    def by_category(type_code: int):
+        # 카테고리가 없는 거래는 합계에만 포함 (월별 카테고리 통계와 같은 기준)
+        rows = [(names[c], total, count) for c, t, count, total in totals if t == type_code and c in names]
+        return crud.build_category_stats(sorted(rows))
+
+    income = sum(total for _, t, _, total in totals if t == INCOME)
+    expense = sum(total for _, t, _, total in totals if t == EXPENSE)
+    return schemas.RangeStats(
+        start_date=start,
+        end_date=end,
+        total_income=income,
+        total_expense=expense,
+        net_amount=income - expense,
+        transaction_count=sum(count for _, _, count, _ in totals),
+        income=by_category(INCOME),
+        expense=by_category(EXPENSE),
+    )
+
+
+def _raw_range_totals(db: Session, start: date, end: date) -> List[Tuple[int, int, int, int]]:
+    def raw(table: str):
+        return db.execute(text(f"""
+            SELECT ifnull(category_id, 0), type, count(*), sum(amount) FROM {table}
+            WHERE status = {COMPLETED} AND date >= :start AND date < :end
+            GROUP BY 1, 2
+        """), {"start": start.isoformat(), "end": (end + timedelta(days=1)).isoformat()}).all()
+
+    rows = raw("main.transactions")
+    for archived in _archives_in_range(db, start, end):
+        archive.attach(db, archived)
+        rows += raw(f"{archived.schema}.transactions")
+
+    merged = {}
+    for category_id, type, count, total in rows:
+        previous_count, previous_total = merged.get((category_id, type), (0, 0))
+        merged[(category_id, type)] = (previous_count + count, previous_total + total)
+    return [(category_id, type, count, total) for (category_id, type), (count, total) in merged.items()]
+
+
+def check_consistency(db: Session, samples: int = 200, seed: Optional[int] = None) -> List[str]:
+    """일별 합계 테이블과 누적합 조회 결과를 원시 집계와 비교, 차이 목록 반환 (빈 목록이면 일치)"""
+    mismatches = [
+        f"daily cell {tuple(r)}"
+        for r in db.execute(text(f"""
+            SELECT category_id, type, day, count, total FROM ({_RAW_TOTALS})
+            EXCEPT
+            SELECT category_id, type, day, count, total FROM daily_category_totals WHERE count != 0
+        """))
+    ]
+    mismatches += [
+        f"stale daily cell {tuple(r)}"
+        for r in db.execute(text(f"""
+            SELECT category_id, type, day, count, total FROM daily_category_totals WHERE count != 0
+            EXCEPT
+            SELECT category_id, type, day, count, total FROM ({_RAW_TOTALS})
+        """))
+    ]
+
+    bounds = db.execute(text(
+        "SELECT min(day), max(day) FROM daily_category_totals WHERE count != 0"
+    )).first()
+    days = [date.fromisoformat(day) for day in bounds if day]
+    # 보관 연도 기간도 표본에 포함
+    for archived in archive.list_archives(db):
+        days += [date(archived.year, 1, 1), date(archived.year, 12, 31)]
+    if not days:
+        return mismatches
+    first, last = min(days), max(days)
+    span = (last - first).days
+
+    # 전체 기간, 범위 밖으로 걸친 기간, 무작위 기간
+    rng = random.Random(seed)
+    ranges = [(first, last), (first - timedelta(days=30), first), (last, last + timedelta(days=30))]
+    for _ in range(samples):
+        start = first + timedelta(days=rng.randint(0, span))
+        ranges.append((start, min(start + timedelta(days=rng.choice([0, 6, 29, 89, 364])), last)))
+
+    for start, end in ranges:
+        indexed = sorted(range_totals(db, start, end))
+        raw = sorted(_raw_range_totals(db, start, end))
+        if indexed != raw:
+            mismatches.append(f"range {start}..{end}: index={indexed} raw={raw}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        mismatches = check_consistency(db)
+    finally:
+        db.close()
+
+    for line in mismatches:
+        print(line)
+    print("daily index OK" if not mismatches else f"{len(mismatches)} mismatches")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,68 @@
+"""
+백그라운드 작업 실행기
+
+- 실행: 프로세스별 ThreadPoolExecutor (최대 config.IMPORT_WORKERS개 동시 실행, 나머지는 대기)
+- CPU 위주 단계(여러 파일 파싱)는 process_pool()의 프로세스 풀로 분산 (config.IMPORT_PROCESSES)
+- 상태/진행률: 작업 함수가 DB 테이블(예: import_jobs)에 기록하므로 어느 워커 프로세스에서든 조회 가능
+- 종료: shutdown()은 대기 중인 작업을 취소(취소 콜백 호출)하고 실행 중인 작업이 끝날 때까지 기다림
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .. import config
+
+_executor: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def submit(fn, *args, on_cancel: Optional[Callable[[], None]] = None) -> Future:
+    """fn(*args)를 작업 풀에서 실행하도록 예약 (on_cancel: 시작 전에 취소되면 호출)"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=config.IMPORT_WORKERS, thread_name_prefix="job")
+        future = _executor.submit(fn, *args)
+    if on_cancel is not None:
+        future.add_done_callback(lambda f: f.cancelled() and on_cancel())
+    return future
+
+
+def process_pool() -> ProcessPoolExecutor:
+    """작업 함수가 CPU 위주 단계를 나눠 맡길 프로세스 풀 (처음 사용할 때 생성)
+
+    writer 등 실행 중인 스레드의 잠금 상태를 물려받지 않도록 fork 대신 spawn으로 시작한다.
+    """
+    global _process_pool
+    with _lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=config.IMPORT_PROCESSES or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def discard_process_pool(pool: ProcessPoolExecutor):
+    """자식 프로세스가 비정상 종료되어 쓸 수 없게 된 풀 폐기 (다음 process_pool() 호출 시 새로 생성)"""
+    global _process_pool
+    with _lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown():
+    """대기 중인 작업 취소 후 실행 중인 작업 완료 대기 (앱 종료 시 lifespan에서 호출)"""
+    global _executor, _process_pool
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+    with _lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
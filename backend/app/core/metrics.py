@@ -0,0 +1,319 @@
+"""
+요청 시간 계측
+
+- TimingMiddleware: 요청별 단계 시간을 Server-Timing 헤더로 내보내고 라우트별로 집계
+- TimedRoute: 엔드포인트 시작/종료 시점을 기록하는 APIRoute (라우터의 route_class로 사용)
+- instrument_engine: SQLAlchemy 커서 실행 시간을 현재 요청의 db 단계에 합산
+- phase("file"): 파일 생성/파싱 등 임의 구간을 현재 요청의 단계로 기록
+- 처리 중인 요청 수와 마지막 요청 이후 유휴 시간 (백그라운드 작업이 실시간 요청에 양보할 때 사용)
+
+단계: routing(라우팅 + 요청 검증), db, app(엔드포인트 - db - file), file,
+serialize(엔드포인트 종료 ~ 응답 시작), total
+집계는 (method, route) 단위 고정 버킷 히스토그램이라 메모리 사용량이 라우트 수에 비례한다.
+"""
+import asyncio
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+PHASES = ("routing", "db", "app", "file", "serialize")
+
+# 지연 시간 히스토그램 버킷 상한 (초)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestTimings:
+    """한 요청의 단계별 시간 (초)"""
+
+    __slots__ = ("start", "route", "endpoint_start", "endpoint_end", "response_start", "phases")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.route: Optional[str] = None
+        self.endpoint_start: Optional[float] = None
+        self.endpoint_end: Optional[float] = None
+        self.response_start: Optional[float] = None
+        self.phases: Dict[str, float] = {"db": 0.0, "file": 0.0}
+
+    def add(self, phase_name: str, seconds: float):
+        self.phases[phase_name] = self.phases.get(phase_name, 0.0) + seconds
+
+    def breakdown(self, end: float) -> Dict[str, float]:
+        """routing/db/app/file/serialize/total 단계 시간"""
+        result = {name: 0.0 for name in PHASES}
+        result.update(self.phases)
+        if self.endpoint_start is not None and self.endpoint_end is not None:
+            result["routing"] = self.endpoint_start - self.start
+            result["app"] = max(
+                0.0, self.endpoint_end - self.endpoint_start - result["db"] - result["file"]
+            )
+            result["serialize"] = end - self.endpoint_end
+        result["total"] = end - self.start
+        return result
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+# False면 쿼리 실행 시간을 db 단계에 더하지 않음 (exclude_db_queries 참고)
+_db_queries_timed: ContextVar[bool] = ContextVar("db_queries_timed", default=True)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def exclude_db_queries():
+    """현재 컨텍스트의 쿼리 시간을 db 단계에 더하지 않음 (호출자가 대기 시간 전체를 db 단계로 계측하는 writer 작업용)"""
+    _db_queries_timed.set(False)
+
+
+@contextmanager
+def phase(name: str):
+    """현재 요청의 name 단계에 블록 실행 시간 합산 (요청 밖에서는 측정하지 않음)"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+class _RouteStats:
+    __slots__ = ("bucket_counts", "count", "duration_sum", "phase_sums", "status_counts")
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(DURATION_BUCKETS) + 1)
+        self.count = 0
+        self.duration_sum = 0.0
+        self.phase_sums = {name: 0.0 for name in PHASES}
+        self.status_counts: Dict[int, int] = {}
+
+
+class MetricsRegistry:
+    """라우트별 요청 수, 지연 히스토그램, 단계별 누적 시간"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], _RouteStats] = {}
+        self._in_flight = 0
+        self._last_activity = time.monotonic()
+
+    def request_started(self):
+        with self._lock:
+            self._in_flight += 1
+            self._last_activity = time.monotonic()
+
+    def request_finished(self):
+        with self._lock:
+            self._in_flight -= 1
+            self._last_activity = time.monotonic()
+
+    def idle_seconds(self) -> float:
+        """처리 중인 요청이 없으면 마지막 요청이 끝난 뒤 지난 시간(초), 있으면 0"""
+        with self._lock:
+            if self._in_flight:
+                return 0.0
+            return time.monotonic() - self._last_activity
+
+    def observe(self, method: str, route: str, status: int, breakdown: Dict[str, float]):
+        total = breakdown["total"]
+        bucket = len(DURATION_BUCKETS)
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if total <= bound:
+                bucket = i
+                break
+        with self._lock:
+            stats = self._routes.get((method, route))
+            if stats is None:
+                stats = self._routes[(method, route)] = _RouteStats()
+            stats.count += 1
+            stats.duration_sum += total
+            stats.bucket_counts[bucket] += 1
+            stats.status_counts[status] = stats.status_counts.get(status, 0) + 1
+            for name in PHASES:
+                stats.phase_sums[name] += breakdown.get(name, 0.0)
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        with self._lock:
+            snapshot = [
+                (key, stats.count, stats.duration_sum, list(stats.bucket_counts),
+                 dict(stats.phase_sums), dict(stats.status_counts))
+                for key, stats in sorted(self._routes.items())
+            ]
+            in_flight = self._in_flight
+
+        lines = [
+            "# HELP finance_http_requests_total Total HTTP requests by route and status.",
+            "# TYPE finance_http_requests_total counter",
+        ]
+        for (method, route), _, _, _, _, status_counts in snapshot:
+            for status, count in sorted(status_counts.items()):
+                lines.append(
+                    f'finance_http_requests_total{{method="{method}",route="{_escape(route)}",'
+                    f'status="{status}"}} {count}'
+                )
+
+        lines += [
+            "# HELP finance_http_request_duration_seconds HTTP request latency by route.",
+            "# TYPE finance_http_request_duration_seconds histogram",
+        ]
+        for (method, route), count, duration_sum, bucket_counts, _, _ in snapshot:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(DURATION_BUCKETS, bucket_counts):
+                cumulative += bucket_count
+                lines.append(f'finance_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'finance_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"finance_http_request_duration_seconds_sum{{{labels}}} {duration_sum:.6f}")
+            lines.append(f"finance_http_request_duration_seconds_count{{{labels}}} {count}")
+
+        lines += [
+            "# HELP finance_http_request_phase_seconds_total Time spent per request phase by route.",
+            "# TYPE finance_http_request_phase_seconds_total counter",
+        ]
+        for (method, route), _, _, _, phase_sums, _ in snapshot:
+            for name, seconds in phase_sums.items():
+                lines.append(
+                    f'finance_http_request_phase_seconds_total{{method="{method}",'
+                    f'route="{_escape(route)}",phase="{name}"}} {seconds:.6f}'
+                )
+
+        lines += [
+            "# HELP finance_http_requests_in_flight HTTP requests currently being processed.",
+            "# TYPE finance_http_requests_in_flight gauge",
+            f"finance_http_requests_in_flight {in_flight}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+registry = MetricsRegistry()
+
+
+def _server_timing(breakdown: Dict[str, float]) -> str:
+    return ", ".join(
+        f"{name};dur={seconds * 1000:.2f}"
+        for name, seconds in breakdown.items()
+        if seconds or name == "total"
+    )
+
+
+class TimingMiddleware:
+    """요청 단계 시간 측정, Server-Timing 헤더 추가, 라우트별 집계 (순수 ASGI 미들웨어)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = 500
+        registry.request_started()
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timings.response_start = time.perf_counter()
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", _server_timing(timings.breakdown(timings.response_start)))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            registry.request_finished()
+            _current.reset(token)
+            end = timings.response_start or time.perf_counter()
+            registry.observe(scope["method"], timings.route or UNMATCHED_ROUTE, status, timings.breakdown(end))
+
+
+def _timed_endpoint(endpoint):
+    """엔드포인트 실행 구간을 현재 요청에 기록하도록 감싸기 (시그니처 유지)"""
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            timings = _current.get()
+            if timings is not None:
+                timings.endpoint_start = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if timings is not None:
+                    timings.endpoint_end = time.perf_counter()
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        timings = _current.get()
+        if timings is not None:
+            timings.endpoint_start = time.perf_counter()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            if timings is not None:
+                timings.endpoint_end = time.perf_counter()
+    return sync_wrapper
+
+
+class TimedRoute(APIRoute):
+    """라우트 템플릿과 엔드포인트 실행 구간을 기록하는 APIRoute"""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route_path = self.path_format
+
+        async def timed_handler(request):
+            timings = _current.get()
+            if timings is not None:
+                timings.route = route_path
+            return await handler(request)
+
+        return timed_handler
+
+
+def instrument_engine(bind):
+    """SQLAlchemy 엔진의 커서 실행 시간을 현재 요청의 db 단계에 합산"""
+
+    @event.listens_for(bind, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(bind, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["metrics_query_start"].pop()
+        timings = _current.get()
+        if timings is not None and _db_queries_timed.get():
+            timings.add("db", time.perf_counter() - start)
+
+    @event.listens_for(bind, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("metrics_query_start"):
+            conn.info["metrics_query_start"].pop()
@@ -0,0 +1,216 @@
+"""
+SQL 쿼리 프로파일러
+
+SQLAlchemy 엔진 이벤트로 요청별 쿼리 수와 DB 시간을 집계한다.
+- 느린 쿼리(slow_query_ms 초과)는 EXPLAIN QUERY PLAN과 함께 로그/최근 목록에 기록
+- 한 요청에서 같은 문장이 n_plus_one_threshold회 이상 실행되면 N+1 의심으로 기록
+- settings.enabled로 실행 중 켜고 끌 수 있으며, 꺼져 있으면 이벤트 핸들러는 즉시 반환
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy import event
+
+from .. import config
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+RECENT_LIMIT = 100
+STATEMENT_PREVIEW = 300
+
+
+class ProfilerSettings(BaseModel):
+    enabled: bool = config.SQL_PROFILER_ENABLED
+    slow_query_ms: float = Field(config.SQL_SLOW_QUERY_MS, ge=0)
+    n_plus_one_threshold: int = Field(config.SQL_N_PLUS_ONE_THRESHOLD, ge=2)
+    explain_slow_queries: bool = True
+
+
+class ProfilerSettingsUpdate(BaseModel):
+    enabled: Optional[bool] = None
+    slow_query_ms: Optional[float] = Field(None, ge=0)
+    n_plus_one_threshold: Optional[int] = Field(None, ge=2)
+    explain_slow_queries: Optional[bool] = None
+
+
+class SlowQuery(BaseModel):
+    route: str
+    statement: str
+    duration_ms: float
+    plan: List[str]
+    timestamp: float
+
+
+class RepeatedQuery(BaseModel):
+    route: str
+    statement: str
+    count: int
+    timestamp: float
+
+
+class RouteQueryStats(BaseModel):
+    requests: int = 0
+    queries: int = 0
+    max_queries: int = 0
+    db_time_ms: float = 0.0
+
+
+class ProfilerReport(BaseModel):
+    settings: ProfilerSettings
+    routes: Dict[str, RouteQueryStats]
+    slow_queries: List[SlowQuery]
+    repeated_queries: List[RepeatedQuery]
+
+
+class QueryProfile:
+    """한 요청의 쿼리 집계"""
+
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Dict[str, int] = {}
+
+
+settings = ProfilerSettings()
+
+_current: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+_lock = threading.Lock()
+_routes: Dict[str, RouteQueryStats] = {}
+_slow_queries: deque = deque(maxlen=RECENT_LIMIT)
+_repeated_queries: deque = deque(maxlen=RECENT_LIMIT)
+
+
+def _current_route() -> str:
+    timings = metrics.current_timings()
+    return (timings.route if timings else None) or metrics.UNMATCHED_ROUTE
+
+
+def update_settings(update: ProfilerSettingsUpdate) -> ProfilerSettings:
+    """실행 중 설정 변경"""
+    global settings
+    settings = settings.model_copy(update=update.model_dump(exclude_unset=True, exclude_none=True))
+    return settings
+
+
+def report() -> ProfilerReport:
+    with _lock:
+        return ProfilerReport(
+            settings=settings,
+            routes={route: stats.model_copy() for route, stats in _routes.items()},
+            slow_queries=list(_slow_queries),
+            repeated_queries=list(_repeated_queries),
+        )
+
+
+def reset():
+    with _lock:
+        _routes.clear()
+        _slow_queries.clear()
+        _repeated_queries.clear()
+
+
+def _explain(cursor, statement: str, parameters) -> List[str]:
+    """같은 DBAPI 연결의 별도 커서로 EXPLAIN QUERY PLAN 실행 (엔진 이벤트 재진입 방지)"""
+    try:
+        rows = cursor.connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+        return [row[-1] for row in rows]
+    except Exception as e:  # 계획 수집 실패는 요청에 영향을 주지 않음
+        return [f"EXPLAIN failed: {e}"]
+
+
+def _record_slow_query(cursor, statement: str, parameters, executemany: bool, seconds: float):
+    plan = []
+    if settings.explain_slow_queries and not executemany:
+        plan = _explain(cursor, statement, parameters)
+    slow = SlowQuery(
+        route=_current_route(),
+        statement=statement[:STATEMENT_PREVIEW],
+        duration_ms=round(seconds * 1000, 3),
+        plan=plan,
+        timestamp=time.time(),
+    )
+    with _lock:
+        _slow_queries.append(slow)
+    logger.warning("Slow query (%.1f ms) on %s: %s | plan: %s",
+                   slow.duration_ms, slow.route, slow.statement, "; ".join(plan))
+
+
+def install(bind):
+    """엔진에 프로파일링 이벤트 핸들러 등록"""
+
+    @event.listens_for(bind, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if settings.enabled:
+            conn.info.setdefault("profiler_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(bind, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("profiler_query_start")
+        if not starts:
+            return
+        seconds = time.perf_counter() - starts.pop()
+
+        profile = _current.get()
+        if profile is not None:
+            profile.count += 1
+            profile.seconds += seconds
+            profile.statements[statement] = profile.statements.get(statement, 0) + 1
+        if seconds * 1000 >= settings.slow_query_ms:
+            _record_slow_query(cursor, statement, parameters, executemany, seconds)
+
+    @event.listens_for(bind, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("profiler_query_start"):
+            conn.info["profiler_query_start"].pop()
+
+
+def _finish(profile: QueryProfile):
+    route = _current_route()
+    repeated = [
+        RepeatedQuery(route=route, statement=statement[:STATEMENT_PREVIEW], count=count, timestamp=time.time())
+        for statement, count in profile.statements.items()
+        if count >= settings.n_plus_one_threshold
+    ]
+    with _lock:
+        stats = _routes.get(route)
+        if stats is None:
+            stats = _routes[route] = RouteQueryStats()
+        stats.requests += 1
+        stats.queries += profile.count
+        stats.max_queries = max(stats.max_queries, profile.count)
+        stats.db_time_ms += profile.seconds * 1000
+        _repeated_queries.extend(repeated)
+    for r in repeated:
+        logger.warning("Possible N+1 on %s: executed %d times: %s", r.route, r.count, r.statement)
+
+
+class QueryProfilerMiddleware:
+    """요청별 쿼리 프로파일 수집 (비활성 시 그대로 통과)
+
+    라우트 이름을 metrics.TimingMiddleware의 요청 컨텍스트에서 읽으므로 그 안쪽에 등록한다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current.set(profile)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _finish(profile)
+            _current.reset(token)
@@ -0,0 +1,196 @@
+"""
+거래 내역에서 정기 거래(구독, 급여, 월세 등) 감지
+
+- 사용처 정규화: 설명에서 숫자/기호/공백을 지우고 소문자로 (예: "넷플릭스 3월" -> "넷플릭스"),
+  거래 저장 시 설명별 사용처 이름을 transaction_merchants에 기록 (models.normalize_merchant)
+- 감지: (사용처, 수입/지출) 그룹별 거래 간격 중앙값으로 주기(주/월/연)를 정하고
+  간격의 중앙값 절대 편차(규칙성), 금액 변동계수(안정성), 반복 횟수(표본)로 신뢰도 계산
+  모든 계산은 pandas 그룹 연산으로 처리 (그룹별 파이썬 루프 없음)
+- 저장: recurring_candidates 테이블, 이미 정기 거래로 등록된 사용처는 제외
+- 증분: 임포트 후 refresh_merchants()가 새 거래가 속한 사용처의 이력만 다시 분석
+"""
+import json
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+from sqlalchemy import Integer, String, func, select, type_coerce
+from sqlalchemy.orm import Session
+
+from .. import crud, models
+from . import snapshot
+
+# pandas/numpy는 기동 시간을 줄이려고 사용하는 함수 안에서 로드
+if TYPE_CHECKING:
+    import pandas as pd
+
+# (주기, 기대 간격(일), 간격 허용 오차(일), 최소 반복 횟수, 신뢰도가 최대가 되는 간격 수)
+FREQUENCIES = [
+    (models.FrequencyType.WEEKLY, 7, 1.5, 4, 6),
+    (models.FrequencyType.MONTHLY, 30.44, 4, 3, 6),
+    (models.FrequencyType.YEARLY, 365.25, 20, 2, 3),
+]
+
+# 이 신뢰도 미만인 후보는 저장하지 않음
+MIN_CONFIDENCE = 0.5
+
+_TYPES_BY_CODE = {code: member for member, code in models.TRANSACTION_TYPE_CODES.items()}
+
+HISTORY_COLUMNS = ["date", "description", "amount", "type", "category"]
+CANDIDATE_COLUMNS = [
+    "merchant", "type", "description", "amount", "category", "frequency_type",
+    "day_of_month", "occurrences", "confidence", "first_date", "last_date",
+]
+
+
+def load_history(db: Session, descriptions: Optional[List[str]] = None) -> "pd.DataFrame":
+    """완료된 거래의 (날짜, 설명, 금액, 타입 코드, 카테고리) 프레임 (descriptions 지정 시 해당 설명만)
+
+    기본 데이터베이스의 전체 이력은 컬럼형 스냅샷을 쓸 수 있으면 스냅샷에서 읽는다 (행 단위 변환 없이 memory-map).
+    """
+    import pandas as pd
+
+    if descriptions is None and snapshot.is_available() and snapshot.covers(db.get_bind()):
+        table = snapshot.load_transactions()
+        table = table.filter(snapshot.pc.equal(table["status"], models.TransactionStatus.COMPLETED.value))
+        history = table.select(HISTORY_COLUMNS).to_pandas()
+        history["type"] = history["type"].map(
+            {member.value: code for member, code in models.TRANSACTION_TYPE_CODES.items()}
+        )
+        return history
+
+    Transaction = models.Transaction
+    # 행 단위 타입 변환을 건너뛰고 원시 값으로 읽은 뒤 열 단위로 변환
+    query = select(
+        type_coerce(Transaction.date, String),
+        Transaction.description,
+        type_coerce(Transaction.amount, Integer),
+        type_coerce(Transaction.type, Integer),
+        models.Category.name,
+    ).outerjoin(models.Category, models.Category.id == Transaction.category_id).where(
+        Transaction.status == models.TransactionStatus.COMPLETED
+    )
+    if descriptions is not None:
+        # 설명 목록이 길어도 바인드 변수 한 개로 전달
+        values = func.json_each(json.dumps(descriptions)).table_valued("value")
+        query = query.where(Transaction.description.in_(select(values.c.value)))
+
+    history = pd.DataFrame(db.execute(query).all(), columns=HISTORY_COLUMNS)
+    history["date"] = pd.to_datetime(history["date"], format="ISO8601")
+    return history
+
+
+def detect(history: "pd.DataFrame", reference_date: Optional[datetime] = None) -> "pd.DataFrame":
+    """거래 이력에서 정기 거래 후보 계산 (CANDIDATE_COLUMNS 프레임, 신뢰도 MIN_CONFIDENCE 이상)
+
+    reference_date(기본: 이력의 마지막 날짜) 기준으로 기대 간격의 두 배 넘게 거래가 없는 사용처는
+    해지된 것으로 보고 제외한다.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if history.empty:
+        return pd.DataFrame(columns=CANDIDATE_COLUMNS)
+
+    # 정규화는 고유 설명마다 한 번만
+    codes, uniques = pd.factorize(history["description"])
+    merchants = np.array([models.normalize_merchant(d) for d in uniques], dtype=object)
+    df = history.assign(merchant=merchants[codes])
+    df = df[df["merchant"] != ""].sort_values(["merchant", "type", "date"], kind="stable")
+    keys = ["merchant", "type"]
+
+    groups = df.groupby(keys, sort=False)
+    df["interval"] = groups["date"].diff().dt.total_seconds() / 86400
+    df["day"] = df["date"].dt.day
+    df["deviation"] = (df["interval"] - groups["interval"].transform("median")).abs()
+
+    groups = df.groupby(keys, sort=False)
+    stats = groups.agg(
+        occurrences=("amount", "size"),
+        amount=("amount", "median"),
+        amount_mean=("amount", "mean"),
+        amount_std=("amount", "std"),
+        interval=("interval", "median"),
+        deviation=("deviation", "median"),
+        day_of_month=("day", "median"),
+        description=("description", "last"),
+        category=("category", "last"),
+        first_date=("date", "min"),
+        last_date=("date", "max"),
+    )
+
+    reference_date = pd.Timestamp(reference_date or df["date"].max())
+    idle_days = (reference_date - stats["last_date"]).dt.total_seconds() / 86400
+    stability = (1 - (stats["amount_std"] / stats["amount_mean"]).fillna(0)).clip(0, 1)
+
+    stats["frequency_type"] = None
+    stats["confidence"] = 0.0
+    for frequency, expected, tolerance, min_occurrences, full_intervals in FREQUENCIES:
+        match = (
+            ((stats["interval"] - expected).abs() <= tolerance)
+            & (stats["occurrences"] >= min_occurrences)
+            & (idle_days <= 2 * expected + tolerance)
+        )
+        regularity = (1 - stats["deviation"] / tolerance).clip(0, 1)
+        support = ((stats["occurrences"] - 1) / full_intervals).clip(upper=1)
+        stats.loc[match, "frequency_type"] = frequency
+        stats.loc[match, "confidence"] = (regularity * stability * support)[match]
+
+    stats = stats[stats["confidence"] >= MIN_CONFIDENCE].reset_index()
+    # 주간 주기는 날짜 대신 요일이 의미 있으므로 day_of_month 비움
+    stats["day_of_month"] = stats["day_of_month"].round().astype("Int64").where(
+        stats["frequency_type"] != models.FrequencyType.WEEKLY
+    )
+    return stats[CANDIDATE_COLUMNS]
+
+
+def _candidate_rows(db: Session, candidates: "pd.DataFrame") -> List[dict]:
+    import pandas as pd
+
+    # 이미 정기 거래로 등록된 사용처는 다시 제안하지 않음
+    registered = {
+        (models.normalize_merchant(description), type)
+        for description, type in db.query(
+            models.RegularTransaction.description, models.RegularTransaction.type
+        )
+    }
+    rows = []
+    for record in candidates.to_dict("records"):
+        type = _TYPES_BY_CODE[record["type"]]
+        if (record["merchant"], type) in registered:
+            continue
+        rows.append({
+            **record,
+            "type": type,
+            "frequency_type": models.FrequencyType(record["frequency_type"]),
+            "amount": float(record["amount"]),
+            "category": record["category"] if isinstance(record["category"], str) else None,
+            "day_of_month": None if pd.isna(record["day_of_month"]) else int(record["day_of_month"]),
+            "occurrences": int(record["occurrences"]),
+            "confidence": round(float(record["confidence"]), 4),
+            "first_date": record["first_date"].to_pydatetime(),
+            "last_date": record["last_date"].to_pydatetime(),
+        })
+    return rows
+
+
+def detect_all(db: Session) -> int:
+    """전체 거래 이력으로 후보 목록을 다시 만듦, 후보 수 반환"""
+    candidates = detect(load_history(db))
+    return crud.replace_recurring_candidates(db, None, _candidate_rows(db, candidates))
+
+
+def refresh_merchants(db: Session, descriptions: Iterable[str]) -> int:
+    """descriptions(새로 저장한 거래의 설명)가 속한 사용처만 다시 분석, 해당 사용처의 후보 수 반환"""
+    merchants = {models.normalize_merchant(d) for d in descriptions} - {""}
+    if not merchants:
+        return 0
+
+    # 같은 사용처의 다른 표기(예: 월 표시가 다른 설명)까지 이력에 포함 (사용처 인덱스로 조회)
+    values = func.json_each(json.dumps(sorted(merchants))).table_valued("value")
+    related = db.scalars(
+        select(models.TransactionMerchant.description)
+        .where(models.TransactionMerchant.merchant.in_(select(values.c.value)))
+    ).all()
+    reference_date = db.query(func.max(models.Transaction.date)).scalar()
+    candidates = detect(load_history(db, related), reference_date)
+    return crud.replace_recurring_candidates(db, sorted(merchants), _candidate_rows(db, candidates))
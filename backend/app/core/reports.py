@@ -0,0 +1,479 @@
+"""
+다기간(월/분기/연간) Excel/CSV 리포트 생성 및 디스크 캐시
+
+- 데이터 버전: transactions 트리거가 거래가 바뀐 연-월의 버전(transaction_month_versions)을 올림
+- 캐시 키: 리포트 이름(기간) + 포함된 월들의 버전 -> 데이터가 그대로면 저장된 파일을 바로 전송
+- 생성: 월별 통계를 스레드 풀에서 병렬로 집계한 뒤 write-only 워크북에 요약 시트와 월별 시트 기록
+- 용량: config.REPORT_CACHE_MAX_MB를 넘으면 가장 오래 사용되지 않은 파일부터 삭제 (LRU, 사용 시 mtime 갱신)
+- 압축본: CSV 리포트는 생성할 때 인코딩별 압축본을 함께 저장하고 (core.compression) 원본과 같이 삭제
+  (XLSX는 이미 압축된 zip 컨테이너라 압축본을 만들지 않음)
+- 통계 캐시: 대시보드와 리포트 생성이 쓰는 월별/카테고리별 통계 결과도 같은 데이터 버전을 키로 프로세스 메모리에 보관
+  (버전은 DB에서 읽으므로 다른 워커 프로세스의 쓰기도 반영됨)
+- 목표 분석 캐시: 자산 목표 분석 결과는 목표(id, 수정 시각, 금액/날짜) + 정기 거래 버전(table_versions) + 오늘 날짜를 키로 보관
+"""
+import csv
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .. import config, crud, models, schemas
+from . import compression, tenants
+
+REPORT_CACHE_DIR = config.REPORT_CACHE_DIR
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+
+# 리포트 형식 -> 응답 형식
+REPORT_FORMATS = {"xlsx": XLSX_MEDIA_TYPE, "csv": CSV_MEDIA_TYPE}
+
+# 압축본을 함께 저장하는 형식 (텍스트)
+PRECOMPRESSED_FORMATS = ("csv",)
+
+# 리포트 형식이 바뀌면 올림 (이전 형식의 캐시 파일은 키가 달라져 다시 생성됨)
+REPORT_FORMAT_VERSION = 1
+
+# 통계 결과 캐시 항목 수 (데이터베이스/통계/기간별, 초과 시 가장 오래 사용되지 않은 것부터 삭제)
+STATS_CACHE_SIZE = 256
+
+T = TypeVar("T")
+
+DATA_VERSION_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS transaction_month_versions (
+        month TEXT PRIMARY KEY,
+        version INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS month_version_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transaction_month_versions VALUES (substr(new.date, 1, 7), 1)
+        ON CONFLICT(month) DO UPDATE SET version = version + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS month_version_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transaction_month_versions VALUES (substr(old.date, 1, 7), 1)
+        ON CONFLICT(month) DO UPDATE SET version = version + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS month_version_au AFTER UPDATE ON transactions BEGIN
+        INSERT INTO transaction_month_versions VALUES (substr(old.date, 1, 7), 1)
+        ON CONFLICT(month) DO UPDATE SET version = version + 1;
+        INSERT INTO transaction_month_versions VALUES (substr(new.date, 1, 7), 1)
+        ON CONFLICT(month) DO UPDATE SET version = version + 1;
+    END
+    """,
+    # 거래 외 테이블의 버전 (정기 거래가 바뀌면 목표 분석 캐시가 무효화됨)
+    """
+    CREATE TABLE IF NOT EXISTS table_versions (
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL
+    )
+    """,
+    *[
+        f"""
+        CREATE TRIGGER IF NOT EXISTS regular_version_{suffix} AFTER {event} ON regular_transactions BEGIN
+            INSERT INTO table_versions VALUES ('regular_transactions', 1)
+            ON CONFLICT(name) DO UPDATE SET version = version + 1;
+        END
+        """
+        for suffix, event in (("ai", "INSERT"), ("ad", "DELETE"), ("au", "UPDATE"))
+    ],
+]
+
+# 같은 리포트를 동시에 요청하면 한 번만 생성
+_build_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+_build_locks_guard = threading.Lock()
+_evict_lock = threading.Lock()
+
+# (데이터베이스 파일 경로, 통계 키) -> (데이터 버전, 결과)
+_stats_cache: "OrderedDict[tuple, Tuple[str, object]]" = OrderedDict()
+_stats_cache_lock = threading.Lock()
+
+
+class MonthReport(NamedTuple):
+    """한 달치 리포트 데이터"""
+    year: int
+    month: int
+    stats: schemas.MonthlyStats
+    income: List[schemas.CategoryStats]
+    expense: List[schemas.CategoryStats]
+
+
+def create_version_tracking(bind):
+    """연-월별 데이터 버전 테이블 및 트리거 생성"""
+    with bind.begin() as conn:
+        for ddl in DATA_VERSION_DDL:
+            conn.execute(text(ddl))
+
+
+def period_months(year: int, quarter: Optional[int] = None) -> List[Tuple[int, int]]:
+    """분기(1~4) 또는 연간(quarter 없음)에 포함된 (연, 월) 목록"""
+    if quarter:
+        return [(year, month) for month in range(quarter * 3 - 2, quarter * 3 + 1)]
+    return [(year, month) for month in range(1, 13)]
+
+
+def month_versions(db: Session, months: Optional[List[str]] = None) -> Dict[str, int]:
+    """'YYYY-MM' -> 데이터 버전 (months 미지정 시 거래가 한 번이라도 바뀐 모든 달)"""
+    if months is None:
+        return dict(db.execute(text("SELECT month, version FROM transaction_month_versions")).all())
+    return dict(db.execute(
+        text(
+            "SELECT month, version FROM transaction_month_versions "
+            "WHERE month IN (SELECT value FROM json_each(:months))"
+        ),
+        {"months": json.dumps(months)}
+    ).all())
+
+
+def data_version(db: Session, months: List[Tuple[int, int]]) -> str:
+    """월 목록의 데이터 버전 (포함된 달 중 하나라도 거래가 바뀌면 달라짐)"""
+    keys = [f"{year}-{month:02d}" for year, month in months]
+    versions = month_versions(db, keys)
+    return ",".join(f"{key}:{versions.get(key, 0)}" for key in keys)
+
+
+def regular_version(db: Session) -> int:
+    """정기 거래 데이터 버전 (추가/수정/삭제마다 올라감)"""
+    return db.execute(
+        text("SELECT version FROM table_versions WHERE name = 'regular_transactions'")
+    ).scalar() or 0
+
+
+def cached_stats(db: Session, key: tuple, months: List[Tuple[int, int]], compute: Callable[[], T]) -> T:
+    """key 통계 결과 (months의 데이터 버전이 그대로면 저장된 결과, 아니면 compute()로 다시 계산)"""
+    # 계산 전에 버전을 읽으므로 계산 중에 바뀐 데이터는 다음 조회에서 다시 계산됨
+    return cached_result(db, key, data_version(db, months), compute)
+
+
+def cached_result(db: Session, key: tuple, version: str, compute: Callable[[], T]) -> T:
+    """key 결과 (version이 저장할 때와 같으면 저장된 결과, 아니면 compute()로 다시 계산)"""
+    key = (_database_key(db.get_bind()), *key)
+    with _stats_cache_lock:
+        cached = _stats_cache.get(key)
+        if cached is not None and cached[0] == version:
+            _stats_cache.move_to_end(key)
+            return cached[1]
+
+    result = compute()
+    with _stats_cache_lock:
+        _stats_cache[key] = (version, result)
+        _stats_cache.move_to_end(key)
+        while len(_stats_cache) > STATS_CACHE_SIZE:
+            _stats_cache.popitem(last=False)
+    return result
+
+
+def _database_key(bind) -> str:
+    """통계 캐시에서 데이터베이스를 구분하는 키 (파일 경로, 메모리 DB는 엔진마다 따로)"""
+    path = bind.url.database
+    if not path or path == ":memory:":
+        return f"memory:{id(bind)}"
+    return os.path.abspath(path)
+
+
+def monthly_stats(db: Session, year: int, month: int) -> schemas.MonthlyStats:
+    """월별 통계 (데이터가 바뀌지 않았으면 캐시된 결과)"""
+    return cached_stats(
+        db, ("monthly", year, month), [(year, month)], lambda: crud.get_monthly_stats(db, year, month)
+    )
+
+
+def category_stats(
+    db: Session,
+    year: int,
+    month: int,
+    type: models.TransactionType
+) -> List[schemas.CategoryStats]:
+    """카테고리별 통계 (데이터가 바뀌지 않았으면 캐시된 결과)"""
+    return cached_stats(
+        db, ("category", year, month, type.value), [(year, month)],
+        lambda: crud.get_category_stats(db, year, month, type)
+    )
+
+
+def goal_analysis(db: Session, goal: models.AssetGoal) -> schemas.SimulationResult:
+    """자산 목표 분석 (목표, 정기 거래, 오늘 날짜가 그대로면 캐시된 결과)"""
+    # 수정 시각은 초 단위라 같은 초 안의 수정도 구분하도록 분석에 쓰는 값을 함께 키에 넣음
+    version = "|".join(str(value) for value in (
+        goal.updated_at, goal.target_amount, goal.target_date, goal.current_amount,
+        regular_version(db), date.today(),
+    ))
+    return cached_result(db, ("goal", goal.id), version, lambda: crud.analyze_asset_goal(db, goal))
+
+
+def cached_report(
+    db: Session,
+    name: str,
+    months: List[Tuple[int, int]],
+    build: Callable[[str], None],
+    format: str = "xlsx"
+) -> str:
+    """name 리포트(format 형식)의 캐시 파일 경로 반환 (없거나 데이터가 바뀌었으면 build(path)로 생성)"""
+    # 테넌트 DB의 리포트는 테넌트 키를 붙여 구분
+    tenant = tenants.tenant_of(db.get_bind())
+    if tenant:
+        name = f"{tenant}@{name}"
+    version = f"{REPORT_FORMAT_VERSION}|{data_version(db, months)}"
+    digest = hashlib.sha1(version.encode()).hexdigest()[:16]
+    path = os.path.join(REPORT_CACHE_DIR, f"{name}_{digest}.{format}")
+
+    with _build_locks_guard:
+        lock = _build_locks[f"{name}.{format}"]
+    with lock:
+        if _touch(path):
+            return path
+
+        os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+        partial = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            build(partial)
+            os.replace(partial, path)
+            if format in PRECOMPRESSED_FORMATS:
+                compression.precompress(path)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+        # 같은 기간의 이전 버전은 더 이상 쓰이지 않으므로 바로 삭제
+        for entry in os.scandir(REPORT_CACHE_DIR):
+            if entry.name.startswith(f"{name}_") and entry.name.endswith(f".{format}") and entry.path != path:
+                _remove(entry.path)
+    evict(keep=path)
+    return path
+
+
+def period_name(year: int, quarter: Optional[int] = None) -> str:
+    """분기/연간 리포트 이름 (quarter 없으면 연간)"""
+    return f"quarterly_{year}_q{quarter}" if quarter else f"annual_{year}"
+
+
+def monthly_report(db: Session, year: int, month: int, format: str = "xlsx") -> str:
+    """월별 리포트 캐시 파일 경로 (없거나 데이터가 바뀌었으면 생성)"""
+    bind = db.get_bind()
+    build = build_monthly_csv if format == "csv" else build_monthly_workbook
+    return cached_report(
+        db, f"monthly_{year}_{month:02d}", [(year, month)],
+        lambda target: build(bind, year, month, target), format
+    )
+
+
+def period_report(db: Session, year: int, quarter: Optional[int] = None, format: str = "xlsx") -> str:
+    """분기/연간 리포트 캐시 파일 경로 (없거나 데이터가 바뀌었으면 생성)"""
+    months = period_months(year, quarter)
+    bind = db.get_bind()
+    build = build_period_csv if format == "csv" else build_period_workbook
+    return cached_report(
+        db, period_name(year, quarter), months, lambda target: build(bind, months, target), format
+    )
+
+
+def _is_report(name: str) -> bool:
+    return name.endswith(tuple(f".{format}" for format in REPORT_FORMATS))
+
+
+def evict(keep: Optional[str] = None, max_bytes: Optional[int] = None):
+    """캐시 크기가 한도를 넘으면 가장 오래 사용되지 않은 파일부터 삭제 (keep은 제외)"""
+    max_bytes = config.REPORT_CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+    with _evict_lock:
+        try:
+            entries = [
+                (entry.stat().st_mtime, entry.stat().st_size + _variants_size(entry.path), entry.path)
+                for entry in os.scandir(REPORT_CACHE_DIR)
+                if _is_report(entry.name)
+            ]
+        except FileNotFoundError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            if path != keep and _remove(path):
+                total -= size
+
+
+def clear_cache(tenant: Optional[str] = None):
+    """한 데이터베이스(tenant가 None이면 기본 데이터베이스)의 리포트 캐시 삭제 (복원 후 데이터 버전이 되돌아가므로)"""
+    try:
+        entries = list(os.scandir(REPORT_CACHE_DIR))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if not _is_report(entry.name):
+            continue
+        owner = entry.name.split("@", 1)[0] if "@" in entry.name else None
+        if owner == tenant:
+            _remove(entry.path)
+
+
+def _touch(path: str) -> bool:
+    """캐시 적중 시 mtime을 갱신해 LRU 순서를 맨 뒤로 (파일이 없으면 False)"""
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _variants_size(path: str) -> int:
+    size = 0
+    for variant in compression.variant_paths(path):
+        try:
+            size += os.path.getsize(variant)
+        except FileNotFoundError:
+            pass
+    return size
+
+
+def _remove(path: str) -> bool:
+    """캐시 파일과 그 압축본 삭제 (원본이 없으면 False)"""
+    for variant in compression.variant_paths(path):
+        try:
+            os.remove(variant)
+        except FileNotFoundError:
+            pass
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def collect_month(bind, year: int, month: int) -> MonthReport:
+    """한 달치 통계 집계 (워커 스레드마다 별도 세션 사용, 데이터가 그대로인 달은 통계 캐시 사용)"""
+    with Session(bind=bind) as db:
+        return MonthReport(
+            year=year,
+            month=month,
+            stats=monthly_stats(db, year, month),
+            income=category_stats(db, year, month, models.TransactionType.INCOME),
+            expense=category_stats(db, year, month, models.TransactionType.EXPENSE),
+        )
+
+
+def collect_months(bind, months: List[Tuple[int, int]]) -> List[MonthReport]:
+    """월별 통계를 config.REPORT_WORKERS개 스레드에서 병렬 집계 (월 순서 유지)"""
+    workers = max(1, min(config.REPORT_WORKERS, len(months)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report") as pool:
+        return list(pool.map(lambda ym: collect_month(bind, *ym), months))
+
+
+def _append_category_rows(sheet, stats: List[schemas.CategoryStats]):
+    for s in stats:
+        sheet.append([s.category, s.total_amount, round(s.percentage, 2)])
+
+
+def build_monthly_workbook(bind, year: int, month: int, path: str):
+    """월별 리포트 (요약 / 수입 카테고리 / 지출 카테고리 시트)"""
+    from openpyxl import Workbook
+
+    report = collect_month(bind, year, month)
+    stats = report.stats
+    workbook = Workbook(write_only=True)
+
+    sheet = workbook.create_sheet("요약")
+    sheet.append(["항목", "금액"])
+    sheet.append(["총 수입", stats.total_income])
+    sheet.append(["총 지출", stats.total_expense])
+    sheet.append(["순 금액", stats.net_amount])
+    sheet.append(["거래 건수", stats.transaction_count])
+
+    for title, category_stats in (("수입 카테고리", report.income), ("지출 카테고리", report.expense)):
+        if category_stats:
+            sheet = workbook.create_sheet(title)
+            sheet.append(["카테고리", "금액", "비율(%)"])
+            _append_category_rows(sheet, category_stats)
+
+    workbook.save(path)
+
+
+def build_period_workbook(bind, months: List[Tuple[int, int]], path: str):
+    """분기/연간 리포트 (요약 / 카테고리별 지출 / 월별 시트)"""
+    from openpyxl import Workbook
+
+    reports = collect_months(bind, months)
+    workbook = Workbook(write_only=True)
+
+    sheet = workbook.create_sheet("요약")
+    sheet.append(["월", "총 수입", "총 지출", "순 금액", "거래 건수"])
+    for r in reports:
+        sheet.append([f"{r.year}-{r.month:02d}", r.stats.total_income, r.stats.total_expense,
+                      r.stats.net_amount, r.stats.transaction_count])
+    sheet.append([
+        "합계",
+        sum(r.stats.total_income for r in reports),
+        sum(r.stats.total_expense for r in reports),
+        sum(r.stats.net_amount for r in reports),
+        sum(r.stats.transaction_count for r in reports),
+    ])
+
+    # 카테고리 x 월 지출 표
+    expense_by_month = [{s.category: s.total_amount for s in r.expense} for r in reports]
+    categories = sorted({category for amounts in expense_by_month for category in amounts})
+    sheet = workbook.create_sheet("카테고리별 지출")
+    sheet.append(["카테고리", *(f"{r.year}-{r.month:02d}" for r in reports), "합계"])
+    for category in categories:
+        row = [amounts.get(category, 0) for amounts in expense_by_month]
+        sheet.append([category, *row, sum(row)])
+
+    for r in reports:
+        sheet = workbook.create_sheet(f"{r.year}-{r.month:02d}")
+        sheet.append(["항목", "금액"])
+        sheet.append(["총 수입", r.stats.total_income])
+        sheet.append(["총 지출", r.stats.total_expense])
+        sheet.append(["순 금액", r.stats.net_amount])
+        sheet.append(["거래 건수", r.stats.transaction_count])
+        for title, category_stats in (("수입 카테고리", r.income), ("지출 카테고리", r.expense)):
+            if category_stats:
+                sheet.append([])
+                sheet.append([title, "금액", "비율(%)"])
+                _append_category_rows(sheet, category_stats)
+
+    workbook.save(path)
+
+
+def _csv_rows(report: MonthReport) -> List[list]:
+    """한 달치 (구분, 항목, 금액, 비율) 행"""
+    stats = report.stats
+    rows = [
+        ["요약", "총 수입", stats.total_income, ""],
+        ["요약", "총 지출", stats.total_expense, ""],
+        ["요약", "순 금액", stats.net_amount, ""],
+        ["요약", "거래 건수", stats.transaction_count, ""],
+    ]
+    for kind, category_stats in (("수입", report.income), ("지출", report.expense)):
+        rows += [[kind, s.category, s.total_amount, round(s.percentage, 2)] for s in category_stats]
+    return rows
+
+
+def _write_csv(path: str, header: List[str], rows: List[list]):
+    # Excel에서 한글이 깨지지 않도록 BOM을 붙임
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def build_monthly_csv(bind, year: int, month: int, path: str):
+    """월별 리포트 CSV (요약과 수입/지출 카테고리를 한 표로)"""
+    _write_csv(path, ["구분", "항목", "금액", "비율(%)"], _csv_rows(collect_month(bind, year, month)))
+
+
+def build_period_csv(bind, months: List[Tuple[int, int]], path: str):
+    """분기/연간 리포트 CSV (월별 요약과 수입/지출 카테고리를 월 열과 함께 한 표로)"""
+    rows = [
+        [f"{r.year}-{r.month:02d}", *row]
+        for r in collect_months(bind, months) for row in _csv_rows(r)
+    ]
+    _write_csv(path, ["월", "구분", "항목", "금액", "비율(%)"], rows)
@@ -0,0 +1,292 @@
+"""
+거래 내역 컬럼형 스냅샷 (Arrow IPC, 연-월 파티션)
+
+- 파티션: config.SNAPSHOT_DIR/YYYY-MM.arrow (기본 backend/snapshots/transactions)
+- 변경 추적: transactions 테이블 트리거가 변경된 연-월을 snapshot_dirty_partitions에 기록
+- 갱신: refresh_snapshot()은 마지막 스냅샷 이후 변경된 파티션만 다시 기록
+- 조회: load_transactions()는 파티션 파일을 memory-map으로 열어 복사 없이 읽음
+- 여러 워커 프로세스: SNAPSHOT_DIR의 잠금 파일로 갱신(매니페스트 읽기~쓰기)은 배타적으로,
+  조회(매니페스트 읽기~파티션 열기)는 공유로 잠가 다른 프로세스의 갱신과 섞이지 않음
+  (열어 둔 memory-map은 이후 파일이 교체/삭제되어도 그대로 읽힘)
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select, text
+
+from .. import config, models
+from ..database import engine
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+# pyarrow는 첫 사용 시 로드 (_load_pyarrow), 미설치 시 스냅샷 비활성화 (ORM 경로 사용)
+pa = None
+pc = None
+_pyarrow_missing = False
+
+SNAPSHOT_DIR = config.SNAPSHOT_DIR
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = "snapshot.lock"
+
+# 파티션 스키마가 바뀌면 올림 (버전이 다른 매니페스트는 무시하고 전체 재생성)
+SNAPSHOT_FORMAT_VERSION = 2
+
+SNAPSHOT_TRACKING_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS snapshot_dirty_partitions (
+        partition TEXT PRIMARY KEY
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS snapshot_dirty_ai AFTER INSERT ON transactions BEGIN
+        INSERT OR IGNORE INTO snapshot_dirty_partitions VALUES (substr(new.date, 1, 7));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS snapshot_dirty_ad AFTER DELETE ON transactions BEGIN
+        INSERT OR IGNORE INTO snapshot_dirty_partitions VALUES (substr(old.date, 1, 7));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS snapshot_dirty_au AFTER UPDATE ON transactions BEGIN
+        INSERT OR IGNORE INTO snapshot_dirty_partitions VALUES (substr(old.date, 1, 7));
+        INSERT OR IGNORE INTO snapshot_dirty_partitions VALUES (substr(new.date, 1, 7));
+    END
+    """,
+]
+
+_refresh_lock = threading.Lock()
+
+
+@contextmanager
+def _process_lock(shared: bool = False):
+    """워커 프로세스 간 스냅샷 잠금 (갱신은 배타, 조회는 공유, 파일을 닫으면 해제)"""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    with open(os.path.join(SNAPSHOT_DIR, LOCK_FILE), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+
+
+def _load_pyarrow() -> bool:
+    global pa, pc, _pyarrow_missing
+    if pa is None and not _pyarrow_missing:
+        try:
+            import pyarrow
+            import pyarrow.compute
+        except ImportError:
+            _pyarrow_missing = True
+            return False
+        pa, pc = pyarrow, pyarrow.compute
+    return pa is not None
+
+
+def is_available() -> bool:
+    """pyarrow 사용 가능 여부"""
+    return _load_pyarrow()
+
+
+def covers(bind) -> bool:
+    """스냅샷이 bind 데이터베이스를 반영하는지 여부 (기본 데이터베이스만, 테넌트 DB는 제외)"""
+    return bind is engine
+
+
+def create_snapshot_tracking(bind=engine):
+    """변경 파티션 추적 테이블 및 트리거 생성"""
+    with bind.begin() as conn:
+        for ddl in SNAPSHOT_TRACKING_DDL:
+            conn.execute(text(ddl))
+
+
+def _schema():
+    return pa.schema([
+        ("id", pa.int64()),
+        ("date", pa.timestamp("us")),
+        ("description", pa.string()),
+        ("amount", pa.int64()),
+        ("category", pa.string()),
+        ("type", pa.string()),
+        ("note", pa.string()),
+        ("status", pa.string()),
+    ])
+
+
+def _partition_path(partition: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"{partition}.arrow")
+
+
+def _partition_range(partition: str):
+    """'YYYY-MM' -> [해당 월 1일, 다음 달 1일)"""
+    year, month = map(int, partition.split("-"))
+    start = datetime(year, month, 1)
+    end = datetime(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+
+def _read_manifest() -> Optional[dict]:
+    path = os.path.join(SNAPSHOT_DIR, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != SNAPSHOT_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def _write_manifest(manifest: dict):
+    path = os.path.join(SNAPSHOT_DIR, MANIFEST_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _write_partition(conn, partition: str) -> int:
+    """한 달치 거래를 Arrow IPC 파일로 기록 (임시 파일 작성 후 교체)"""
+    t = models.Transaction.__table__
+    c = models.Category.__table__
+    start, end = _partition_range(partition)
+    rows = conn.execute(
+        select(t.c.id, t.c.date, t.c.description, t.c.amount,
+               c.c.name, t.c.type, t.c.note, t.c.status)
+        .select_from(t.outerjoin(c, t.c.category_id == c.c.id))
+        .where(t.c.date >= start, t.c.date < end)
+        .order_by(t.c.date, t.c.id)
+    ).all()
+
+    path = _partition_path(partition)
+    if not rows:
+        if os.path.exists(path):
+            os.remove(path)
+        return 0
+
+    columns = list(zip(*rows))
+    arrays = [
+        pa.array(columns[0], pa.int64()),
+        pa.array(columns[1], pa.timestamp("us")),
+        pa.array(columns[2], pa.string()),
+        pa.array(columns[3], pa.int64()),
+        pa.array(columns[4], pa.string()),
+        pa.array([v.value if v is not None else None for v in columns[5]], pa.string()),
+        pa.array(columns[6], pa.string()),
+        pa.array([v.value if v is not None else None for v in columns[7]], pa.string()),
+    ]
+    table = pa.Table.from_arrays(arrays, schema=_schema())
+
+    tmp_path = path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+def refresh_snapshot(bind=engine) -> List[str]:
+    """마지막 스냅샷 이후 변경된 파티션만 다시 기록하고 갱신된 파티션 목록 반환"""
+    if not is_available():
+        raise RuntimeError("pyarrow is required for columnar snapshots")
+
+    # 다른 프로세스가 같은 변경 파티션을 비우고 이전 매니페스트로 덮어쓰지 않도록 매니페스트 쓰기까지 잠금 유지
+    with _refresh_lock, _process_lock():
+        manifest = _read_manifest()
+
+        # 변경 파티션을 가져오면서 비움 (이후 발생한 쓰기는 다시 dirty로 기록됨)
+        with bind.begin() as conn:
+            if manifest is None:
+                manifest = {"version": SNAPSHOT_FORMAT_VERSION, "partitions": {}}
+                # 먼저 비우고 목록을 읽어야 그 사이에 생긴 파티션도 목록에 포함됨
+                conn.execute(text("DELETE FROM snapshot_dirty_partitions"))
+                partitions = [
+                    r[0] for r in conn.execute(
+                        text("SELECT DISTINCT substr(date, 1, 7) FROM transactions")
+                    )
+                ]
+            else:
+                # 조회와 삭제를 한 문장으로 (pysqlite는 SELECT 앞에서 트랜잭션을 열지 않아 그 사이 기록된 파티션을 잃음)
+                partitions = [
+                    r[0] for r in conn.execute(text("DELETE FROM snapshot_dirty_partitions RETURNING partition"))
+                ]
+
+        try:
+            with bind.connect() as conn:
+                for partition in sorted(p for p in partitions if p):
+                    row_count = _write_partition(conn, partition)
+                    if row_count:
+                        manifest["partitions"][partition] = {
+                            "rows": row_count,
+                            "refreshed_at": datetime.now().isoformat(timespec="seconds"),
+                        }
+                    else:
+                        manifest["partitions"].pop(partition, None)
+        except Exception:
+            # 실패한 파티션은 다음 갱신 때 다시 기록되도록 복원
+            with bind.begin() as conn:
+                for partition in partitions:
+                    conn.execute(
+                        text("INSERT OR IGNORE INTO snapshot_dirty_partitions VALUES (:p)"),
+                        {"p": partition}
+                    )
+            raise
+
+        _write_manifest(manifest)
+        return sorted(p for p in partitions if p)
+
+
+def invalidate():
+    """스냅샷 매니페스트 삭제 (데이터베이스를 복원한 뒤 다음 갱신 때 전체 재생성)"""
+    with _refresh_lock, _process_lock():
+        try:
+            os.remove(os.path.join(SNAPSHOT_DIR, MANIFEST_FILE))
+        except FileNotFoundError:
+            pass
+
+
+def load_transactions(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    refresh: bool = True
+):
+    """기간에 해당하는 파티션을 memory-map으로 읽어 하나의 Arrow 테이블로 반환"""
+    if not is_available():
+        raise RuntimeError("pyarrow is required for columnar snapshots")
+    if refresh:
+        refresh_snapshot()
+
+    start_key = start_date.strftime("%Y-%m") if start_date else None
+    end_key = end_date.strftime("%Y-%m") if end_date else None
+
+    tables = []
+    # 매니페스트에 있는 파티션을 다른 프로세스가 지우거나 교체하기 전에 모두 열어 둠
+    with _process_lock(shared=True):
+        manifest = _read_manifest() or {"partitions": {}}
+        for partition in sorted(manifest["partitions"]):
+            if start_key and partition < start_key:
+                continue
+            if end_key and partition > end_key:
+                continue
+            source = pa.memory_map(_partition_path(partition), "r")
+            tables.append(pa.ipc.open_file(source).read_all())
+
+    if not tables:
+        return _schema().empty_table()
+
+    table = pa.concat_tables(tables)
+    if start_date:
+        table = table.filter(pc.greater_equal(table["date"], pa.scalar(start_date, pa.timestamp("us"))))
+    if end_date:
+        table = table.filter(pc.less_equal(table["date"], pa.scalar(end_date, pa.timestamp("us"))))
+    return table
+
+
+if __name__ == "__main__":
+    create_snapshot_tracking()
+    refreshed = refresh_snapshot()
+    print(f"Refreshed {len(refreshed)} partitions: {', '.join(refreshed)}")
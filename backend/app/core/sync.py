@@ -0,0 +1,64 @@
+"""
+증분 동기화 (변경 기록 기반)
+
+- 기록: crud의 쓰기 작업이 거래/재무 계획/정기 거래를 생성·수정·삭제할 때 같은 트랜잭션에서
+  change_log에 (테이블, id, 삭제 여부)를 씀. 행마다 마지막 변경 하나만 새 seq로 남으므로
+  기록 크기는 행 수를 넘지 않고, 삭제된 행은 삭제 표시(tombstone)로 남음
+- 조회: get_changes(since)는 seq > since인 기록을 seq 순으로 limit개 읽어 현재 행(삭제된 행은 id만) 반환
+  클라이언트는 응답의 seq를 다음 since로 사용 (비용은 데이터 전체가 아니라 바뀐 행 수에 비례)
+- 처음 만들 때 기존 행을 모두 기록하므로 since=0이면 전체 동기화
+- 보관 연도로 옮겨진 거래는 삭제가 아니므로 기록하지 않음 (보관 파일에서 계속 조회됨)
+"""
+from collections import defaultdict
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .. import crud, models, schemas
+
+
+def create_change_log(bind):
+    """변경 기록이 비어 있으면 기존 행을 모두 기록 (테이블은 create_all이 생성)"""
+    with bind.begin() as conn:
+        if conn.execute(text("SELECT 1 FROM change_log LIMIT 1")).first():
+            return
+        # 여러 워커가 동시에 시작해도 (테이블, id)가 유일하므로 한 번만 기록됨
+        for model in crud.SYNCED_MODELS:
+            conn.execute(text(
+                f"INSERT OR IGNORE INTO change_log (entity, entity_id, deleted) "
+                f"SELECT '{model.__tablename__}', id, 0 FROM {model.__tablename__} ORDER BY id"
+            ))
+
+
+def get_changes(db: Session, since: int = 0, limit: int = 1000) -> schemas.SyncResponse:
+    """seq > since인 변경을 seq 순으로 최대 limit건 반환"""
+    ChangeLog = models.ChangeLog
+    changes = db.query(ChangeLog.seq, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.deleted).filter(
+        ChangeLog.seq > since
+    ).order_by(ChangeLog.seq).limit(limit + 1).all()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    changed: Dict[str, List[int]] = defaultdict(list)
+    deleted: Dict[str, List[int]] = defaultdict(list)
+    for _, entity, entity_id, is_deleted in changes:
+        (deleted if is_deleted else changed)[entity].append(entity_id)
+
+    # 기록을 읽은 뒤 다시 바뀐 행은 최신 상태로 보내고, 그 변경은 다음 동기화에서 한 번 더 전달됨
+    def rows(model) -> list:
+        ids = changed.get(model.__tablename__)
+        if not ids:
+            return []
+        if model is models.Transaction:
+            return crud.get_transactions_by_ids(db, ids)
+        return db.query(model).filter(model.id.in_(ids)).all()
+
+    return schemas.SyncResponse(
+        seq=changes[-1].seq if changes else since,
+        has_more=has_more,
+        transactions=rows(models.Transaction),
+        budget_plans=rows(models.BudgetPlan),
+        regular_transactions=rows(models.RegularTransaction),
+        deleted=dict(deleted),
+    )
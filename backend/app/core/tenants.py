@@ -0,0 +1,179 @@
+"""
+멀티 테넌트 모드: 테넌트별 SQLite 파일
+
+config.TENANT_DB_DIR를 지정하면 get_db()가 요청의 테넌트 키(config.TENANT_HEADER 헤더 또는
+tenant 쿼리 파라미터)로 TENANT_DB_DIR/<테넌트>.db 세션을 연다.
+- 엔진 캐시: 최대 config.TENANT_CACHE_SIZE개를 LRU로 유지, 넘치면 사용 중이 아닌(열린 세션 없는)
+  가장 오래된 엔진의 writer를 종료하고 연결 풀을 닫음
+- 스키마: 테넌트 엔진을 처음 만들 때 init_db로 준비 (이미 있으면 마이그레이션/트리거 확인만)
+- 엔진 -> 테넌트 키 기록은 엔진이 캐시에서 내보내진 뒤에도 엔진 객체가 남아 있는 동안 유지
+  (엔진을 붙잡은 작업이나 캐시 키가 기본 데이터베이스(None)로 바뀌지 않도록)
+- 테넌트마다 파일과 writer 스레드가 따로라 테넌트 간 쓰기 잠금 경합이 없음
+- 컬럼형 스냅샷/DuckDB 집계는 기본 데이터베이스 전용이며 테넌트 DB는 SQLite 집계를 사용
+"""
+import os
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fastapi import HTTPException, Request
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .. import config, database
+from . import metrics, profiler, writer
+
+TENANT_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# 엔진 -> 테넌트 키 (닫힌 엔진도 참조가 남아 있는 동안 유지, 엔진이 해제되면 자동 삭제)
+_tenant_by_engine: "weakref.WeakKeyDictionary[Engine, str]" = weakref.WeakKeyDictionary()
+_tenant_by_engine_lock = threading.Lock()
+
+
+class _Entry:
+    def __init__(self, tenant: str):
+        self.tenant = tenant
+        self.engine: Optional[Engine] = None
+        self.refs = 0
+        self.lock = threading.Lock()
+
+
+class TenantEngines:
+    """테넌트 키 -> 엔진 LRU 캐시 (열린 세션이 있는 엔진은 내보내지 않음)"""
+
+    def __init__(self, directory: str, capacity: int):
+        self.directory = directory
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, tenant: str) -> Engine:
+        """테넌트 엔진을 사용 중으로 표시하고 반환 (처음이면 생성 후 스키마 준비), release()로 반납"""
+        with self._lock:
+            entry = self._entries.get(tenant)
+            if entry is None:
+                entry = self._entries[tenant] = _Entry(tenant)
+            self._entries.move_to_end(tenant)
+            entry.refs += 1
+
+        try:
+            # 스키마 준비는 테넌트별 잠금으로 (다른 테넌트 요청은 기다리지 않음)
+            with entry.lock:
+                if entry.engine is None:
+                    entry.engine = self._create_engine(tenant)
+                    with _tenant_by_engine_lock:
+                        _tenant_by_engine[entry.engine] = tenant
+        except Exception:
+            self._release_entry(entry)
+            raise
+
+        self._evict()
+        return entry.engine
+
+    def release(self, engine: Engine):
+        """acquire()로 받은 엔진 반납"""
+        with self._lock:
+            entry = self._entries.get(tenant_of(engine))
+        if entry is not None and entry.engine is engine:
+            self._release_entry(entry)
+        self._evict()
+
+    def close_all(self):
+        """모든 테넌트 엔진 정리 (앱 종료 시)"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._close(entry)
+
+    def _create_engine(self, tenant: str) -> Engine:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{tenant}.db")
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        metrics.instrument_engine(engine)
+        profiler.install(engine)
+        database.init_db(engine)
+        return engine
+
+    def _release_entry(self, entry: _Entry):
+        with self._lock:
+            entry.refs -= 1
+
+    def _evict(self):
+        with self._lock:
+            excess = len(self._entries) - self.capacity
+            if excess <= 0:
+                return
+            idle = [entry for entry in self._entries.values() if entry.refs == 0][:excess]
+            for entry in idle:
+                del self._entries[entry.tenant]
+        for entry in idle:
+            self._close(entry)
+
+    def _close(self, entry: _Entry):
+        with entry.lock:
+            engine, entry.engine = entry.engine, None
+        if engine is None:
+            return
+        writer.discard(engine)
+        engine.dispose()
+
+
+_engines: Optional[TenantEngines] = None
+_engines_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    """멀티 테넌트 모드 여부"""
+    return bool(config.TENANT_DB_DIR)
+
+
+def get_engines() -> TenantEngines:
+    """테넌트 엔진 캐시 (처음 사용할 때 생성)"""
+    global _engines
+    with _engines_lock:
+        if _engines is None:
+            _engines = TenantEngines(config.TENANT_DB_DIR, config.TENANT_CACHE_SIZE)
+        return _engines
+
+
+def tenant_key(request: Request) -> str:
+    """요청의 테넌트 키 (헤더 우선, EventSource처럼 헤더를 못 보내면 tenant 쿼리 파라미터)"""
+    tenant = request.headers.get(config.TENANT_HEADER) or request.query_params.get("tenant")
+    if not tenant:
+        raise HTTPException(status_code=400, detail=f"Missing {config.TENANT_HEADER} header")
+    if not TENANT_KEY_PATTERN.match(tenant):
+        raise HTTPException(status_code=400, detail="Invalid tenant key")
+    return tenant
+
+
+def tenant_of(bind) -> Optional[str]:
+    """bind가 테넌트 엔진이면 테넌트 키 (캐시에서 내보내진 엔진 포함), 기본 데이터베이스면 None"""
+    with _tenant_by_engine_lock:
+        return _tenant_by_engine.get(bind)
+
+
+@contextmanager
+def session(tenant: str) -> Iterator[Session]:
+    """테넌트 DB 세션 (세션이 열려 있는 동안 엔진은 캐시에서 내보내지지 않음)"""
+    engines = get_engines()
+    engine = engines.acquire(tenant)
+    db = Session(bind=engine, autoflush=False)
+    try:
+        yield db
+    finally:
+        db.close()
+        engines.release(engine)
+
+
+def shutdown():
+    """테넌트 엔진 모두 닫기 (앱 종료 시 lifespan에서 호출)"""
+    global _engines
+    with _engines_lock:
+        engines, _engines = _engines, None
+    if engines is not None:
+        engines.close_all()
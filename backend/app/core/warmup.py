@@ -0,0 +1,112 @@
+"""
+기동 후 캐시 예열 (배포 직후 첫 화면 요청이 모든 것을 처음부터 계산하지 않도록)
+
+- 대상: 대시보드가 읽는 이번 달/지난달 월별·카테고리별 통계, 자산 목표 분석,
+  화면에서 내려받는 이번 달 월별 리포트와 올해 연간 리포트 파일 (core.reports 디스크 캐시)
+- 통계와 목표 분석은 데이터 버전별 결과 캐시(reports.monthly_stats/category_stats/goal_analysis)에 미리 계산해 둠
+  (duckdb 엔진이면 통계 계산 중에 컬럼형 스냅샷 갱신과 DuckDB 테이블 적재도 끝남)
+- 실행: lifespan이 start()로 백그라운드 태스크를 만들고 바로 yield하므로 준비 완료를 늦추지 않음
+- 양보: 단계마다 처리 중인 요청이 없고 마지막 요청 후 config.WARMUP_IDLE_MS가 지날 때까지 기다린 뒤
+  한 단계만 별도 스레드에서 실행하고, 단계 사이에 config.WARMUP_STEP_SLEEP_MS만큼 쉼
+- 취소: 앱 종료 시 shutdown()이 태스크를 취소 (이미 시작한 단계는 스레드에서 끝까지 실행되므로
+  연간 리포트도 한 달 통계씩 단계를 나눔)
+- 멀티 테넌트 모드에서는 어느 테넌트가 쓰일지 모르고 테넌트 엔진 캐시를 밀어내므로 예열하지 않음
+"""
+import asyncio
+import logging
+import time
+from datetime import date
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .. import config, crud, models
+from ..database import SessionLocal
+from . import metrics, reports, tenants
+
+logger = logging.getLogger(__name__)
+
+_task: Optional[asyncio.Task] = None
+
+
+def _previous_month(year: int, month: int) -> Tuple[int, int]:
+    return (year - 1, 12) if month == 1 else (year, month - 1)
+
+
+def _month_stats(year: int, month: int) -> Callable[[Session], None]:
+    def warm(db: Session):
+        reports.monthly_stats(db, year, month)
+        for transaction_type in models.TransactionType:
+            reports.category_stats(db, year, month, transaction_type)
+    return warm
+
+
+def _goal_analyses(db: Session):
+    for goal in crud.get_asset_goals(db):
+        reports.goal_analysis(db, goal)
+
+
+def steps(today: Optional[date] = None) -> List[Tuple[str, Callable[[Session], object]]]:
+    """예열 단계 (이름, 함수(db)) 목록, 가벼운 단계부터"""
+    today = today or date.today()
+    year, month = today.year, today.month
+    recent = [(year, month), _previous_month(year, month)]
+    rest = [ym for ym in reports.period_months(year) if ym not in recent]
+    return [
+        *[(f"stats {y}-{m:02d}", _month_stats(y, m)) for y, m in recent],
+        ("asset goals", _goal_analyses),
+        (f"monthly report {year}-{month:02d}", lambda db: reports.monthly_report(db, year, month)),
+        # 연간 리포트의 나머지 달 통계를 한 달씩 나눠 계산해 두면 리포트 단계는 캐시된 통계로 조립만 함
+        *[(f"stats {y}-{m:02d}", _month_stats(y, m)) for y, m in rest],
+        (f"annual report {year}", lambda db: reports.period_report(db, year)),
+    ]
+
+
+def _run_step(warm: Callable[[Session], object]):
+    db = SessionLocal()
+    try:
+        warm(db)
+    finally:
+        db.close()
+
+
+async def _wait_for_idle():
+    idle = config.WARMUP_IDLE_MS / 1000
+    while (remaining := idle - metrics.registry.idle_seconds()) > 0:
+        await asyncio.sleep(remaining)
+
+
+async def run():
+    """예열 단계를 요청이 없을 때 하나씩 실행 (실패한 단계는 기록만 하고 다음 단계 진행)"""
+    started = time.perf_counter()
+    planned = steps()
+    done = 0
+    for name, warm in planned:
+        await _wait_for_idle()
+        step_started = time.perf_counter()
+        try:
+            await asyncio.to_thread(_run_step, warm)
+            done += 1
+            logger.debug("Warm-up %s: %.0f ms", name, (time.perf_counter() - step_started) * 1000)
+        except Exception:
+            logger.exception("Warm-up step failed: %s", name)
+        await asyncio.sleep(config.WARMUP_STEP_SLEEP_MS / 1000)
+    logger.info("Warm-up finished: %d/%d steps in %.0f ms", done, len(planned), (time.perf_counter() - started) * 1000)
+
+
+def start():
+    """config.WARMUP_ENABLED이면 예열 태스크 시작 (lifespan에서 호출, 완료를 기다리지 않음)"""
+    global _task
+    if not config.WARMUP_ENABLED or tenants.is_enabled() or _task is not None:
+        return
+    _task = asyncio.create_task(run(), name="warmup")
+
+
+async def shutdown():
+    """진행 중인 예열 태스크 취소 (앱 종료 시 lifespan에서 호출)"""
+    global _task
+    task, _task = _task, None
+    if task is None:
+        return
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,210 @@
+"""
+단일 writer 그룹 커밋 큐
+
+crud의 쓰기 작업은 호출한 요청 스레드에서 커밋하지 않고 엔진별 writer 스레드로 보낸다.
+writer는 config.WRITE_BATCH_WINDOW_MS 동안 도착한 작업을 모아 하나의 트랜잭션(BEGIN IMMEDIATE)에서
+작업마다 SAVEPOINT로 실행하고 한 번만 커밋(fsync)한 뒤 각 호출자의 Future에 결과를 전달한다.
+- 한 작업의 실패는 그 SAVEPOINT만 롤백하고 호출자에게 예외로 전달 (같은 배치의 다른 작업은 커밋)
+- 커밋 자체가 실패하면 배치의 모든 작업이 같은 예외를 받음
+- paused() 블록 동안은 새 배치를 커밋하지 않음 (백업의 마지막 복사 등 잠시 쓰기를 멈춰야 할 때)
+- 결과 객체는 writer 세션에서 분리(detached)된 상태로 반환되며 컬럼 값은 모두 로드되어 있음
+- 작업은 호출자의 contextvars를 복사한 컨텍스트에서 실행 (쿼리 프로파일러가 요청별로 쓰기 쿼리를 집계)
+- writer 스레드가 예외로 끝나면 대기 중인 작업에 예외를 전달하고 다음 submit에서 새 스레드를 시작,
+  호출자는 config.WRITE_TIMEOUT_S까지만 기다림
+"""
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
+from typing import Dict
+
+from sqlalchemy.orm import Session
+
+from .. import config
+from . import metrics
+
+_STOP = object()
+
+
+class WriteQueue:
+    """한 엔진의 쓰기 작업을 그룹 커밋으로 처리하는 writer 스레드"""
+
+    def __init__(
+        self,
+        bind,
+        window: float = config.WRITE_BATCH_WINDOW_MS / 1000,
+        max_batch: int = config.WRITE_BATCH_MAX
+    ):
+        self.bind = bind
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._pause_lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, fn, *args) -> Future:
+        """fn(session, *args)를 writer에서 호출자의 컨텍스트로 실행하도록 예약"""
+        future = Future()
+        context = contextvars.copy_context()
+        # 대기 시간 전체를 호출자가 db 단계로 계측하므로 writer의 쿼리 시간은 다시 더하지 않음
+        context.run(metrics.exclude_db_queries)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+            self._queue.put((fn, args, context, future))
+        return future
+
+    @contextmanager
+    def paused(self):
+        """블록 안에서는 배치를 커밋하지 않음 (진행 중인 배치가 끝나길 기다린 뒤 멈추고, 그동안 온 쓰기는 대기열에 쌓임)"""
+        with self._pause_lock:
+            yield
+
+    def shutdown(self):
+        """대기 중인 작업을 모두 처리한 뒤 writer 종료"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+        thread.join()
+
+    def _collect(self, first) -> list:
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+            if item is _STOP:
+                break
+        return batch
+
+    def _run(self):
+        batch = []
+        try:
+            with self.bind.connect() as conn:
+                # pysqlite의 암묵적 트랜잭션을 끄고 BEGIN IMMEDIATE/SAVEPOINT를 직접 관리
+                # (풀로 돌아가기 전에 원래 설정 복원)
+                dbapi_conn = conn.connection.driver_connection
+                isolation_level = dbapi_conn.isolation_level
+                dbapi_conn.isolation_level = None
+                try:
+                    while True:
+                        batch = self._collect(self._queue.get())
+                        stop = batch[-1] is _STOP
+                        if stop:
+                            batch.pop()
+                        if batch:
+                            with self._pause_lock:
+                                self._commit_batch(conn, batch)
+                        if stop:
+                            return
+                finally:
+                    dbapi_conn.isolation_level = isolation_level
+        except Exception as e:
+            self._fail(batch, e)
+
+    def _fail(self, batch: list, error: Exception):
+        """스레드가 죽을 때 처리 중이던 배치와 대기열의 작업에 예외 전달 (다음 submit은 새 스레드 시작)"""
+        with self._lock:
+            if self._thread is threading.current_thread():
+                self._thread = None
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+        for item in batch:
+            if item is _STOP:
+                continue
+            future = item[-1]
+            if not future.done() and (future.running() or future.set_running_or_notify_cancel()):
+                future.set_exception(error)
+
+    def _commit_batch(self, conn, batch: list):
+        pending = [
+            (fn, args, context, future) for fn, args, context, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        done = []
+        session = Session(bind=conn, autoflush=False, expire_on_commit=False)
+        try:
+            # 쓰기 잠금을 트랜잭션 시작 시점에 확보 (읽기 -> 쓰기 승격 중 교착으로 인한 database is locked 방지)
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            for fn, args, context, future in pending:
+                savepoint = session.begin_nested()
+                try:
+                    result = context.run(fn, session, *args)
+                    savepoint.commit()
+                except Exception as e:
+                    savepoint.rollback()
+                    future.set_exception(e)
+                    continue
+                done.append((future, result))
+            # 세션은 연결의 트랜잭션에 합류한 상태이므로 세션 flush 후 연결에서 한 번 커밋
+            session.commit()
+            conn.commit()
+        except Exception as e:
+            session.rollback()
+            conn.rollback()
+            for *_, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            session.close()
+
+        for future, result in done:
+            future.set_result(result)
+
+
+_writers: Dict[object, WriteQueue] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(bind) -> WriteQueue:
+    """엔진별 WriteQueue (처음 사용할 때 생성)"""
+    with _writers_lock:
+        writer = _writers.get(bind)
+        if writer is None:
+            writer = _writers[bind] = WriteQueue(bind)
+        return writer
+
+
+def execute(db: Session, fn, *args):
+    """db 세션의 엔진 writer에서 fn(session, *args)를 실행하고 결과 반환 (대기 시간은 db 단계로 계측)
+
+    config.WRITE_TIMEOUT_S 안에 끝나지 않으면 TimeoutError (아직 시작하지 않은 작업은 취소됨)
+    """
+    future = get_writer(db.get_bind()).submit(fn, *args)
+    with metrics.phase("db"):
+        try:
+            return future.result(timeout=config.WRITE_TIMEOUT_S)
+        except FuturesTimeoutError:
+            future.cancel()
+            raise
+
+
+def discard(bind):
+    """bind 엔진의 writer를 대기 작업 처리 후 종료 (엔진을 닫기 전에 호출)"""
+    with _writers_lock:
+        writer = _writers.pop(bind, None)
+    if writer is not None:
+        writer.shutdown()
+
+
+def shutdown():
+    """모든 writer 종료 (앱 종료 시 lifespan에서 호출)"""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.shutdown()
@@ -1,11 +1,174 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
-from typing import List, Optional
-from datetime import datetime
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy import case, delete, func, extract, insert, or_, select, table, column, literal_column, text
+import json
+from typing import List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from dateutil.relativedelta import relativedelta
 from . import models, schemas
+from .core import analytics, archive, writer
+
+
+# 전문 검색 인덱스 (database.SEARCH_INDEX_DDL 참고)
+transactions_fts = table("transactions_fts", column("rowid"), column("rank"))
+
+# trigram 토크나이저는 3글자 이상의 검색어만 색인으로 찾을 수 있음
+MIN_FTS_TERM_LENGTH = 3
+
+
+def build_search_filter(q: str, entity=models.Transaction, use_fts: bool = True):
+    """검색어를 FTS5 MATCH 식과 짧은 검색어용 LIKE 조건으로 분리 (use_fts=False면 모두 LIKE, 보관 연도용)"""
+    terms = q.split()
+    fts_terms = [t for t in terms if use_fts and len(t) >= MIN_FTS_TERM_LENGTH]
+    like_terms = [t for t in terms if t not in fts_terms]
+
+    # 각 검색어를 구문(phrase)으로 감싸 FTS5 문법 문자를 무력화 (공백 구분 = AND)
+    match_expr = " ".join('"' + t.replace('"', '""') + '"' for t in fts_terms) or None
+    like_filters = [
+        or_(
+            entity.description.contains(t, autoescape=True),
+            entity.note.contains(t, autoescape=True)
+        )
+        for t in like_terms
+    ]
+    return match_expr, like_filters
+
+
+# 증분 동기화 대상 테이블: 쓰기 작업이 같은 트랜잭션에서 change_log에 기록 (core.sync 참고)
+SYNCED_MODELS = (models.Transaction, models.BudgetPlan, models.RegularTransaction)
+
+# 행마다 마지막 변경 하나만 남김 (REPLACE가 기존 기록을 지우고 새 seq로 다시 씀)
+_LOG_CHANGES = "INSERT OR REPLACE INTO change_log (entity, entity_id, deleted) "
+
+
+def _log_changes(session: Session, model, ids: List[int], deleted: bool = False):
+    if model in SYNCED_MODELS and ids:
+        session.execute(
+            text(_LOG_CHANGES + "SELECT :entity, value, :deleted FROM json_each(:ids)"),
+            {"entity": model.__tablename__, "deleted": deleted, "ids": json.dumps(list(ids))}
+        )
+
+
+def _register_merchants(session: Session, model, data: dict):
+    # 정기 거래 증분 감지가 사용처로 설명을 찾을 수 있도록 같은 트랜잭션에서 기록 (core.recurring 참고)
+    if model is models.Transaction and data.get("description") is not None:
+        models.register_merchants(session, [data["description"]])
+
+
+# 쓰기 작업: writer 스레드의 세션에서 SAVEPOINT 단위로 실행되고 그룹 커밋됨 (core.writer 참고)
+def _insert(session: Session, model, data: dict):
+    db_obj = model(**data)
+    session.add(db_obj)
+    session.flush()
+    session.refresh(db_obj)
+    _log_changes(session, model, [db_obj.id])
+    _register_merchants(session, model, data)
+    return db_obj
+
+
+def _insert_transactions(session: Session, rows: List[dict]) -> int:
+    # 카테고리 이름을 배치당 한 번씩 id로 바꾼 뒤 executemany 한 번으로 저장 (ORM 객체 생성 생략)
+    category_ids = {
+        name: models.get_or_create_category(session, name).id
+        for name in {data.get("category") for data in rows} if name is not None
+    }
+    last_id = session.scalar(select(func.max(models.Transaction.id))) or 0
+    session.execute(insert(models.Transaction), [
+        {**{k: v for k, v in data.items() if k != "category"},
+         "category_id": category_ids.get(data.get("category"))}
+        for data in rows
+    ])
+    # 새 거래는 AUTOINCREMENT라 기존 최대 id 뒤에 붙으므로 id 범위로 한 번에 기록
+    session.execute(
+        text(_LOG_CHANGES + "SELECT 'transactions', id, 0 FROM transactions WHERE id > :last_id"),
+        {"last_id": last_id}
+    )
+    models.register_merchants(session, (data["description"] for data in rows))
+    return len(rows)
+
+
+def _update(session: Session, model, object_id, data: dict):
+    db_obj = session.get(model, object_id)
+    if not db_obj:
+        return None
+    
+    for key, value in data.items():
+        setattr(db_obj, key, value)
+    
+    session.flush()
+    session.refresh(db_obj)
+    _log_changes(session, model, [object_id])
+    _register_merchants(session, model, data)
+    return db_obj
+
+
+def _delete(session: Session, model, object_id: int) -> bool:
+    db_obj = session.get(model, object_id)
+    if not db_obj:
+        return False
+    
+    session.delete(db_obj)
+    session.flush()
+    _log_changes(session, model, [object_id], deleted=True)
+    return True
 
 
 # Transaction CRUD
+def _filter_transactions(
+    query,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category: Optional[str] = None,
+    type: Optional[models.TransactionType] = None,
+    q: Optional[str] = None,
+    entity=models.Transaction
+):
+    """거래 조회 조건 적용, (query, 전문 검색 색인 조인 여부) 반환 (entity: 현재 테이블 또는 보관 연도)"""
+    searched = False
+    if q and q.strip():
+        match_expr, like_filters = build_search_filter(q, entity, use_fts=entity is models.Transaction)
+        if match_expr:
+            query = query.join(
+                transactions_fts, transactions_fts.c.rowid == models.Transaction.id
+            ).filter(literal_column("transactions_fts").op("MATCH")(match_expr))
+            searched = True
+        for like_filter in like_filters:
+            query = query.filter(like_filter)
+    if start_date:
+        query = query.filter(entity.date >= start_date)
+    if end_date:
+        query = query.filter(entity.date <= end_date)
+    if category:
+        # 카테고리 이름을 id로 바꿔 정수 인덱스로 조회
+        category_id = select(models.Category.id).where(models.Category.name == category).scalar_subquery()
+        query = query.filter(entity.category_id == category_id)
+    if type:
+        query = query.filter(entity.type == type)
+    return query, searched
+
+
+def _read_with_archives(
+    db: Session,
+    rows: list,
+    archives: List[archive.Archive],
+    wanted: int,
+    read,
+    hot_first: bool = False
+) -> list:
+    """현재 테이블에서 읽은 rows 뒤에 보관 연도(최신순)에서 read(entity)로 읽은 거래를 이어 붙임
+
+    그 연도 거래보다 앞에 올 결과(날짜순이면 그 연도보다 새로운 거래, hot_first면 이미 읽은 전부)가
+    wanted건이 되면 그 연도와 더 오래된 연도는 읽지 않는다.
+    """
+    for archived in archives:
+        year_end = datetime(archived.year + 1, 1, 1)
+        ahead = len(rows) if hot_first else sum(1 for row in rows if row.date >= year_end)
+        if ahead >= wanted:
+            break
+        rows = rows + read(archive.attach(db, archived))
+    return rows
+
+
 def get_transactions(
     db: Session,
     skip: int = 0,
@@ -13,35 +176,125 @@ def get_transactions(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     category: Optional[str] = None,
-    type: Optional[models.TransactionType] = None
+    type: Optional[models.TransactionType] = None,
+    q: Optional[str] = None
 ) -> List[models.Transaction]:
-    """거래 내역 조회"""
-    query = db.query(models.Transaction)
-    
-    if start_date:
-        query = query.filter(models.Transaction.date >= start_date)
-    if end_date:
-        query = query.filter(models.Transaction.date <= end_date)
-    if category:
-        query = query.filter(models.Transaction.category == category)
-    if type:
-        query = query.filter(models.Transaction.type == type)
-    
-    return query.order_by(models.Transaction.date.desc()).offset(skip).limit(limit).all()
+    """거래 내역 조회 (q 지정 시 설명/메모 전문 검색, 관련도 순 정렬)
+
+    기간이 보관 연도에 닿으면 각 원본에서 skip + limit건씩 읽어 날짜순으로 합친다
+    (검색 시에는 현재 테이블 결과를 관련도 순으로 먼저, 보관 연도 결과를 날짜순으로 뒤에).
+    """
+    query, searched = _filter_transactions(
+        db.query(models.Transaction), start_date, end_date, category, type, q
+    )
+    order_by = [models.Transaction.date.desc()]
+    if searched:
+        order_by.insert(0, transactions_fts.c.rank)
+
+    archives = archive.archives_in_range(db, start_date, end_date)
+    if not archives:
+        return query.order_by(*order_by).offset(skip).limit(limit).all()
+
+    wanted = skip + limit
+    rows = query.order_by(*order_by).limit(wanted).all()
+    hot_count = len(rows)
+
+    def read(entity):
+        archived_query, _ = _filter_transactions(
+            archive.query(db, entity), start_date, end_date, category, type, q, entity
+        )
+        return archived_query.order_by(entity.date.desc()).limit(wanted).all()
+
+    rows = _read_with_archives(db, rows, archives, wanted, read, hot_first=searched)
+    if searched:
+        rows = rows[:hot_count] + sorted(rows[hot_count:], key=lambda t: t.date, reverse=True)
+    else:
+        rows.sort(key=lambda t: t.date, reverse=True)
+    return rows[skip:wanted]
+
+
+def get_transactions_after(
+    db: Session,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int = 1000,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category: Optional[str] = None,
+    type: Optional[models.TransactionType] = None,
+    q: Optional[str] = None
+) -> List[models.Transaction]:
+    """키셋 페이지 조회: (날짜, id) 내림차순으로 after 다음 거래부터 limit건 (스트리밍용)
+
+    OFFSET 없이 마지막 행의 (날짜, id) 뒤부터 읽으므로 페이지가 뒤로 가도 조회 비용이 일정하다.
+    """
+    query, _ = _filter_transactions(
+        db.query(models.Transaction), start_date, end_date, category, type, q
+    )
+
+    def page(query, entity):
+        if after:
+            after_date, after_id = after
+            # date 인덱스 범위 조건을 먼저 두고 같은 시각 안에서는 id로 구분
+            query = query.filter(
+                entity.date <= after_date,
+                or_(entity.date < after_date, entity.id < after_id)
+            )
+        return query.order_by(entity.date.desc(), entity.id.desc()).limit(limit).all()
+
+    rows = page(query, models.Transaction)
+    archives = archive.archives_in_range(db, start_date, after[0] if after else end_date)
+    if not archives:
+        return rows
+
+    def read(entity):
+        archived_query, _ = _filter_transactions(
+            archive.query(db, entity), start_date, end_date, category, type, q, entity
+        )
+        return page(archived_query, entity)
+
+    rows = _read_with_archives(db, rows, archives, limit, read)
+    rows.sort(key=lambda t: (t.date, t.id), reverse=True)
+    return rows[:limit]
 
 
 def get_transaction(db: Session, transaction_id: int) -> Optional[models.Transaction]:
-    """특정 거래 조회"""
-    return db.query(models.Transaction).filter(models.Transaction.id == transaction_id).first()
+    """특정 거래 조회 (현재 테이블에 없으면 보관 연도에서 찾음)"""
+    transaction = db.query(models.Transaction).filter(models.Transaction.id == transaction_id).first()
+    if transaction is None:
+        for archived in archive.archives_in_range(db):
+            entity = archive.attach(db, archived)
+            transaction = archive.query(db, entity).filter(entity.id == transaction_id).first()
+            if transaction is not None:
+                break
+    return transaction
+
+
+def get_transactions_by_ids(db: Session, ids: List[int]) -> List[models.Transaction]:
+    """id 목록의 거래 조회 (현재 테이블에 없으면 보관 연도에서 찾고, 어디에도 없는 id는 제외)"""
+    if not ids:
+        return []
+    rows = db.query(models.Transaction).filter(models.Transaction.id.in_(ids)).all()
+    missing = set(ids) - {t.id for t in rows}
+    for archived in archive.archives_in_range(db):
+        if not missing:
+            break
+        entity = archive.attach(db, archived)
+        found = archive.query(db, entity).filter(entity.id.in_(missing)).all()
+        rows += found
+        missing -= {t.id for t in found}
+    return rows
 
 
 def create_transaction(db: Session, transaction: schemas.TransactionCreate) -> models.Transaction:
     """거래 생성"""
-    db_transaction = models.Transaction(**transaction.model_dump())
-    db.add(db_transaction)
-    db.commit()
-    db.refresh(db_transaction)
-    return db_transaction
+    return writer.execute(db, _insert, models.Transaction, transaction.model_dump())
+
+
+def create_transactions(db: Session, transactions: List[schemas.TransactionCreate]) -> int:
+    """거래 일괄 생성 (한 번의 writer 작업/트랜잭션), 생성 건수 반환"""
+    if not transactions:
+        return 0
+    return writer.execute(db, _insert_transactions, [t.model_dump() for t in transactions])
 
 
 def update_transaction(
@@ -50,28 +303,14 @@ def update_transaction(
     transaction: schemas.TransactionUpdate
 ) -> Optional[models.Transaction]:
     """거래 수정"""
-    db_transaction = get_transaction(db, transaction_id)
-    if not db_transaction:
-        return None
-    
-    update_data = transaction.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_transaction, key, value)
-    
-    db.commit()
-    db.refresh(db_transaction)
-    return db_transaction
+    return writer.execute(
+        db, _update, models.Transaction, transaction_id, transaction.model_dump(exclude_unset=True)
+    )
 
 
 def delete_transaction(db: Session, transaction_id: int) -> bool:
     """거래 삭제"""
-    db_transaction = get_transaction(db, transaction_id)
-    if not db_transaction:
-        return False
-    
-    db.delete(db_transaction)
-    db.commit()
-    return True
+    return writer.execute(db, _delete, models.Transaction, transaction_id)
 
 
 # Budget Plan CRUD
@@ -100,11 +339,7 @@ def get_budget_plan(db: Session, plan_id: int) -> Optional[models.BudgetPlan]:
 
 def create_budget_plan(db: Session, plan: schemas.BudgetPlanCreate) -> models.BudgetPlan:
     """재무 계획 생성"""
-    db_plan = models.BudgetPlan(**plan.model_dump())
-    db.add(db_plan)
-    db.commit()
-    db.refresh(db_plan)
-    return db_plan
+    return writer.execute(db, _insert, models.BudgetPlan, plan.model_dump())
 
 
 def update_budget_plan(
@@ -113,52 +348,145 @@ def update_budget_plan(
     plan: schemas.BudgetPlanUpdate
 ) -> Optional[models.BudgetPlan]:
     """재무 계획 수정"""
-    db_plan = get_budget_plan(db, plan_id)
-    if not db_plan:
-        return None
-    
-    update_data = plan.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_plan, key, value)
-    
-    db.commit()
-    db.refresh(db_plan)
-    return db_plan
+    return writer.execute(
+        db, _update, models.BudgetPlan, plan_id, plan.model_dump(exclude_unset=True)
+    )
 
 
 def delete_budget_plan(db: Session, plan_id: int) -> bool:
     """재무 계획 삭제"""
-    db_plan = get_budget_plan(db, plan_id)
-    if not db_plan:
-        return False
-    
-    db.delete(db_plan)
-    db.commit()
-    return True
+    return writer.execute(db, _delete, models.BudgetPlan, plan_id)
+
+
+# (연, 월, 카테고리)가 같은 계획은 금액/설명만 갱신해 id 유지
+_UPSERT_BUDGET_PLANS = """
+    ON CONFLICT(year, month, category) DO UPDATE SET
+        planned_amount = excluded.planned_amount,
+        description = excluded.description,
+        updated_at = CURRENT_TIMESTAMP
+    RETURNING *
+"""
+
+
+def _upsert_plans_from(session: Session, insert_select: str, params: dict) -> List[models.BudgetPlan]:
+    # INSERT ... SELECT 한 문장으로 upsert하고 저장된 행을 그대로 반환 (WHERE가 있어야 ON CONFLICT와 구분됨)
+    plans = session.scalars(
+        select(models.BudgetPlan).from_statement(text(insert_select + _UPSERT_BUDGET_PLANS))
+        .execution_options(populate_existing=True),
+        params
+    ).all()
+    # 같은 행이 여러 번 반환되어도 계획은 하나씩만
+    plans = list({plan.id: plan for plan in plans}.values())
+    _log_changes(session, models.BudgetPlan, [plan.id for plan in plans])
+    return sorted(plans, key=lambda plan: (plan.year, plan.month, plan.category))
+
+
+def _upsert_budget_plans(session: Session, rows: List[dict]) -> List[models.BudgetPlan]:
+    return _upsert_plans_from(session, """
+        INSERT INTO budget_plans (year, month, category, planned_amount, description)
+        SELECT json_extract(value, '$.year'), json_extract(value, '$.month'), json_extract(value, '$.category'),
+               json_extract(value, '$.planned_amount'), json_extract(value, '$.description')
+        FROM json_each(:plans)
+        WHERE true
+    """, {"plans": json.dumps(rows)})
+
+
+def upsert_budget_plans(db: Session, plans: List[schemas.BudgetPlanCreate]) -> List[models.BudgetPlan]:
+    """재무 계획 일괄 저장 (한 번의 writer 작업/문장, 같은 연-월-카테고리 계획은 갱신)
+
+    요청 안에서 연-월-카테고리가 겹치면 마지막 계획만 저장한다.
+    """
+    if not plans:
+        return []
+    rows = {(plan.year, plan.month, plan.category): plan.model_dump() for plan in plans}
+    return writer.execute(db, _upsert_budget_plans, list(rows.values()))
+
+
+def _rollover_budget_plans(session: Session, rollover: dict) -> List[models.BudgetPlan]:
+    # 템플릿 월 자신은 대상에서 제외 (같은 해의 나머지 달로 펼칠 때 템플릿이 scale배 되지 않도록)
+    return _upsert_plans_from(session, """
+        INSERT INTO budget_plans (year, month, category, planned_amount, description)
+        SELECT :year, m.value, p.category, round(p.planned_amount * :scale), p.description
+        FROM budget_plans p JOIN json_each(:months) m
+        WHERE p.year = :template_year AND p.month = :template_month
+          AND NOT (:year = :template_year AND m.value = :template_month)
+    """, {**rollover, "months": json.dumps(sorted(set(rollover["months"])))})
+
+
+def rollover_budget_plans(db: Session, rollover: schemas.BudgetPlanRollover) -> List[models.BudgetPlan]:
+    """템플릿 월의 계획을 year의 months로 복사 (금액은 scale배 후 원 단위 반올림, 한 번의 writer 작업/문장)"""
+    return writer.execute(db, _rollover_budget_plans, rollover.model_dump())
+
+
+def derive_budget_plans(db: Session, plan: schemas.BudgetPlanFromHistory) -> List[schemas.BudgetPlanCreate]:
+    """최근 lookback_months개월의 카테고리별 월평균 지출(x scale)로 year의 months 계획 생성
+
+    기준 기간은 계획 연도 시작과 이번 달 시작 중 이른 시점 직전까지의 완료된 달이며,
+    기간 합계는 일별 누적 색인(core.daily_index)으로 구하므로 보관 연도까지 포함해도 거래를 다시 읽지 않는다.
+    """
+    from .core import daily_index
+
+    end = min(date(plan.year, 1, 1), date.today().replace(day=1))
+    months_before = end.year * 12 + end.month - 1 - plan.lookback_months
+    start = date(months_before // 12, months_before % 12 + 1, 1)
+    last_day = end - timedelta(days=1)
+    stats = daily_index.get_range_stats(db, start, last_day)
+
+    description = f"{start:%Y-%m}~{last_day:%Y-%m} 월평균"
+    return [
+        schemas.BudgetPlanCreate(
+            year=plan.year,
+            month=month,
+            category=s.category,
+            planned_amount=round(s.total_amount / plan.lookback_months * plan.scale),
+            description=description,
+        )
+        for month in sorted(set(plan.months))
+        for s in stats.expense
+    ]
 
 
 # Statistics
-def get_monthly_stats(db: Session, year: int, month: int) -> schemas.MonthlyStats:
-    """월별 통계 조회"""
-    income = db.query(func.sum(models.Transaction.amount)).filter(
-        extract('year', models.Transaction.date) == year,
-        extract('month', models.Transaction.date) == month,
-        models.Transaction.type == models.TransactionType.INCOME,
-        models.Transaction.status == models.TransactionStatus.COMPLETED
-    ).scalar() or 0.0
-    
-    expense = db.query(func.sum(models.Transaction.amount)).filter(
-        extract('year', models.Transaction.date) == year,
-        extract('month', models.Transaction.date) == month,
-        models.Transaction.type == models.TransactionType.EXPENSE,
-        models.Transaction.status == models.TransactionStatus.COMPLETED
-    ).scalar() or 0.0
-    
-    count = db.query(func.count(models.Transaction.id)).filter(
-        extract('year', models.Transaction.date) == year,
-        extract('month', models.Transaction.date) == month,
-        models.Transaction.status == models.TransactionStatus.COMPLETED
-    ).scalar() or 0
+def get_monthly_stats(
+    db: Session,
+    year: int,
+    month: int,
+    analytics_engine: Optional[str] = None
+) -> schemas.MonthlyStats:
+    """월별 통계 조회 (analytics_engine 미지정 시 config.ANALYTICS_ENGINE 사용, 보관 연도는 SQLite로 함께 집계)"""
+    archived = archive.find(db, year)
+    if not archived and analytics.is_enabled(analytics_engine, db.get_bind()):
+        income, expense, count = analytics.totals(db, *analytics.month_range(year, month))
+        return schemas.MonthlyStats(
+            year=year,
+            month=month,
+            total_income=income,
+            total_expense=expense,
+            net_amount=income - expense,
+            transaction_count=count
+        )
+
+    income = expense = count = 0
+    for entity in _month_sources(db, archived):
+        income += db.query(func.sum(entity.amount)).filter(
+            extract('year', entity.date) == year,
+            extract('month', entity.date) == month,
+            entity.type == models.TransactionType.INCOME,
+            entity.status == models.TransactionStatus.COMPLETED
+        ).scalar() or 0
+
+        expense += db.query(func.sum(entity.amount)).filter(
+            extract('year', entity.date) == year,
+            extract('month', entity.date) == month,
+            entity.type == models.TransactionType.EXPENSE,
+            entity.status == models.TransactionStatus.COMPLETED
+        ).scalar() or 0
+
+        count += db.query(func.count(entity.id)).filter(
+            extract('year', entity.date) == year,
+            extract('month', entity.date) == month,
+            entity.status == models.TransactionStatus.COMPLETED
+        ).scalar() or 0
     
     return schemas.MonthlyStats(
         year=year,
@@ -174,31 +502,163 @@ def get_category_stats(
     db: Session,
     year: int,
     month: int,
-    type: models.TransactionType
+    type: models.TransactionType,
+    analytics_engine: Optional[str] = None
 ) -> List[schemas.CategoryStats]:
-    """카테고리별 통계 조회"""
-    results = db.query(
-        models.Transaction.category,
-        func.sum(models.Transaction.amount).label('total'),
-        func.count(models.Transaction.id).label('count')
-    ).filter(
-        extract('year', models.Transaction.date) == year,
-        extract('month', models.Transaction.date) == month,
-        models.Transaction.type == type,
-        models.Transaction.status == models.TransactionStatus.COMPLETED,
-        models.Transaction.category.isnot(None)
-    ).group_by(models.Transaction.category).all()
-    
-    total_amount = sum(r.total for r in results) or 1.0  # Avoid division by zero
+    """카테고리별 통계 조회 (카테고리 순 정렬)"""
+    archived = archive.find(db, year)
+    if not archived and analytics.is_enabled(analytics_engine, db.get_bind()):
+        return build_category_stats(analytics.category_totals(db, type, *analytics.month_range(year, month)))
+
+    merged = {}
+    for entity in _month_sources(db, archived):
+        # 정수 category_id로 집계한 뒤 카테고리 사전과 조인해 이름을 붙임
+        totals = db.query(
+            entity.category_id.label('category_id'),
+            func.sum(entity.amount).label('total'),
+            func.count(entity.id).label('count')
+        ).filter(
+            extract('year', entity.date) == year,
+            extract('month', entity.date) == month,
+            entity.type == type,
+            entity.status == models.TransactionStatus.COMPLETED,
+            entity.category_id.isnot(None)
+        ).group_by(entity.category_id).subquery()
+
+        results = db.query(
+            models.Category.name, totals.c.total, totals.c.count
+        ).join(totals, totals.c.category_id == models.Category.id).order_by(models.Category.name).all()
+        for r in results:
+            total, count = merged.get(r.name, (0, 0))
+            merged[r.name] = (total + r.total, count + r.count)
+
+    return build_category_stats([(name, total, count) for name, (total, count) in sorted(merged.items())])
+
+
+def _month_sources(db: Session, archived: Optional[archive.Archive]):
+    """월 통계를 집계할 원본 (현재 테이블, 그 해가 보관된 연도면 보관 테이블도)"""
+    yield models.Transaction
+    if archived:
+        yield archive.attach(db, archived)
+
+
+# 잔액 시계열 구간 -> 날짜 문자열 앞부분 길이 (YYYY-MM-DD / YYYY-MM)
+BALANCE_INTERVALS = {"day": 10, "month": 7}
+
+
+def get_balance_series(
+    db: Session,
+    interval: str = "month",
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    opening_balance: float = 0,
+    exclude_categories: Optional[List[str]] = None,
+    analytics_engine: Optional[str] = None
+) -> schemas.BalanceSeries:
+    """일/월별 누적 잔액 시계열 (완료된 거래 기준, 윈도 함수로 누적합 계산)
+
+    첫 구간 이전 잔액은 opening_balance에 start_date 이전 거래의 순액을 더한 값이며,
+    exclude_categories의 거래(예: 저축 이체)는 순액과 잔액 모두에서 제외한다.
+    기간이 보관 연도에 닿으면 원본별 구간 합계를 합친 뒤 누적하고,
+    그렇지 않으면 구간 합계를 DuckDB 엔진(analytics_engine 미지정 시 config.ANALYTICS_ENGINE)으로 집계할 수 있다.
+    """
+    excluded = None
+    if exclude_categories:
+        excluded = select(models.Category.id).where(models.Category.name.in_(exclude_categories))
+
+    def signed(entity):
+        return case((entity.type == models.TransactionType.INCOME, entity.amount), else_=-entity.amount)
+
+    def base_filters(entity):
+        filters = [entity.status == models.TransactionStatus.COMPLETED]
+        if excluded is not None:
+            filters.append(or_(entity.category_id.is_(None), entity.category_id.notin_(excluded)))
+        return filters
+
+    def period_filters(entity):
+        filters = base_filters(entity)
+        if start_date:
+            filters.append(entity.date >= start_date)
+        if end_date:
+            filters.append(entity.date <= end_date)
+        return filters
+
+    def bucket_query(entity):
+        # 구간별 수입/지출 합계
+        return db.query(
+            func.substr(entity.date, 1, BALANCE_INTERVALS[interval]).label("period"),
+            func.sum(case((entity.type == models.TransactionType.INCOME, entity.amount), else_=0)).label("income"),
+            func.sum(case((entity.type == models.TransactionType.EXPENSE, entity.amount), else_=0)).label("expense")
+        ).filter(*period_filters(entity)).group_by("period")
+
+    opening = opening_balance
+    if start_date:
+        for entity in _range_sources(db, None, start_date):
+            opening += db.query(func.coalesce(func.sum(signed(entity)), 0)).filter(
+                *base_filters(entity), entity.date < start_date
+            ).scalar()
+
+    # 보관 연도에 닿거나 DuckDB로 집계하면 구간 합계를 파이썬에서 누적
+    buckets = None
+    if archive.archives_in_range(db, start_date, end_date):
+        merged = {}
+        for entity in _range_sources(db, start_date, end_date):
+            for r in bucket_query(entity):
+                income, expense = merged.get(r.period, (0, 0))
+                merged[r.period] = (income + r.income, expense + r.expense)
+        buckets = [(period, income, expense) for period, (income, expense) in sorted(merged.items())]
+    elif analytics.is_enabled(analytics_engine, db.get_bind()):
+        buckets = analytics.balance_buckets(db, interval, start_date, end_date, exclude_categories)
+
+    if buckets is not None:
+        points, balance = [], opening
+        for period, income, expense in buckets:
+            balance += income - expense
+            points.append(schemas.BalancePoint(
+                period=period, income=income, expense=expense, net=income - expense, balance=balance
+            ))
+    else:
+        # 구간별 수입/지출을 먼저 집계한 뒤 구간 순서로 순액 누적
+        buckets = bucket_query(models.Transaction).subquery()
+        net = buckets.c.income - buckets.c.expense
+        rows = db.query(
+            buckets.c.period, buckets.c.income, buckets.c.expense, net.label("net"),
+            func.sum(net).over(order_by=buckets.c.period, rows=(None, 0)).label("running")
+        ).order_by(buckets.c.period).all()
+        points = [
+            schemas.BalancePoint(
+                period=r.period, income=r.income, expense=r.expense, net=r.net, balance=opening + r.running
+            )
+            for r in rows
+        ]
+
+    return schemas.BalanceSeries(
+        interval=interval,
+        opening_balance=opening,
+        closing_balance=points[-1].balance if points else opening,
+        points=points
+    )
+
+
+def _range_sources(db: Session, start_date: Optional[datetime], end_date: Optional[datetime]):
+    """기간 [start_date, end_date]를 집계할 원본 (현재 테이블, 기간이 닿는 보관 연도는 사용할 때 연결에 붙임)"""
+    yield models.Transaction
+    for archived in archive.archives_in_range(db, start_date, end_date):
+        yield archive.attach(db, archived)
+
+
+def build_category_stats(results) -> List[schemas.CategoryStats]:
+    """(카테고리, 합계, 건수) 목록에 비율을 붙여 응답 스키마로 변환"""
+    total_amount = sum(total for _, total, _ in results) or 1.0  # Avoid division by zero
     
     return [
         schemas.CategoryStats(
-            category=r.category,
-            total_amount=r.total,
-            transaction_count=r.count,
-            percentage=(r.total / total_amount) * 100
+            category=category,
+            total_amount=total,
+            transaction_count=count,
+            percentage=(total / total_amount) * 100
         )
-        for r in results
+        for category, total, count in results
     ]
 
 
@@ -222,11 +682,7 @@ def create_regular_transaction(
     regular: schemas.RegularTransactionCreate
 ) -> models.RegularTransaction:
     """정기 거래 생성"""
-    db_regular = models.RegularTransaction(**regular.model_dump())
-    db.add(db_regular)
-    db.commit()
-    db.refresh(db_regular)
-    return db_regular
+    return writer.execute(db, _insert, models.RegularTransaction, regular.model_dump())
 
 
 def update_regular_transaction(
@@ -235,28 +691,77 @@ def update_regular_transaction(
     regular: schemas.RegularTransactionUpdate
 ) -> Optional[models.RegularTransaction]:
     """정기 거래 수정"""
-    db_regular = get_regular_transaction(db, regular_id)
-    if not db_regular:
-        return None
-    
-    update_data = regular.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_regular, key, value)
-    
-    db.commit()
-    db.refresh(db_regular)
-    return db_regular
+    return writer.execute(
+        db, _update, models.RegularTransaction, regular_id, regular.model_dump(exclude_unset=True)
+    )
 
 
 def delete_regular_transaction(db: Session, regular_id: int) -> bool:
     """정기 거래 삭제"""
-    db_regular = get_regular_transaction(db, regular_id)
-    if not db_regular:
-        return False
-    
-    db.delete(db_regular)
-    db.commit()
-    return True
+    return writer.execute(db, _delete, models.RegularTransaction, regular_id)
+
+
+# Recurring Candidate CRUD
+def get_recurring_candidates(db: Session, min_confidence: float = 0) -> List[models.RecurringCandidate]:
+    """정기 거래 후보 조회 (신뢰도 높은 순)"""
+    return db.query(models.RecurringCandidate).filter(
+        models.RecurringCandidate.confidence >= min_confidence
+    ).order_by(models.RecurringCandidate.confidence.desc(), models.RecurringCandidate.id).all()
+
+
+def _replace_recurring_candidates(session: Session, merchants: Optional[List[str]], rows: List[dict]) -> int:
+    # (사용처, 타입)이 같은 후보는 갱신해 id를 유지하고, 더 이상 감지되지 않는 후보만 삭제
+    table = models.RecurringCandidate
+    existing = session.query(table.id, table.merchant, table.type)
+    if merchants is not None:
+        existing = existing.filter(table.merchant.in_(merchants))
+    detected = {(row["merchant"], row["type"]) for row in rows}
+    stale = [id for id, merchant, type in existing if (merchant, type) not in detected]
+    if stale:
+        session.execute(delete(table).where(table.id.in_(stale)))
+    if rows:
+        stmt = sqlite_insert(table)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=["merchant", "type"],
+            set_={
+                **{key: stmt.excluded[key] for key in rows[0] if key not in ("merchant", "type")},
+                "updated_at": func.now(),
+            }
+        ), rows)
+    return len(rows)
+
+
+def replace_recurring_candidates(db: Session, merchants: Optional[List[str]], rows: List[dict]) -> int:
+    """merchants 사용처의 후보를 rows로 교체 (merchants가 None이면 전체 교체), 저장 건수 반환"""
+    return writer.execute(db, _replace_recurring_candidates, merchants, rows)
+
+
+def _accept_recurring_candidate(session: Session, candidate_id: int):
+    candidate = session.get(models.RecurringCandidate, candidate_id)
+    if not candidate:
+        return None
+    regular = _insert(session, models.RegularTransaction, {
+        "description": candidate.description,
+        "amount": candidate.amount,
+        "category": candidate.category,
+        "type": candidate.type,
+        "frequency_type": candidate.frequency_type,
+        "day_of_month": candidate.day_of_month,
+        "start_date": candidate.first_date,
+    })
+    session.delete(candidate)
+    session.flush()
+    return regular
+
+
+def accept_recurring_candidate(db: Session, candidate_id: int) -> Optional[models.RegularTransaction]:
+    """후보를 정기 거래로 등록하고 후보 목록에서 삭제"""
+    return writer.execute(db, _accept_recurring_candidate, candidate_id)
+
+
+def delete_recurring_candidate(db: Session, candidate_id: int) -> bool:
+    """정기 거래 후보 삭제"""
+    return writer.execute(db, _delete, models.RecurringCandidate, candidate_id)
 
 
 # Asset Goal CRUD
@@ -279,11 +784,7 @@ def create_asset_goal(
     goal: schemas.AssetGoalCreate
 ) -> models.AssetGoal:
     """자산 목표 생성"""
-    db_goal = models.AssetGoal(**goal.model_dump())
-    db.add(db_goal)
-    db.commit()
-    db.refresh(db_goal)
-    return db_goal
+    return writer.execute(db, _insert, models.AssetGoal, goal.model_dump())
 
 
 def update_asset_goal(
@@ -292,25 +793,82 @@ def update_asset_goal(
     goal: schemas.AssetGoalUpdate
 ) -> Optional[models.AssetGoal]:
     """자산 목표 수정"""
-    db_goal = get_asset_goal(db, goal_id)
-    if not db_goal:
-        return None
-    
-    update_data = goal.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_goal, key, value)
-    
-    db.commit()
-    db.refresh(db_goal)
-    return db_goal
+    return writer.execute(
+        db, _update, models.AssetGoal, goal_id, goal.model_dump(exclude_unset=True)
+    )
 
 
 def delete_asset_goal(db: Session, goal_id: int) -> bool:
     """자산 목표 삭제"""
-    db_goal = get_asset_goal(db, goal_id)
-    if not db_goal:
-        return False
-    
-    db.delete(db_goal)
-    db.commit()
-    return True
+    return writer.execute(db, _delete, models.AssetGoal, goal_id)
+
+
+def analyze_asset_goal(db: Session, goal: models.AssetGoal) -> schemas.SimulationResult:
+    """자산 목표 달성 가능성 분석 (정기 거래의 월 순수익으로 목표일까지 잔액 예측)"""
+    # 정기 거래 목록 가져오기
+    regulars = get_regular_transactions(db, limit=1000)
+
+    # 시뮬레이션 설정
+    current_date = datetime.now()
+    target_date = goal.target_date
+    current_amount = goal.current_amount
+
+    # 목표 달성까지 남은 개월 수 계산
+    diff = relativedelta(target_date, current_date)
+    months_remaining = diff.years * 12 + diff.months
+    if months_remaining < 1:
+        months_remaining = 1
+
+    monthly_data = []
+    simulated_amount = current_amount
+
+    # 월별 순수익(정기 수입 - 정기 지출) 계산
+    monthly_income = sum(r.amount for r in regulars if r.type == models.TransactionType.INCOME)
+    monthly_expense = sum(r.amount for r in regulars if r.type == models.TransactionType.EXPENSE)
+    monthly_net = monthly_income - monthly_expense
+
+    # 시뮬레이션 실행
+    for i in range(months_remaining + 1):
+        future_date = current_date + relativedelta(months=i)
+        date_str = future_date.strftime("%Y-%m")
+
+        monthly_data.append({
+            "date": date_str,
+            "projected_amount": simulated_amount,
+            "target_line": goal.target_amount  # 그래프 비교용
+        })
+
+        simulated_amount += monthly_net
+
+    # 결과 분석
+    final_amount = monthly_data[-1]["projected_amount"]
+    is_achievable = final_amount >= goal.target_amount
+    shortfall = goal.target_amount - final_amount
+
+    monthly_saving_needed = 0
+    if shortfall > 0:
+        monthly_saving_needed = shortfall / months_remaining
+
+    return schemas.SimulationResult(
+        monthly_data=monthly_data,
+        final_amount=final_amount,
+        is_achievable=is_achievable,
+        shortfall=shortfall,
+        monthly_saving_needed=monthly_saving_needed
+    )
+
+
+# Import Job CRUD
+def get_import_job(db: Session, job_id: str) -> Optional[models.ImportJob]:
+    """임포트 작업 조회"""
+    return db.query(models.ImportJob).filter(models.ImportJob.id == job_id).first()
+
+
+def create_import_job(db: Session, job_id: str, filename: str) -> models.ImportJob:
+    """임포트 작업 생성 (대기 상태)"""
+    return writer.execute(db, _insert, models.ImportJob, {"id": job_id, "filename": filename})
+
+
+def update_import_job(db: Session, job_id: str, **fields) -> Optional[models.ImportJob]:
+    """임포트 작업 상태/진행률 갱신"""
+    return writer.execute(db, _update, models.ImportJob, job_id, fields)
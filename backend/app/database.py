@@ -1,21 +1,112 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from . import config
+from .core import metrics, profiler, tenants
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./backend/finance.db"
+SQLALCHEMY_DATABASE_URL = config.DATABASE_URL
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
+
+# 요청별 DB 시간 계측 및 쿼리 프로파일링
+metrics.instrument_engine(engine)
+profiler.install(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
-def get_db():
-    """데이터베이스 세션 생성"""
+# 거래 설명/메모 전문 검색용 FTS5 인덱스 (trigram 토크나이저로 부분 문자열 검색 지원)
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        description, note,
+        content='transactions', content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, description, note)
+        VALUES (new.id, new.description, new.note);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, note)
+        VALUES ('delete', old.id, old.description, old.note);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF description, note ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, note)
+        VALUES ('delete', old.id, old.description, old.note);
+        INSERT INTO transactions_fts(rowid, description, note)
+        VALUES (new.id, new.description, new.note);
+    END
+    """,
+]
+
+
+def create_search_index(bind=engine):
+    """전문 검색 인덱스 및 동기화 트리거 생성 (최초 생성 시 기존 데이터 색인)
+
+    여러 워커가 동시에 실행해도 DDL은 IF NOT EXISTS, 재색인(rebuild)은 멱등이라 안전하다.
+    트리거는 테이블 재생성(마이그레이션) 후에도 복구되도록 매번 확인한다.
+    """
+    with bind.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions_fts'")
+        ).first()
+        for ddl in SEARCH_INDEX_DDL:
+            conn.execute(text(ddl))
+        if not exists:
+            conn.execute(text("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')"))
+
+
+def init_db(bind=engine):
+    """스키마 생성 및 보조 인덱스/트리거 설정 (앱 시작 시 lifespan에서 실행)"""
+    # models가 Base에 테이블을 등록하고, core 모듈/migrations는 이 모듈을 임포트하므로 함수 안에서 임포트
+    from . import migrations, models  # noqa: F401
+    from .core import anomalies, archive, daily_index, reports, snapshot, sync
+
+    migrations.run_migrations(bind)
+    Base.metadata.create_all(bind=bind)
+    create_search_index(bind)
+    snapshot.create_snapshot_tracking(bind)
+    reports.create_version_tracking(bind)
+    anomalies.create_anomaly_tracking(bind)
+    daily_index.create_daily_index(bind)
+    archive.create_archive_registry(bind)
+    sync.create_change_log(bind)
+
+
+@contextmanager
+def open_session(tenant: Optional[str] = None) -> Iterator[Session]:
+    """tenant(없으면 기본 데이터베이스) 세션 (테넌트 엔진은 세션이 열려 있는 동안 캐시에서 내보내지지 않음)
+
+    요청이 끝난 뒤에도 실행되는 작업은 요청의 엔진 대신 테넌트 키를 받아 이 세션을 연다.
+    """
+    if tenant:
+        with tenants.session(tenant) as db:
+            yield db
+        return
+
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_db(request: Request):
+    """데이터베이스 세션 생성 (멀티 테넌트 모드에서는 요청한 테넌트의 데이터베이스)"""
+    with open_session(tenants.tenant_key(request) if tenants.is_enabled() else None) as db:
+        yield db
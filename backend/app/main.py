@@ -1,16 +1,35 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
-from .api import transactions, plans, excel, regular, simulation, tax
+from fastapi.responses import PlainTextResponse
+from .database import init_db
+from .api import transactions, plans, excel, regular, simulation, tax, admin, sync
+from .core import backup, compression, jobs, metrics, profiler, tenants, warmup, writer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작 시 데이터베이스 스키마 준비 (임포트만으로는 DB에 접근하지 않음), 종료 시 작업/쓰기 정리"""
+    init_db()
+    backup.start_scheduler()
+    # 캐시 예열은 백그라운드에서 요청이 없을 때만 진행 (기다리지 않고 바로 요청을 받음)
+    warmup.start()
+    yield
+    await warmup.shutdown()
+    # 진행 중인 백업을 먼저 취소해야 작업 풀 종료가 백업 완료를 기다리지 않음
+    backup.shutdown()
+    jobs.shutdown()
+    writer.shutdown()
+    tenants.shutdown()
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Finance Manager API",
     description="1년 재무 계획 관리 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
+app.router.route_class = metrics.TimedRoute
 
 # CORS 설정 (프론트엔드와 통신을 위해)
 app.add_middleware(
@@ -21,6 +40,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청별 SQL 쿼리 프로파일링 (TimingMiddleware 안쪽에서 실행)
+app.add_middleware(profiler.QueryProfilerMiddleware)
+
+# Accept-Encoding에 맞춘 응답 압축 (압축 시간까지 TimingMiddleware가 측정)
+app.add_middleware(compression.CompressionMiddleware)
+
+# 요청 단계별 시간 측정 (Server-Timing 헤더, /metrics 집계)
+app.add_middleware(metrics.TimingMiddleware)
+
 # API 라우터 등록
 app.include_router(transactions.router)
 app.include_router(plans.router)
@@ -28,6 +56,8 @@ app.include_router(excel.router)
 app.include_router(regular.router)
 app.include_router(simulation.router)
 app.include_router(tax.router)
+app.include_router(admin.router)
+app.include_router(sync.router)
 
 
 @app.get("/")
@@ -44,3 +74,12 @@ def read_root():
 def health_check():
     """헬스 체크"""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """라우트별 요청 수/지연 시간 (Prometheus 텍스트 형식)"""
+    return PlainTextResponse(
+        metrics.registry.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,171 @@
+"""
+데이터 마이그레이션
+
+init_db()가 create_all 전에 실행한다. 각 마이그레이션은 현재 스키마를 보고 필요할 때만 적용되며,
+BEGIN IMMEDIATE 트랜잭션 안에서 실행되므로 여러 워커가 동시에 시작해도 한 번만 적용된다.
+"""
+from sqlalchemy import insert, text
+
+from . import models
+from .database import Base
+
+
+def _columns(conn, table_name: str):
+    return {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table_name})")}
+
+
+def _migrate_transactions_v2(conn):
+    """거래 금액 REAL -> 원 단위 INTEGER, 카테고리 문자열 -> categories.id, 타입/상태 이름 -> 정수 코드
+
+    기존 테이블을 transactions_v1로 바꾼 뒤 새 스키마로 만들고 id를 유지한 채 복사한다.
+    FTS 색인(content_rowid=id)은 description/note가 그대로라 재색인하지 않으며,
+    기존 테이블과 함께 삭제된 트리거는 init_db가 다시 만든다.
+    """
+    columns = _columns(conn, "transactions")
+    if "category" not in columns or "category_id" in columns:
+        return False
+
+    conn.exec_driver_sql("ALTER TABLE transactions RENAME TO transactions_v1")
+    for index in ("ix_transactions_id", "ix_transactions_date", "ix_transactions_category"):
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index}")
+    Base.metadata.create_all(
+        bind=conn, tables=[models.Category.__table__, models.Transaction.__table__]
+    )
+
+    type_codes = " ".join(
+        f"WHEN '{member.name}' THEN {code}" for member, code in models.TRANSACTION_TYPE_CODES.items()
+    )
+    status_codes = " ".join(
+        f"WHEN '{member.name}' THEN {code}" for member, code in models.TRANSACTION_STATUS_CODES.items()
+    )
+    conn.execute(text(
+        "INSERT OR IGNORE INTO categories (name) "
+        "SELECT DISTINCT category FROM transactions_v1 WHERE category IS NOT NULL ORDER BY category"
+    ))
+    conn.execute(text(f"""
+        INSERT INTO transactions
+            (id, date, description, amount, category_id, type, note, status, created_at, updated_at)
+        SELECT t.id, t.date, t.description, CAST(round(t.amount) AS INTEGER), c.id,
+               CASE upper(t.type) {type_codes} END,
+               t.note,
+               CASE upper(t.status) {status_codes} END,
+               t.created_at, t.updated_at
+        FROM transactions_v1 t
+        LEFT JOIN categories c ON c.name = t.category
+    """))
+    conn.exec_driver_sql("DROP TABLE transactions_v1")
+    return True
+
+
+def _add_import_jobs_rows_duplicate(conn):
+    """import_jobs.rows_duplicate 컬럼 추가 (여러 파일 임포트의 중복 제거 건수)"""
+    columns = _columns(conn, "import_jobs")
+    if not columns or "rows_duplicate" in columns:
+        return False
+    conn.exec_driver_sql("ALTER TABLE import_jobs ADD COLUMN rows_duplicate INTEGER NOT NULL DEFAULT 0")
+    return True
+
+
+def _transactions_autoincrement(conn):
+    """transactions.id를 AUTOINCREMENT로 (보관 연도로 옮겨 삭제된 id가 새 거래에 다시 쓰이지 않도록)
+
+    기존 테이블을 transactions_v2로 바꾼 뒤 새 스키마로 만들고 id를 유지한 채 복사한다.
+    sqlite_sequence는 복사한 최대 id에서 시작하며, 삭제된 트리거는 init_db가 다시 만든다.
+    """
+    sql = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'transactions'")
+    ).scalar()
+    if sql is None or "AUTOINCREMENT" in sql.upper():
+        return False
+
+    conn.exec_driver_sql("ALTER TABLE transactions RENAME TO transactions_v2")
+    for index in ("ix_transactions_id", "ix_transactions_date", "ix_transactions_category_id"):
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index}")
+    Base.metadata.create_all(bind=conn, tables=[models.Transaction.__table__])
+
+    columns = ", ".join(column.name for column in models.Transaction.__table__.columns)
+    conn.exec_driver_sql(f"INSERT INTO transactions ({columns}) SELECT {columns} FROM transactions_v2")
+    conn.exec_driver_sql("DROP TABLE transactions_v2")
+    return True
+
+
+def _budget_plans_unique_period(conn):
+    """budget_plans의 (연, 월, 카테고리) 중복을 정리하고 유니크 인덱스 추가
+
+    중복된 계획은 가장 최근에 수정된 것 하나만 남긴다 (새로 만든 테이블은 모델의 UniqueConstraint로 생성됨).
+    """
+    if not _columns(conn, "budget_plans"):
+        return False
+    key = ["year", "month", "category"]
+    for row in conn.exec_driver_sql("PRAGMA index_list(budget_plans)").all():
+        name, unique = row[1], row[2]
+        if unique and [r[2] for r in conn.exec_driver_sql(f"PRAGMA index_info({name})")] == key:
+            return False
+
+    conn.exec_driver_sql("""
+        DELETE FROM budget_plans WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY year, month, category ORDER BY updated_at DESC, id DESC
+                ) AS rank
+                FROM budget_plans
+            ) WHERE rank > 1
+        )
+    """)
+    conn.exec_driver_sql(
+        "CREATE UNIQUE INDEX uq_budget_plans_year_month_category ON budget_plans (year, month, category)"
+    )
+    return True
+
+
+def _transaction_merchants(conn):
+    """transaction_merchants 테이블을 만들고 기존 거래 설명의 사용처 이름을 채움
+
+    이후 저장되는 거래는 crud가 같은 트랜잭션에서 기록한다 (models.register_merchants).
+    """
+    if _columns(conn, "transaction_merchants"):
+        return False
+    Base.metadata.create_all(bind=conn, tables=[models.TransactionMerchant.__table__])
+    descriptions = conn.execute(text("SELECT DISTINCT description FROM transactions")).scalars().all()
+    if descriptions:
+        conn.execute(insert(models.TransactionMerchant), [
+            {"description": d, "merchant": models.normalize_merchant(d)} for d in descriptions
+        ])
+    return True
+
+
+MIGRATIONS = [
+    _migrate_transactions_v2,
+    _add_import_jobs_rows_duplicate,
+    _transactions_autoincrement,
+    _budget_plans_unique_period,
+    _transaction_merchants,
+]
+
+
+def run_migrations(bind) -> list:
+    """대기 중인 마이그레이션을 하나의 트랜잭션으로 적용하고 적용된 이름 목록 반환"""
+    with bind.connect() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions'")
+        ).first()
+        conn.rollback()
+        if not exists:
+            return []
+
+        # pysqlite는 DDL 앞에서 트랜잭션을 열지 않으므로 직접 BEGIN (스키마 변경까지 원자적으로 적용)
+        dbapi_conn = conn.connection.driver_connection
+        isolation_level = dbapi_conn.isolation_level
+        dbapi_conn.isolation_level = None
+        try:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                applied = [m.__name__.lstrip("_") for m in MIGRATIONS if m(conn)]
+            except Exception:
+                conn.exec_driver_sql("ROLLBACK")
+                raise
+            conn.exec_driver_sql("COMMIT")
+        finally:
+            conn.rollback()
+            dbapi_conn.isolation_level = isolation_level
+        return applied
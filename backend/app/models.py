@@ -1,6 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum
+from sqlalchemy import (
+    Boolean, Column, Integer, SmallInteger, String, Float, DateTime, Enum, ForeignKey, UniqueConstraint, event
+)
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session, attributes, relationship
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.sql import func
 import enum
+import re
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable
 from .database import Base
 
 
@@ -16,25 +24,155 @@ class TransactionStatus(str, enum.Enum):
     CANCELLED = "cancelled"
 
 
+# 저장용 정수 코드 (값을 바꾸면 기존 데이터와 맞지 않으므로 추가만 할 것)
+TRANSACTION_TYPE_CODES = {TransactionType.INCOME: 1, TransactionType.EXPENSE: 2}
+TRANSACTION_STATUS_CODES = {TransactionStatus.COMPLETED: 1, TransactionStatus.CANCELLED: 2}
+
+
+class CodedEnum(TypeDecorator):
+    """Enum을 SMALLINT 코드로 저장하는 컬럼 타입"""
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class, codes):
+        super().__init__()
+        self.enum_class = enum_class
+        self.codes = tuple(codes.items())
+        self._to_code = dict(self.codes)
+        self._to_member = {code: member for member, code in self.codes}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self._to_code[self.enum_class(value)]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._to_member[value]
+
+
+class Won(TypeDecorator):
+    """원 단위 정수 금액 (API에는 float로 노출되며 저장 시 반올림)"""
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        # SQLite round()와 같이 0.5는 0에서 먼 쪽으로 (파이썬 round()는 짝수 쪽이라 마이그레이션 결과와 달라짐)
+        return int(Decimal(str(value)).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+class Category(Base):
+    """카테고리 사전 (거래는 정수 id로 참조)"""
+    __tablename__ = "categories"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+
+
 class Transaction(Base):
-    """거래 내역 모델"""
+    """거래 내역 모델
+
+    category는 문자열 속성으로 읽고 쓰지만 저장은 categories.id 참조로 하며,
+    새 이름은 flush 직전에 사전에 등록된다 (_resolve_categories).
+    """
     __tablename__ = "transactions"
+    # 보관 연도로 옮긴 거래의 id가 새 거래에 다시 쓰이지 않도록 (core.archive 참고)
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
     date = Column(DateTime, nullable=False, index=True)
     description = Column(String, nullable=False)
-    amount = Column(Float, nullable=False)
-    category = Column(String, nullable=True, index=True)
-    type = Column(Enum(TransactionType), nullable=False)
+    amount = Column(Won, nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True, index=True)
+    type = Column(CodedEnum(TransactionType, TRANSACTION_TYPE_CODES), nullable=False)
     note = Column(String, nullable=True)
-    status = Column(Enum(TransactionStatus), default=TransactionStatus.COMPLETED)
+    status = Column(CodedEnum(TransactionStatus, TRANSACTION_STATUS_CODES), default=TransactionStatus.COMPLETED)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+    category_ref = relationship(Category, lazy="joined")
+
+    @property
+    def category(self):
+        pending = self.__dict__.get("_pending_category")
+        if pending is not None:
+            return pending
+        return self.category_ref.name if self.category_ref is not None else None
+
+    @category.setter
+    def category(self, name):
+        if name is None:
+            self.__dict__.pop("_pending_category", None)
+            self.category_ref = None
+        else:
+            self.__dict__["_pending_category"] = name
+            attributes.flag_dirty(self)
+
+
+def get_or_create_category(session: Session, name: str) -> Category:
+    """이름으로 카테고리 조회, 없으면 추가 (세션 단위 캐시, 동시 추가에도 안전)"""
+    cache = session.info.setdefault("category_cache", {})
+    category = cache.get(name)
+    if category is None:
+        with session.no_autoflush:
+            session.execute(
+                insert(Category).values(name=name).on_conflict_do_nothing(index_elements=["name"])
+            )
+            category = session.query(Category).filter(Category.name == name).one()
+        cache[name] = category
+    return category
+
+
+@event.listens_for(Session, "before_flush")
+def _resolve_categories(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Transaction):
+            name = obj.__dict__.pop("_pending_category", None)
+            if name is not None:
+                obj.category_ref = get_or_create_category(session, name)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_category_cache(session, previous_transaction):
+    # 롤백된 INSERT로 만든 카테고리가 캐시에 남지 않도록 비움 (SAVEPOINT 롤백 포함)
+    session.info.pop("category_cache", None)
+
+
+_NON_NAME = re.compile(r"[\d\W_]+")
+
+
+def normalize_merchant(description) -> str:
+    """사용처 비교용 이름 (숫자/기호/공백 제거, 소문자)"""
+    return _NON_NAME.sub("", str(description)).lower()
+
+
+class TransactionMerchant(Base):
+    """거래 설명별 정규화한 사용처 이름 (정기 거래 증분 감지가 사용처로 설명을 찾을 때 사용, core.recurring 참고)
+
+    거래를 저장/수정할 때 register_merchants()로 채우며, 거래가 삭제되어도 남는다
+    (설명으로 다시 거래를 조회하므로 남은 행은 결과에 영향 없음).
+    """
+    __tablename__ = "transaction_merchants"
+
+    description = Column(String, primary_key=True)
+    merchant = Column(String, nullable=False, index=True)
+
+
+def register_merchants(session: Session, descriptions: Iterable[str]):
+    """처음 보는 거래 설명의 사용처 이름 저장 (이미 있는 설명은 무시)"""
+    rows = [{"description": d, "merchant": normalize_merchant(d)} for d in set(descriptions)]
+    if rows:
+        session.execute(insert(TransactionMerchant).on_conflict_do_nothing(), rows)
+
 
 class BudgetPlan(Base):
     """재무 계획 모델"""
     __tablename__ = "budget_plans"
+    # 연-월-카테고리당 계획 하나 (일괄 계획은 이 키로 upsert)
+    __table_args__ = (UniqueConstraint("year", "month", "category"),)
 
     id = Column(Integer, primary_key=True, index=True)
     year = Column(Integer, nullable=False, index=True)
@@ -70,6 +208,26 @@ class RegularTransaction(Base):
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
 
+class RecurringCandidate(Base):
+    """거래 내역에서 감지한 정기 거래 후보 (core.recurring 참고)"""
+    __tablename__ = "recurring_candidates"
+    __table_args__ = (UniqueConstraint("merchant", "type"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    merchant = Column(String, nullable=False)  # 정규화한 사용처 이름
+    description = Column(String, nullable=False)  # 가장 최근 거래의 원래 설명
+    amount = Column(Float, nullable=False)  # 금액 중앙값
+    category = Column(String, nullable=True)
+    type = Column(Enum(TransactionType), nullable=False)
+    frequency_type = Column(Enum(FrequencyType), nullable=False)
+    day_of_month = Column(Integer, nullable=True)
+    occurrences = Column(Integer, nullable=False)
+    confidence = Column(Float, nullable=False)  # 0~1 (주기 규칙성 x 금액 안정성 x 표본 수)
+    first_date = Column(DateTime, nullable=False)
+    last_date = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
 class AssetGoal(Base):
     """자산 목표 모델"""
     __tablename__ = "asset_goals"
@@ -82,3 +240,40 @@ class AssetGoal(Base):
     description = Column(String, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class ChangeLog(Base):
+    """증분 동기화용 변경 기록 (행마다 마지막 변경 하나만 유지, core.sync 참고)"""
+    __tablename__ = "change_log"
+    __table_args__ = (UniqueConstraint("entity", "entity_id"), {"sqlite_autoincrement": True})
+
+    seq = Column(Integer, primary_key=True)  # 단조 증가 (AUTOINCREMENT라 지워진 번호도 다시 쓰지 않음)
+    entity = Column(String, nullable=False)  # 테이블 이름
+    entity_id = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)  # 삭제 표시 (tombstone)
+
+
+class JobStatus(str, enum.Enum):
+    """백그라운드 작업 상태"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ImportJob(Base):
+    """파일 임포트 작업 모델 (진행률 포함)"""
+    __tablename__ = "import_jobs"
+
+    id = Column(String, primary_key=True)
+    filename = Column(String, nullable=False)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    rows_total = Column(Integer, nullable=True)
+    rows_parsed = Column(Integer, nullable=False, default=0)
+    rows_inserted = Column(Integer, nullable=False, default=0)
+    rows_failed = Column(Integer, nullable=False, default=0)
+    rows_duplicate = Column(Integer, nullable=False, default=0, server_default="0")  # 여러 파일 간 중복 제거 건수
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
-from datetime import datetime
-from typing import Optional
-from .models import TransactionType, TransactionStatus
+from datetime import date, datetime
+from typing import Annotated, Dict, List, Optional
+from .models import TransactionType, TransactionStatus, JobStatus
 
 
 # Transaction Schemas
@@ -76,6 +76,26 @@ class BudgetPlanResponse(BudgetPlanBase):
         from_attributes = True
 
 
+PlanMonth = Annotated[int, Field(ge=1, le=12)]
+
+
+class BudgetPlanRollover(BaseModel):
+    """템플릿 월의 계획을 한 해의 여러 달로 복사하는 스키마 (금액은 scale배)"""
+    template_year: int = Field(..., ge=2000, le=2100)
+    template_month: int = Field(..., ge=1, le=12)
+    year: int = Field(..., ge=2000, le=2100)
+    months: List[PlanMonth] = Field(default_factory=lambda: list(range(1, 13)), min_length=1)
+    scale: float = Field(1.0, ge=0)
+
+
+class BudgetPlanFromHistory(BaseModel):
+    """최근 lookback_months개월의 카테고리별 월평균 지출로 한 해 계획을 만드는 스키마"""
+    year: int = Field(..., ge=2000, le=2100)
+    months: List[PlanMonth] = Field(default_factory=lambda: list(range(1, 13)), min_length=1)
+    lookback_months: int = Field(12, ge=1, le=120)
+    scale: float = Field(1.0, ge=0)
+
+
 # Statistics Schemas
 class MonthlyStats(BaseModel):
     """월별 통계 스키마"""
@@ -95,6 +115,68 @@ class CategoryStats(BaseModel):
     percentage: float
 
 
+class BalancePoint(BaseModel):
+    """잔액 시계열의 한 구간 (일: YYYY-MM-DD, 월: YYYY-MM)"""
+    period: str
+    income: float
+    expense: float
+    net: float
+    balance: float
+
+
+class BalanceSeries(BaseModel):
+    """누적 잔액 시계열 스키마"""
+    interval: str
+    opening_balance: float  # 첫 구간 이전 잔액 (기초 잔액 + start_date 이전 거래 순액)
+    closing_balance: float
+    points: List[BalancePoint]
+
+
+class RangeStats(BaseModel):
+    """임의 기간(start_date ~ end_date, 양끝 포함) 통계 스키마"""
+    start_date: date
+    end_date: date
+    total_income: float
+    total_expense: float
+    net_amount: float
+    transaction_count: int
+    income: List[CategoryStats]
+    expense: List[CategoryStats]
+
+
+class SpendingStats(BaseModel):
+    """카테고리별 지출 통계 (누적 + 최근 window_months개월)"""
+    category: Optional[str] = None
+    count: int
+    mean: float
+    std: float
+    window_months: int
+    window_count: int
+    window_total: float
+    window_mean: float
+
+
+class SpendingAnomaly(BaseModel):
+    """지출 이상치 (감지 시점의 카테고리 평균/표준편차 기준)"""
+    transaction_id: int
+    date: datetime
+    description: str
+    category: Optional[str] = None
+    amount: float
+    mean: float
+    std: float
+    z_score: float
+    detected_at: datetime
+
+
+class TransactionArchiveResponse(BaseModel):
+    """보관된 연도 (읽기 전용 보관 파일로 옮긴 거래)"""
+    year: int
+    path: str
+    row_count: int
+    archived_at: datetime
+
+
 # Regular Transaction Schemas
 from .models import FrequencyType
 
@@ -137,6 +219,25 @@ class RegularTransactionResponse(RegularTransactionBase):
         from_attributes = True
 
 
+class RecurringCandidateResponse(BaseModel):
+    """정기 거래 후보 응답 스키마"""
+    id: int
+    merchant: str
+    description: str
+    amount: float
+    category: Optional[str] = None
+    type: TransactionType
+    frequency_type: FrequencyType
+    day_of_month: Optional[int] = None
+    occurrences: int
+    confidence: float
+    first_date: datetime
+    last_date: datetime
+
+    class Config:
+        from_attributes = True
+
+
 # Asset Goal Schemas
 class AssetGoalBase(BaseModel):
     """자산 목표 기본 스키마"""
@@ -179,3 +280,69 @@ class SimulationResult(BaseModel):
     is_achievable: bool
     shortfall: float  # 부족액 (초과 시 0 또는 음수)
     monthly_saving_needed: float  # 목표 달성을 위해 매월 필요한 추가 저축액
+
+
+# Import Job Schemas
+class ImportJobResponse(BaseModel):
+    """파일 임포트 작업 응답 스키마"""
+    id: str
+    filename: str
+    status: JobStatus
+    rows_total: Optional[int] = None
+    rows_parsed: int
+    rows_inserted: int
+    rows_failed: int
+    rows_duplicate: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+# Sync Schemas
+class SyncResponse(BaseModel):
+    """증분 동기화 응답 (seq를 다음 요청의 since로 사용, has_more면 이어서 요청)"""
+    seq: int
+    has_more: bool
+    transactions: List[TransactionResponse] = []
+    budget_plans: List[BudgetPlanResponse] = []
+    regular_transactions: List[RegularTransactionResponse] = []
+    deleted: Dict[str, List[int]] = {}  # 테이블 이름 -> 삭제된 id
+
+
+# Backup Schemas
+class BackupResult(BaseModel):
+    """백업 결과 (소요 시간/처리량과 서비스 영향 포함)"""
+    path: str
+    tenant: Optional[str] = None
+    size: int  # bytes
+    pages: int
+    steps: int
+    restarts: int  # 다른 연결의 쓰기로 백업이 처음부터 다시 시작된 횟수
+    write_pause_ms: float  # 남은 페이지를 한 번에 복사하느라 쓰기를 멈춘 시간
+    duration_ms: float
+    throughput_mb_s: float
+    created_at: datetime
+
+
+class BackupStatus(BaseModel):
+    """진행 중인 백업의 진행률과 마지막 백업 결과"""
+    running: bool
+    tenant: Optional[str] = None
+    pages_done: int = 0
+    pages_total: int = 0
+    restarts: int = 0
+    started_at: Optional[datetime] = None
+    last: Optional[BackupResult] = None
+    error: Optional[str] = None
+
+
+class BackupFile(BaseModel):
+    """저장된 백업 파일"""
+    name: str
+    path: str
+    size: int
+    created_at: datetime
@@ -0,0 +1,240 @@
+"""
+합성 데이터 생성기
+
+카카오페이 내보내기 형식(날짜, 사용처, 금액, 상태)의 CSV/XLSX 파일을 만들고,
+지정한 규모로 finance.db를 채운다 (거래 + 정기 거래 + 재무 계획 + 자산 목표).
+
+예시:
+    python -m backend.benchmarks.generate --scale 10k --db sqlite:///./bench/finance.db
+    python -m backend.benchmarks.generate --rows 5000 --csv bench/kakaopay.csv --xlsx bench/kakaopay.xlsx
+"""
+import argparse
+import csv
+import os
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+
+import numpy as np
+from sqlalchemy import create_engine
+
+from ..app import models
+from ..app.api.excel import categorize_transaction
+from ..app.database import Base, init_db
+
+SCALES = {
+    "10k": 10_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+# (사용처, 수입 여부, 금액 로그정규 중앙값(원), 로그 표준편차, 출현 가중치)
+MERCHANTS = [
+    ("이마트", False, 45000, 0.6, 6),
+    ("GS25 편의점", False, 6000, 0.5, 12),
+    ("스팟마트", False, 4000, 0.5, 8),
+    ("BHC치킨", False, 22000, 0.3, 3),
+    ("맥도날드", False, 9000, 0.3, 5),
+    ("배달음식 주문", False, 25000, 0.4, 6),
+    ("스타벅스", False, 6000, 0.3, 10),
+    ("쿠팡", False, 35000, 0.9, 8),
+    ("SK주유소", False, 60000, 0.3, 3),
+    ("한국도로공사", False, 3500, 0.4, 3),
+    ("Steam", False, 25000, 0.7, 1),
+    ("삼성카드", False, 800000, 0.5, 2),
+    ("저금통", False, 500, 0.8, 6),
+    ("삼성전자 주식", False, 300000, 1.0, 1),
+    ("월세", False, 650000, 0.05, 1),
+    ("주식회사 한빛", True, 3500000, 0.05, 1),
+    ("동전 모으기", True, 500, 0.8, 5),
+    ("국민은행 이자", True, 3000, 0.8, 1),
+    ("당근마켓", True, 20000, 0.8, 2),
+]
+
+CANCELLED_RATIO = 0.02
+CHUNK_SIZE = 50_000
+XLSX_MAX_ROWS = 1_048_575  # 헤더 제외 시트 최대 행 수
+
+CATEGORIES = [categorize_transaction(name) for name, *_ in MERCHANTS]
+
+
+def generate_chunks(
+    rows: int,
+    seed: int = 42,
+    end_date: datetime = None,
+    years: int = 3
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """(타임스탬프 초, 사용처 인덱스, 부호 있는 금액, 취소 여부) 배열을 CHUNK_SIZE 단위로 생성"""
+    rng = np.random.default_rng(seed)
+    end_date = end_date or datetime.now().replace(microsecond=0)
+    end_ts = int(end_date.timestamp())
+    span = int(timedelta(days=365 * years).total_seconds())
+
+    weights = np.array([m[4] for m in MERCHANTS], dtype=float)
+    weights /= weights.sum()
+    medians = np.log(np.array([m[2] for m in MERCHANTS], dtype=float))
+    sigmas = np.array([m[3] for m in MERCHANTS])
+    signs = np.where([m[1] for m in MERCHANTS], 1, -1)
+
+    remaining = rows
+    while remaining > 0:
+        size = min(CHUNK_SIZE, remaining)
+        timestamps = end_ts - rng.integers(0, span, size)
+        merchant_idx = rng.choice(len(MERCHANTS), size=size, p=weights)
+        amounts = np.maximum(
+            np.round(rng.lognormal(medians[merchant_idx], sigmas[merchant_idx]), -1), 10
+        ).astype(np.int64) * signs[merchant_idx]
+        cancelled = rng.random(size) < CANCELLED_RATIO
+        yield timestamps, merchant_idx, amounts, cancelled
+        remaining -= size
+
+
+def kakaopay_rows(rows: int, seed: int = 42) -> Iterator[List[str]]:
+    """카카오페이 내보내기 형식 행 (날짜 내림차순은 보장하지 않음)"""
+    for timestamps, merchant_idx, amounts, cancelled in generate_chunks(rows, seed):
+        for ts, idx, amount, is_cancelled in zip(timestamps.tolist(), merchant_idx.tolist(),
+                                                  amounts.tolist(), cancelled.tolist()):
+            yield [
+                datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S"),
+                MERCHANTS[idx][0],
+                f"{amount:+,}원",
+                "취소" if is_cancelled else "",
+            ]
+
+
+def write_kakaopay_csv(path: str, rows: int, seed: int = 42):
+    """카카오페이 CSV 파일 생성 (UTF-8 BOM 포함, 원본 내보내기와 동일)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["날짜", "사용처", "금액", "상태"])
+        writer.writerows(kakaopay_rows(rows, seed))
+
+
+def write_kakaopay_xlsx(path: str, rows: int, seed: int = 42):
+    """카카오페이 XLSX 파일 생성 (write-only 모드로 메모리 사용 제한)"""
+    from openpyxl import Workbook
+
+    if rows > XLSX_MAX_ROWS:
+        raise ValueError(f"XLSX supports at most {XLSX_MAX_ROWS} rows per sheet")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("카카오페이")
+    sheet.append(["날짜", "사용처", "금액", "상태"])
+    for row in kakaopay_rows(rows, seed):
+        sheet.append(row)
+    workbook.save(path)
+
+
+def seed_database(database_url: str, rows: int, seed: int = 42):
+    """거래 rows건과 정기 거래/재무 계획/자산 목표로 데이터베이스 채우기"""
+    bind = create_engine(database_url)
+    Base.metadata.create_all(bind=bind)
+
+    # transactions는 정수 코드/카테고리 id로 저장 (models.Transaction 참고), 정기 거래는 Enum 이름 그대로
+    income_code = models.TRANSACTION_TYPE_CODES[models.TransactionType.INCOME]
+    expense_code = models.TRANSACTION_TYPE_CODES[models.TransactionType.EXPENSE]
+    completed_code = models.TRANSACTION_STATUS_CODES[models.TransactionStatus.COMPLETED]
+    cancelled_code = models.TRANSACTION_STATUS_CODES[models.TransactionStatus.CANCELLED]
+    income, expense = models.TransactionType.INCOME.name, models.TransactionType.EXPENSE.name
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # 색인/스냅샷 트리거는 적재 후에 생성해 행 단위 트리거 비용을 피함
+    raw = bind.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.executemany(
+            "INSERT OR IGNORE INTO categories (name) VALUES (?)",
+            [(name,) for name in sorted(set(CATEGORIES))]
+        )
+        category_ids = dict(cursor.execute("SELECT name, id FROM categories").fetchall())
+        merchant_category_ids = [category_ids[name] for name in CATEGORIES]
+
+        for timestamps, merchant_idx, amounts, is_cancelled in generate_chunks(rows, seed):
+            cursor.executemany(
+                "INSERT INTO transactions "
+                "(date, description, amount, category_id, type, note, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S.%f"),
+                        MERCHANTS[idx][0],
+                        abs(amount),
+                        merchant_category_ids[idx],
+                        income_code if amount > 0 else expense_code,
+                        "Synthetic benchmark data",
+                        cancelled_code if c else completed_code,
+                        now,
+                        now,
+                    )
+                    for ts, idx, amount, c in zip(timestamps.tolist(), merchant_idx.tolist(),
+                                                  amounts.tolist(), is_cancelled.tolist())
+                ]
+            )
+            raw.commit()
+
+        current_year = datetime.now().year
+        cursor.executemany(
+            "INSERT INTO regular_transactions "
+            "(description, amount, category, type, frequency_type, day_of_month, start_date) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                ("주식회사 한빛", 3500000.0, "급여", income, "MONTHLY", 25, f"{current_year - 1}-01-01 00:00:00.000000"),
+                ("월세", 650000.0, "주거", expense, "MONTHLY", 1, f"{current_year - 1}-01-01 00:00:00.000000"),
+                ("넷플릭스", 17000.0, "엔터테인먼트", expense, "MONTHLY", 15, f"{current_year - 1}-03-01 00:00:00.000000"),
+                ("자동차 보험", 900000.0, "교통", expense, "YEARLY", 10, f"{current_year - 1}-06-10 00:00:00.000000"),
+                ("적금", 500000.0, "저축", expense, "MONTHLY", 26, f"{current_year}-01-01 00:00:00.000000"),
+            ]
+        )
+        cursor.executemany(
+            "INSERT INTO budget_plans (year, month, category, planned_amount) VALUES (?, ?, ?, ?)",
+            [
+                (current_year, month, category, amount)
+                for month in range(1, 13)
+                for category, amount in [("식비/생필품", 400000.0), ("외식", 300000.0),
+                                         ("교통", 150000.0), ("엔터테인먼트", 100000.0), ("기타", 500000.0)]
+            ]
+        )
+        cursor.executemany(
+            "INSERT INTO asset_goals (title, target_amount, target_date, current_amount) VALUES (?, ?, ?, ?)",
+            [
+                ("비상금", 10000000.0, f"{current_year + 1}-12-31 00:00:00.000000", 3000000.0),
+                ("전세 자금", 200000000.0, f"{current_year + 5}-06-30 00:00:00.000000", 40000000.0),
+            ]
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+    init_db(bind)
+    bind.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic KakaoPay data and seed finance.db")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--scale", choices=sorted(SCALES), help="preset transaction count")
+    size.add_argument("--rows", type=int, help="explicit transaction count")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", help="SQLAlchemy URL of the database to seed")
+    parser.add_argument("--csv", help="write a KakaoPay CSV file to this path")
+    parser.add_argument("--xlsx", help="write a KakaoPay XLSX file to this path")
+    args = parser.parse_args()
+
+    rows = args.rows or SCALES[args.scale or "10k"]
+    if not (args.db or args.csv or args.xlsx):
+        parser.error("at least one of --db, --csv, --xlsx is required")
+
+    if args.csv:
+        write_kakaopay_csv(args.csv, rows, args.seed)
+        print(f"Wrote {rows} rows to {args.csv}")
+    if args.xlsx:
+        write_kakaopay_xlsx(args.xlsx, rows, args.seed)
+        print(f"Wrote {rows} rows to {args.xlsx}")
+    if args.db:
+        seed_database(args.db, rows, args.seed)
+        print(f"Seeded {args.db} with {rows} transactions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""
+엔드투엔드 부하 테스트
+
+시드된 데이터베이스로 uvicorn 멀티 워커 서버를 띄우고, 프론트엔드(frontend/src/api/client.js)
+화면별 호출 패턴을 가중치에 따라 동시에 재생한다. 라우트별 p50/p95/p99 지연 시간,
+처리량, 오류율과 지연 히스토그램을 출력하며 SLO를 위반하면 실패(exit 1)한다.
+
+예시:
+    python -m backend.benchmarks.load --scale 10k --workers 4 --concurrency 16 --duration 30
+    python -m backend.benchmarks.load --mix mixed --slo slo.json --output load.json
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# 지연 히스토그램 버킷 상한 (ms)
+HISTOGRAM_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, float("inf")]
+
+# 화면(시나리오)별 가중치 - 시나리오 정의는 build_scenarios 참고
+MIXES = {
+    "dashboard": {
+        "dashboard": 50, "transaction_list": 25, "budget": 10, "regular": 5, "simulation": 10,
+    },
+    "mixed": {
+        "dashboard": 35, "transaction_list": 20, "transaction_filter": 5, "add_transaction": 10,
+        "budget": 8, "regular": 5, "simulation": 5, "tax": 5, "import": 2, "export": 5,
+    },
+}
+
+# 기본 SLO: default는 모든 라우트, routes는 라우트별 덮어쓰기
+DEFAULT_SLO = {
+    "default": {"p95_ms": 500, "p99_ms": 2000, "error_rate": 0.01},
+    "routes": {
+        "POST /api/excel/import": {"p95_ms": 10000, "p99_ms": 20000},
+        "GET /api/excel/export/transactions": {"p95_ms": 5000, "p99_ms": 10000},
+        "GET /api/excel/export/monthly-report": {"p95_ms": 2000, "p99_ms": 5000},
+    },
+}
+
+
+def multipart_body(field: str, filename: str, content: bytes, content_type: str) -> Tuple[bytes, str]:
+    """단일 파일 multipart/form-data 본문"""
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def build_scenarios(import_csv: bytes) -> Dict[str, list]:
+    """시나리오 이름 -> 요청 목록 [(method, path, route, body, content_type)]
+
+    route는 집계용 라벨(경로 파라미터 정규화), 요청 목록은 화면 한 번 로드 시 호출 순서와 같다.
+    """
+    now = datetime.now()
+    import_body, import_type = multipart_body("file", "kakaopay.csv", import_csv, "text/csv")
+    new_transaction = json.dumps({
+        "date": now.isoformat(timespec="seconds"),
+        "description": "부하 테스트",
+        "amount": 12000,
+        "category": "기타",
+        "type": "expense",
+    }).encode()
+
+    def get(path, route=None):
+        return ("GET", path, route or "GET " + path.split("?")[0], None, None)
+
+    return {
+        # Dashboard.jsx
+        "dashboard": [
+            get(f"/api/transactions/stats/monthly?year={now.year}&month={now.month}"),
+            get(f"/api/transactions/stats/category?year={now.year}&month={now.month}&type=income"),
+            get(f"/api/transactions/stats/category?year={now.year}&month={now.month}&type=expense"),
+        ],
+        # TransactionList.jsx
+        "transaction_list": [get("/api/transactions/")],
+        "transaction_filter": [get("/api/transactions/?type=expense&category=%EC%99%B8%EC%8B%9D")],
+        # TransactionForm.jsx 생성 후 TransactionList.jsx 삭제 ({id}는 생성 응답으로 치환)
+        "add_transaction": [
+            ("POST", "/api/transactions/", "POST /api/transactions/", new_transaction, "application/json"),
+            ("DELETE", "/api/transactions/{id}", "DELETE /api/transactions/{id}", None, None),
+        ],
+        # BudgetPlanner.jsx
+        "budget": [get(f"/api/plans/?year={now.year}")],
+        # RegularTransactions.jsx
+        "regular": [get("/api/regular/")],
+        # AssetSimulation.jsx ({goal_id}는 목표 목록 응답으로 치환)
+        "simulation": [
+            get("/api/simulation/goals"),
+            ("GET", "/api/simulation/analyze/{goal_id}", "GET /api/simulation/analyze/{goal_id}", None, None),
+        ],
+        "tax": [
+            ("POST", "/api/tax/calculate", "POST /api/tax/calculate",
+             json.dumps({"amount": 3500000, "type": "salary", "dependents": 1}).encode(), "application/json"),
+        ],
+        # ExcelImport.jsx
+        "import": [("POST", "/api/excel/import", "POST /api/excel/import", import_body, import_type)],
+        "export": [
+            get("/api/excel/export/transactions"),
+            get(f"/api/excel/export/monthly-report?year={now.year}&month={now.month}"),
+        ],
+    }
+
+
+class Recorder:
+    """라우트별 지연 시간/오류 기록 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, route: str, elapsed_ms: float, ok: bool):
+        with self._lock:
+            self.latencies[route].append(elapsed_ms)
+            if not ok:
+                self.errors[route] += 1
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """정렬된 목록의 nearest-rank 백분위수"""
+    if not ordered:
+        return 0.0
+    rank = math.ceil(q / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def histogram(ordered: List[float]) -> List[int]:
+    counts = [0] * len(HISTOGRAM_BUCKETS)
+    bucket = 0
+    for value in ordered:
+        while value > HISTOGRAM_BUCKETS[bucket]:
+            bucket += 1
+        counts[bucket] += 1
+    return counts
+
+
+def virtual_user(host: str, port: int, scenarios: dict, weights: dict, recorder: Recorder,
+                 deadline: float, seed: int):
+    """마감 시각까지 가중치에 따라 시나리오를 골라 순서대로 요청 (keep-alive 연결 재사용)"""
+    rng = random.Random(seed)
+    names, values = list(weights), list(weights.values())
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    context = {}
+
+    while time.perf_counter() < deadline:
+        for method, path, route, body, content_type in scenarios[rng.choices(names, values)[0]]:
+            if "{id}" in path and "id" not in context:
+                break
+            if "{goal_id}" in path and "goal_id" not in context:
+                break
+            path = path.replace("{id}", str(context.get("id"))).replace("{goal_id}", str(context.get("goal_id")))
+            headers = {"Content-Type": content_type} if content_type else {}
+
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()
+                ok = response.status < 400
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=60)
+                payload, ok = b"", False
+            recorder.record(route, (time.perf_counter() - start) * 1000, ok)
+
+            context.pop("id", None)
+            if ok and route == "POST /api/transactions/":
+                context["id"] = json.loads(payload)["id"]
+            elif ok and route == "GET /api/simulation/goals":
+                goals = json.loads(payload)
+                if goals:
+                    context["goal_id"] = goals[0]["id"]
+            if not ok:
+                break
+    conn.close()
+
+
+def build_report(recorder: Recorder, duration: float) -> dict:
+    routes = {}
+    for route, samples in sorted(recorder.latencies.items()):
+        ordered = sorted(samples)
+        routes[route] = {
+            "count": len(ordered),
+            "errors": recorder.errors[route],
+            "error_rate": round(recorder.errors[route] / len(ordered), 4),
+            "throughput_rps": round(len(ordered) / duration, 2),
+            "p50_ms": round(percentile(ordered, 50), 2),
+            "p95_ms": round(percentile(ordered, 95), 2),
+            "p99_ms": round(percentile(ordered, 99), 2),
+            "max_ms": round(ordered[-1], 2),
+            "histogram": dict(zip((str(b) for b in HISTOGRAM_BUCKETS), histogram(ordered))),
+        }
+    total = sum(r["count"] for r in routes.values())
+    return {
+        "duration_s": round(duration, 2),
+        "total_requests": total,
+        "throughput_rps": round(total / duration, 2),
+        "routes": routes,
+    }
+
+
+def print_report(report: dict):
+    print(f"\n{'route':<48}{'count':>7}{'err':>6}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for route, r in report["routes"].items():
+        print(f"{route:<48}{r['count']:>7}{r['errors']:>6}{r['throughput_rps']:>8.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}")
+        peak = max(r["histogram"].values()) or 1
+        for bound, count in r["histogram"].items():
+            if count:
+                label = f"<= {bound} ms" if bound != "inf" else "> 10000 ms"
+                print(f"    {label:>12} {'#' * max(1, round(30 * count / peak))} {count}")
+    print(f"\ntotal {report['total_requests']} requests in {report['duration_s']}s "
+          f"({report['throughput_rps']} req/s)")
+
+
+def check_slo(report: dict, slo: dict) -> List[str]:
+    """SLO 위반 목록"""
+    violations = []
+    for route, r in report["routes"].items():
+        limits = {**slo.get("default", {}), **slo.get("routes", {}).get(route, {})}
+        for metric, limit in limits.items():
+            if r.get(metric, 0) > limit:
+                violations.append(f"{route} {metric}={r[metric]} > {limit}")
+    return violations
+
+
+def wait_for_health(host: str, port: int, server: subprocess.Popen, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not become healthy in time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the finance API with uvicorn workers")
+    parser.add_argument("--scale", default="10k", help="seed scale (10k, 1m, 10m)")
+    parser.add_argument("--rows", type=int, help="explicit seed transaction count (overrides --scale)")
+    parser.add_argument("--workdir", help="directory for the seeded database (default: temporary)")
+    parser.add_argument("--reuse", action="store_true", help="reuse an already seeded database in --workdir")
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of traffic")
+    parser.add_argument("--mix", default="mixed",
+                        help=f"traffic mix preset ({', '.join(MIXES)}) or JSON file of scenario weights")
+    parser.add_argument("--import-rows", type=int, default=200, help="rows per import request")
+    parser.add_argument("--slo", help="JSON file with SLO limits (default: built-in)")
+    parser.add_argument("--output", help="write the JSON report to this path")
+    args = parser.parse_args()
+
+    if args.mix in MIXES:
+        weights = MIXES[args.mix]
+    else:
+        with open(args.mix, encoding="utf-8") as f:
+            weights = json.load(f)
+    slo = DEFAULT_SLO
+    if args.slo:
+        with open(args.slo, encoding="utf-8") as f:
+            slo = json.load(f)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="finance-load-")
+    os.makedirs(workdir, exist_ok=True)
+    db_path = os.path.join(workdir, "finance.db")
+    os.environ["FINANCE_DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["FINANCE_SNAPSHOT_DIR"] = os.path.join(workdir, "snapshots")
+
+    from . import generate
+
+    rows = args.rows or generate.SCALES[args.scale.lower()]
+    if not (args.reuse and os.path.exists(db_path)):
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        generate.seed_database(os.environ["FINANCE_DATABASE_URL"], rows)
+
+    csv_path = os.path.join(workdir, "import.csv")
+    generate.write_kakaopay_csv(csv_path, args.import_rows, seed=7)
+    with open(csv_path, "rb") as f:
+        scenarios = build_scenarios(f.read())
+    unknown = set(weights) - set(scenarios)
+    if unknown:
+        parser.error(f"unknown scenarios in mix: {', '.join(sorted(unknown))}")
+
+    host = "127.0.0.1"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--host", host,
+         "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=REPO_ROOT, env=os.environ.copy()
+    )
+    try:
+        wait_for_health(host, args.port, server)
+        recorder = Recorder()
+        start = time.perf_counter()
+        deadline = start + args.duration
+        threads = [
+            threading.Thread(target=virtual_user,
+                             args=(host, args.port, scenarios, weights, recorder, deadline, i))
+            for i in range(args.concurrency)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        duration = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    report = build_report(recorder, duration)
+    report["meta"] = {
+        "rows": rows,
+        "workers": args.workers,
+        "concurrency": args.concurrency,
+        "mix": weights,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+    print_report(report)
+
+    violations = check_slo(report, slo)
+    report["slo_violations"] = violations
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if violations:
+        print("\nSLO violations:")
+        for v in violations:
+            print(f"  {v}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+성능 벤치마크 스위트
+
+합성 데이터로 채운 데이터베이스에 대해 임포트, 목록 조회, 통계, 내보내기,
+시뮬레이션, 세금 계산 엔드포인트를 측정하고 JSON 결과를 출력한다.
+저장된 기준선(baseline)과 비교해 중앙값이 허용치 이상 느려지면 실패(exit 1)한다.
+
+예시:
+    python -m backend.benchmarks.run --scale 10k --output bench.json
+    python -m backend.benchmarks.run --scale 10k --save-baseline
+    python -m backend.benchmarks.run --scale 10k --compare
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """측정값(ms) 요약 통계"""
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0], 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p95_ms": round(ordered[p95_index], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def measure(func: Callable[[], None], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """워밍업 후 repeat회 실행 시간 측정"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def build_cases(client, import_csv: bytes) -> Dict[str, Callable[[], None]]:
+    """벤치마크 케이스: 이름 -> 실행 함수 (응답 상태 코드 검증 포함)"""
+    now = datetime.now()
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    def get(url, **params):
+        def run():
+            response = client.get(url, params=params)
+            assert response.status_code == 200, (url, response.status_code, response.text[:200])
+        return run
+
+    def post(url, **kwargs):
+        def run():
+            response = client.post(url, **kwargs)
+            assert response.status_code in (200, 201), (url, response.status_code, response.text[:200])
+        return run
+
+    def import_file():
+        # 작업 등록부터 백그라운드 임포트 완료까지 측정
+        response = client.post("/api/excel/import", files={"file": ("kakaopay.csv", import_csv, "text/csv")})
+        assert response.status_code == 202, (response.status_code, response.text[:200])
+        job_url = f"/api/excel/jobs/{response.json()['id']}"
+        while True:
+            job = client.get(job_url).json()
+            if job["status"] in ("completed", "failed"):
+                break
+            time.sleep(0.01)
+        assert job["status"] == "completed", job
+
+    return {
+        "import_csv": import_file,
+        "list_transactions": get("/api/transactions/", limit=1000),
+        "list_transactions_filtered": get(
+            "/api/transactions/", limit=1000,
+            start_date=month_start.isoformat(), end_date=now.isoformat(), type="expense"
+        ),
+        "search_transactions": get("/api/transactions/", q="스타벅스", limit=100),
+        "stats_monthly": get("/api/transactions/stats/monthly", year=now.year, month=now.month),
+        "stats_category": get(
+            "/api/transactions/stats/category", year=now.year, month=now.month, type="expense"
+        ),
+        "export_transactions": get("/api/excel/export/transactions"),
+        "export_monthly_report": get("/api/excel/export/monthly-report", year=now.year, month=now.month),
+        "simulation_analyze": get("/api/simulation/analyze/1"),
+        "tax_salary": post("/api/tax/calculate", json={"amount": 3500000, "type": "salary", "dependents": 1}),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """기준선 대비 중앙값이 (1 + tolerance)배를 넘는 케이스 목록"""
+    regressions = []
+    print(f"{'case':<28}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for name, current in results["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            print(f"{name:<28}{'-':>12}{current['median_ms']:>12.2f}{'new':>8}")
+            continue
+        ratio = current["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        flag = " !" if ratio > 1 + tolerance else ""
+        print(f"{name:<28}{base['median_ms']:>12.2f}{current['median_ms']:>12.2f}{ratio:>8.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the finance backend benchmark suite")
+    parser.add_argument("--scale", default="10k", help="seed scale (10k, 1m, 10m)")
+    parser.add_argument("--rows", type=int, help="explicit seed transaction count (overrides --scale)")
+    parser.add_argument("--workdir", help="directory for the seeded database (default: temporary)")
+    parser.add_argument("--reuse", action="store_true", help="reuse an already seeded database in --workdir")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--import-rows", type=int, default=1000, help="rows per import_csv run")
+    parser.add_argument("--cases", help="comma-separated subset of cases to run")
+    parser.add_argument("--output", help="write JSON results to this path")
+    parser.add_argument("--save-baseline", action="store_true", help=f"store results as {BASELINE_PATH}")
+    parser.add_argument("--compare", action="store_true", help="compare against the stored baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed median slowdown ratio before failing (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="finance-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    db_path = os.path.join(workdir, "finance.db")
+
+    # 앱 모듈이 설정을 읽기 전에 벤치마크용 경로 지정
+    os.environ["FINANCE_DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["FINANCE_SNAPSHOT_DIR"] = os.path.join(workdir, "snapshots")
+
+    from . import generate
+
+    rows = args.rows or generate.SCALES[args.scale.lower()]
+    if not (args.reuse and os.path.exists(db_path)):
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        start = time.perf_counter()
+        generate.seed_database(os.environ["FINANCE_DATABASE_URL"], rows)
+        print(f"Seeded {rows} transactions in {time.perf_counter() - start:.1f}s ({db_path})", file=sys.stderr)
+
+    csv_path = os.path.join(workdir, "import.csv")
+    generate.write_kakaopay_csv(csv_path, args.import_rows, seed=7)
+    with open(csv_path, "rb") as f:
+        import_csv = f.read()
+
+    from fastapi.testclient import TestClient
+    from ..app import config
+    from ..app.main import app
+
+    results = {
+        "meta": {
+            "rows": rows,
+            "import_rows": args.import_rows,
+            "repeat": args.repeat,
+            "analytics_engine": config.ANALYTICS_ENGINE,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": {},
+    }
+    # with 블록에서 lifespan(스키마 준비) 실행
+    with TestClient(app) as client:
+        cases = build_cases(client, import_csv)
+        selected = args.cases.split(",") if args.cases else list(cases)
+        for name in selected:
+            results["results"][name] = measure(cases[name], args.repeat)
+            print(f"{name:<28}{results['results'][name]['median_ms']:>10.2f} ms", file=sys.stderr)
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(output)
+
+    if args.compare:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"]["rows"] != rows:
+            print(f"warning: baseline was recorded with {baseline['meta']['rows']} rows", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressions: {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+서버 기동 시간 벤치마크
+
+`python -X importtime`으로 backend.app.main 임포트 시간을 측정하고 예산과 비교한다.
+- 임포트 전체 시간이 --budget-ms를 넘거나
+- 프레임워크(FRAMEWORK_MODULES)를 미리 임포트한 뒤 잰 앱 코드만의 임포트 시간이 --app-budget-ms를 넘거나
+- 지연 로드 대상 모듈(pandas, openpyxl 등)이 임포트 시점에 로드되면 실패(exit 1)
+lifespan의 스키마 준비(init_db) 시간도 빈 임시 데이터베이스로 측정한다.
+전체 시간은 대부분 FastAPI/SQLAlchemy 임포트라 기기마다 크게 다르므로, backend/tests/test_startup.py는
+전체 시간을 제외한 예산(check(include_total=False))을 검사한다.
+
+예시:
+    python -m backend.benchmarks.startup
+    python -m backend.benchmarks.startup --budget-ms 600 --output startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+TARGET_MODULE = "backend.app.main"
+
+# 첫 사용 시까지 로드를 미뤄야 하는 무거운 모듈
+LAZY_MODULES = ("pandas", "numpy", "openpyxl", "pyarrow", "duckdb")
+
+# 앱 코드만의 임포트 시간을 잴 때 미리 임포트하는 프레임워크 모듈
+FRAMEWORK_MODULES = (
+    "fastapi", "fastapi.responses", "starlette.middleware.gzip",
+    "pydantic", "sqlalchemy.orm", "sqlalchemy.dialects.sqlite",
+)
+
+DEFAULT_IMPORT_BUDGET_MS = 1000
+DEFAULT_APP_IMPORT_BUDGET_MS = 400
+DEFAULT_INIT_BUDGET_MS = 1000
+
+INIT_SCRIPT = """
+import time
+from backend.app.database import init_db
+start = time.perf_counter()
+init_db()
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """-X importtime 출력 -> {모듈: (self_us, cumulative_us)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure_import(env: dict, preload: Tuple[str, ...] = ()) -> Dict[str, Tuple[int, int]]:
+    """새 프로세스에서 preload 모듈을 먼저 임포트한 뒤 TARGET_MODULE 임포트 (-X importtime 결과)"""
+    statements = [f"import {module}" for module in (*preload, TARGET_MODULE)]
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "; ".join(statements)],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_init(env: dict) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", INIT_SCRIPT],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def check(
+    workdir: str,
+    runs: int = 3,
+    budget_ms: float = DEFAULT_IMPORT_BUDGET_MS,
+    app_budget_ms: float = DEFAULT_APP_IMPORT_BUDGET_MS,
+    init_budget_ms: float = DEFAULT_INIT_BUDGET_MS,
+    include_total: bool = True,
+) -> dict:
+    """workdir의 빈 데이터베이스로 기동 시간을 재고 예산을 넘은 항목을 failures에 담아 반환 (임포트는 runs번 중 최소)"""
+    env = os.environ.copy()
+    env["FINANCE_DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'finance.db')}"
+    env["FINANCE_SNAPSHOT_DIR"] = os.path.join(workdir, "snapshots")
+
+    modules = min((measure_import(env) for _ in range(runs)), key=lambda m: m[TARGET_MODULE][1])
+    import_ms = modules[TARGET_MODULE][1] / 1000
+    app_import_ms = min(
+        measure_import(env, FRAMEWORK_MODULES)[TARGET_MODULE][1] for _ in range(runs)
+    ) / 1000
+    init_ms = measure_init(env)
+    eager = sorted(m for m in modules if m.split(".")[0] in LAZY_MODULES and "." not in m)
+
+    failures = []
+    if include_total and import_ms > budget_ms:
+        failures.append(f"import time {import_ms:.1f} ms exceeds budget {budget_ms:.0f} ms")
+    if app_import_ms > app_budget_ms:
+        failures.append(f"app import time {app_import_ms:.1f} ms exceeds budget {app_budget_ms:.0f} ms")
+    if init_ms > init_budget_ms:
+        failures.append(f"init_db time {init_ms:.1f} ms exceeds budget {init_budget_ms:.0f} ms")
+    if eager:
+        failures.append(f"modules that should load lazily were imported at startup: {', '.join(eager)}")
+    return {
+        "import_ms": import_ms,
+        "app_import_ms": app_import_ms,
+        "init_ms": init_ms,
+        "eager_lazy_modules": eager,
+        "modules": modules,
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check backend cold-start import time against budgets")
+    parser.add_argument("--runs", type=int, default=3, help="import measurements (minimum is reported)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_IMPORT_BUDGET_MS)
+    parser.add_argument("--app-budget-ms", type=float, default=DEFAULT_APP_IMPORT_BUDGET_MS)
+    parser.add_argument("--init-budget-ms", type=float, default=DEFAULT_INIT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15, help="show the N slowest modules by self time")
+    parser.add_argument("--output", help="write JSON results to this path")
+    args = parser.parse_args()
+
+    result = check(
+        tempfile.mkdtemp(prefix="finance-startup-"), args.runs,
+        args.budget_ms, args.app_budget_ms, args.init_budget_ms,
+    )
+    failures = result["failures"]
+    slowest: List[Tuple[str, int]] = sorted(
+        ((name, self_us) for name, (self_us, _) in result["modules"].items()), key=lambda x: -x[1]
+    )[:args.top]
+
+    print(f"{TARGET_MODULE} import: {result['import_ms']:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"{TARGET_MODULE} import after frameworks: {result['app_import_ms']:.1f} ms (budget {args.app_budget_ms:.0f} ms)")
+    print(f"init_db (empty database): {result['init_ms']:.1f} ms (budget {args.init_budget_ms:.0f} ms)")
+    print("\nslowest modules (self time):")
+    for name, self_us in slowest:
+        print(f"  {self_us / 1000:>8.1f} ms  {name}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "import_ms": round(result["import_ms"], 3),
+                "app_import_ms": round(result["app_import_ms"], 3),
+                "init_ms": round(result["init_ms"], 3),
+                "eager_lazy_modules": result["eager_lazy_modules"],
+                "slowest_modules": [{"module": n, "self_ms": round(us / 1000, 3)} for n, us in slowest],
+                "failures": failures,
+            }, f, ensure_ascii=False, indent=2)
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
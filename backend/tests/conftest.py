@@ -0,0 +1,25 @@
+"""
+테스트 환경: 데이터베이스와 파생 파일 경로를 임시 디렉터리로
+
+config는 임포트할 때 환경 변수를 읽으므로 backend.app을 임포트하기 전에 설정한다.
+"""
+import os
+import shutil
+import tempfile
+
+_root = tempfile.mkdtemp(prefix="finance-test-")
+
+os.environ["FINANCE_DATABASE_URL"] = f"sqlite:///{os.path.join(_root, 'finance.db')}"
+for name, directory in (
+    ("FINANCE_SNAPSHOT_DIR", "snapshots"),
+    ("FINANCE_ARCHIVE_DIR", "archive"),
+    ("FINANCE_REPORT_CACHE_DIR", "reports"),
+    ("FINANCE_BACKUP_DIR", "backups"),
+    ("FINANCE_UPLOAD_DIR", "uploads"),
+):
+    os.environ[name] = os.path.join(_root, directory)
+os.environ["FINANCE_WARMUP"] = "0"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_root, ignore_errors=True)
@@ -0,0 +1,92 @@
+"""SQLite / DuckDB 집계 엔진 결과 일치 (임시 데이터베이스)"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+from backend.app import crud, models, schemas  # noqa: E402
+from backend.app.core import analytics, analytics_parity, snapshot  # noqa: E402
+from backend.app.database import SessionLocal, init_db  # noqa: E402
+
+CATEGORIES = ["식비", "교통", "쇼핑", "급여", "저축", None]
+START = datetime(2024, 1, 1)
+DAYS = 540
+
+
+def _transactions(count: int, seed: int = 7):
+    rnd = random.Random(seed)
+    return [
+        schemas.TransactionCreate(
+            date=START + timedelta(seconds=rnd.randrange(DAYS * 86400)),
+            description=f"거래처 {rnd.randrange(40)}",
+            amount=rnd.randrange(100, 500_000),
+            category=rnd.choice(CATEGORIES),
+            type=models.TransactionType.INCOME if rnd.random() < 0.2 else models.TransactionType.EXPENSE,
+            status=models.TransactionStatus.CANCELLED if rnd.random() < 0.05 else models.TransactionStatus.COMPLETED,
+        )
+        for _ in range(count)
+    ]
+
+
+@pytest.fixture(scope="module")
+def db():
+    init_db()
+    session = SessionLocal()
+    crud.create_transactions(session, _transactions(3000))
+    yield session
+    session.close()
+
+
+def test_stats_and_balance_parity(db):
+    assert analytics_parity.check_parity(db) == []
+
+
+@pytest.mark.parametrize("interval", list(crud.BALANCE_INTERVALS))
+def test_balance_parity_for_range_with_excluded_categories(db, interval):
+    assert analytics_parity.compare_balance(
+        db, interval,
+        start_date=datetime(2024, 2, 10, 12), end_date=datetime(2025, 3, 20, 18),
+        exclude_categories=["저축", "쇼핑"],
+    ) == []
+
+
+def test_multi_month_totals_match_sum_of_months(db):
+    months = [(2024, m) for m in range(1, 13)]
+    income, expense, count = analytics.totals(db, analytics.month_range(2024, 1)[0], analytics.month_range(2024, 12)[1])
+    stats = [crud.get_monthly_stats(db, year, month, analytics_engine="sqlite") for year, month in months]
+    assert (income, expense, count) == (
+        sum(s.total_income for s in stats),
+        sum(s.total_expense for s in stats),
+        sum(s.transaction_count for s in stats),
+    )
+
+
+def test_writes_reload_only_changed_months(db):
+    before = crud.get_monthly_stats(db, 2024, 3, analytics_engine="duckdb")
+    created = crud.create_transaction(db, schemas.TransactionCreate(
+        date=datetime(2024, 3, 15, 9), description="추가 수입", amount=12345,
+        category="급여", type=models.TransactionType.INCOME,
+    ))
+    after = crud.get_monthly_stats(db, 2024, 3, analytics_engine="duckdb")
+    assert after.total_income == before.total_income + 12345
+    assert after == crud.get_monthly_stats(db, 2024, 3, analytics_engine="sqlite")
+
+    # 다른 달로 옮기면 두 달 모두 다시 적재됨
+    crud.update_transaction(db, created.id, schemas.TransactionUpdate(date=datetime(2024, 4, 2, 9)))
+    assert crud.get_monthly_stats(db, 2024, 3, analytics_engine="duckdb") == before
+    assert analytics_parity.check_parity(db) == []
+
+
+def test_unchanged_data_skips_snapshot_refresh(db, monkeypatch):
+    crud.get_monthly_stats(db, 2024, 5, analytics_engine="duckdb")
+
+    def refresh_snapshot(*args, **kwargs):
+        raise AssertionError("snapshot refreshed without a data change")
+
+    monkeypatch.setattr(snapshot, "refresh_snapshot", refresh_snapshot)
+    crud.get_monthly_stats(db, 2024, 6, analytics_engine="duckdb")
+    crud.get_category_stats(db, 2024, 6, models.TransactionType.EXPENSE, analytics_engine="duckdb")
+    crud.get_balance_series(db, interval="month", analytics_engine="duckdb")
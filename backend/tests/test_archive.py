@@ -0,0 +1,84 @@
+"""연도 보관 전후 조회 결과 일치 (검색, 월별 통계, 스트리밍, 지출 이상치)"""
+import json
+import random
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from backend.app import crud, models, schemas
+from backend.app.api import transactions as transactions_api
+from backend.app.core import anomalies, archive
+from backend.app.database import SessionLocal, init_db
+from backend.app.main import app
+
+YEAR = 2020
+CATEGORY = "보관테스트"
+
+
+def _transactions(rnd: random.Random, count: int):
+    rows = [
+        schemas.TransactionCreate(
+            date=datetime(YEAR, 1, 1) + timedelta(minutes=rnd.randrange(365 * 1440)),
+            description=f"{rnd.choice(['archivecafe', 'archivemart', '보관 편의점'])} {rnd.randrange(100)}",
+            amount=rnd.randrange(9_000, 11_000),
+            category=rnd.choice([CATEGORY, "보관수입", None]),
+            type=models.TransactionType.EXPENSE,
+            status=models.TransactionStatus.CANCELLED if rnd.random() < 0.1 else models.TransactionStatus.COMPLETED,
+        )
+        for _ in range(count)
+    ]
+    for row in rows[::9]:
+        row.type = models.TransactionType.INCOME
+    return rows
+
+
+def _state(db, client):
+    def listed(rows):
+        return sorted(schemas.TransactionResponse.model_validate(t).model_dump_json() for t in rows)
+
+    period = {"start_date": datetime(YEAR, 1, 1), "end_date": datetime(YEAR, 12, 31, 23, 59, 59)}
+    stream = client.get("/api/transactions/stream", params={k: v.isoformat() for k, v in period.items()})
+    assert stream.status_code == 200
+    streamed = [json.loads(line) for line in stream.text.splitlines()]
+    return {
+        "search": {q: listed(crud.get_transactions(db, limit=1000, q=q, **period))
+                   for q in ("archivecafe", "보관", "archivemart 4")},
+        "listed": [t.id for t in crud.get_transactions(db, skip=5, limit=50, **period)],
+        "category": listed(crud.get_transactions(db, limit=1000, category=CATEGORY, **period)),
+        "monthly": [crud.get_monthly_stats(db, YEAR, month) for month in range(1, 13)],
+        "stream": streamed,
+        "stats": [s for s in anomalies.get_spending_stats(db, until=datetime(YEAR, 12, 1)) if s.category == CATEGORY],
+        "anomalies": [a for a in anomalies.get_anomalies(db, start_date=period["start_date"], limit=1000)
+                      if a.category == CATEGORY],
+    }
+
+
+def test_archive_keeps_query_results(monkeypatch):
+    init_db()
+    # 스트리밍 페이지가 현재 테이블과 보관 파일 경계를 넘도록 작게
+    monkeypatch.setattr(transactions_api, "STREAM_CHUNK_SIZE", 7)
+    rnd = random.Random(45)
+    # lifespan을 실행하면 종료 시 백업 스레드가 멈추므로 앱 라우트만 사용
+    client = TestClient(app)
+    db = SessionLocal()
+    try:
+        crud.create_transactions(db, _transactions(rnd, 120))
+        crud.create_transaction(db, schemas.TransactionCreate(
+            date=datetime(YEAR, 8, 15), description="archivecafe 큰 지출", amount=500_000,
+            category=CATEGORY, type=models.TransactionType.EXPENSE,
+        ))
+        before = _state(db, client)
+        assert len(before["stream"]) == 121 and before["anomalies"]
+
+        archive.archive_year(db, YEAR)
+        db.rollback()
+        assert _state(db, client) == before
+
+        # 보관 이후 추가된 거래는 현재 테이블과 보관 파일에서 함께 읽고, 다시 보관해도 결과가 같음
+        crud.create_transactions(db, _transactions(rnd, 30))
+        before = _state(db, client)
+        archive.archive_year(db, YEAR)
+        db.rollback()
+        assert _state(db, client) == before
+    finally:
+        db.close()
@@ -0,0 +1,55 @@
+"""백업/복원에 보관 파일 포함"""
+import os
+from datetime import datetime
+
+from backend.app import crud, models, schemas
+from backend.app.core import archive, backup
+from backend.app.database import SessionLocal, engine, init_db
+
+YEAR = 2019
+
+
+def _transaction(day: int, amount: int) -> schemas.TransactionCreate:
+    return schemas.TransactionCreate(
+        date=datetime(YEAR, 3, day, 12), description=f"백업 거래 {day}", amount=amount,
+        category="식비", type=models.TransactionType.EXPENSE,
+    )
+
+
+def test_restore_brings_back_replaced_archive_file():
+    init_db()
+    db = SessionLocal()
+    try:
+        crud.create_transactions(db, [_transaction(day, 1000 * day) for day in range(1, 6)])
+        archived = archive.archive_year(db, YEAR)
+        before = crud.get_monthly_stats(db, YEAR, 3, analytics_engine="sqlite")
+
+        result = backup.backup_database(engine, prune_old=False)
+        saved = os.path.join(backup.archives_dir(result.path), os.path.basename(archived.path))
+        assert os.path.exists(saved)
+
+        # 다시 보관하면 이전 보관 파일이 지워짐
+        crud.create_transactions(db, [_transaction(10, 50_000)])
+        replaced = archive.archive_year(db, YEAR)
+        assert replaced.path != archived.path
+        assert not os.path.exists(archived.path)
+
+        backup.restore(result.path)
+        db.rollback()
+        assert archive.find(db, YEAR).path == archived.path
+        assert os.path.exists(archived.path)
+        assert crud.get_monthly_stats(db, YEAR, 3, analytics_engine="sqlite") == before
+    finally:
+        db.close()
+
+
+def test_prune_removes_saved_archive_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(backup, "backup_dir", lambda tenant=None: str(tmp_path))
+    for name in ("finance_20240101_000000_aaaa", "finance_20240102_000000_bbbb"):
+        (tmp_path / f"{name}.db").write_bytes(b"")
+        (tmp_path / f"{name}.archives").mkdir()
+        (tmp_path / f"{name}.archives" / "transactions_2019_0000.db").write_bytes(b"")
+
+    removed = backup.prune(keep=1)
+    assert [os.path.basename(path) for path in removed] == ["finance_20240101_000000_aaaa.db"]
+    assert sorted(os.listdir(tmp_path)) == ["finance_20240102_000000_bbbb.archives", "finance_20240102_000000_bbbb.db"]
@@ -0,0 +1,85 @@
+"""일별 누적합 인덱스와 원시 집계 일치 (쓰기/보관 이후)"""
+import random
+import sqlite3
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+pytest.importorskip("numpy")
+
+from backend.app import crud, models, schemas  # noqa: E402
+from backend.app.core import archive, daily_index  # noqa: E402
+from backend.app.database import SessionLocal, init_db  # noqa: E402
+
+ARCHIVED_YEAR = 2021
+START, END = date(ARCHIVED_YEAR, 1, 1), date(ARCHIVED_YEAR + 1, 12, 31)
+CATEGORIES = ["식비", "교통", "문화", None]
+
+_SUM = f"""
+    SELECT ifnull(category_id, 0), type, count(*), sum(amount) FROM transactions
+    WHERE status = {daily_index.COMPLETED} AND date >= :start AND date < :end
+    GROUP BY 1, 2
+"""
+
+
+def _transaction(rnd: random.Random) -> schemas.TransactionCreate:
+    return schemas.TransactionCreate(
+        date=datetime.combine(START, datetime.min.time()) + timedelta(minutes=rnd.randrange(730 * 1440)),
+        description=f"일별 거래 {rnd.randrange(20)}",
+        amount=rnd.randrange(100, 200_000),
+        category=rnd.choice(CATEGORIES),
+        type=rnd.choice(list(models.TransactionType)),
+        status=models.TransactionStatus.CANCELLED if rnd.random() < 0.1 else models.TransactionStatus.COMPLETED,
+    )
+
+
+def _plain_sums(db, start: date, end: date):
+    """현재 테이블과 보관 파일을 따로 SUM으로 집계해 합친 (category_id, 타입 코드, 건수, 합계)"""
+    params = {"start": start.isoformat(), "end": (end + timedelta(days=1)).isoformat()}
+    rows = list(db.execute(text(_SUM), params))
+    for archived in archive.list_archives(db):
+        conn = sqlite3.connect(archived.path)
+        try:
+            rows += conn.execute(_SUM, params).fetchall()
+        finally:
+            conn.close()
+    merged = {}
+    for category_id, type, count, total in rows:
+        previous_count, previous_total = merged.get((category_id, type), (0, 0))
+        merged[(category_id, type)] = (previous_count + count, previous_total + total)
+    return sorted((c, t, count, total) for (c, t), (count, total) in merged.items())
+
+
+def test_index_matches_raw_sums_after_writes_and_archive():
+    init_db()
+    db = SessionLocal()
+    rnd = random.Random(44)
+    try:
+        created = [crud.create_transaction(db, _transaction(rnd)) for _ in range(300)]
+        # 메모리 인덱스를 먼저 만들어 이후 쓰기가 증분 갱신으로 반영되는지 확인
+        daily_index.range_totals(db, START, END)
+
+        for transaction in rnd.sample(created, 80):
+            crud.update_transaction(db, transaction.id, schemas.TransactionUpdate(
+                date=transaction.date + timedelta(days=rnd.randint(-40, 40)),
+                amount=rnd.randrange(100, 200_000),
+                category=rnd.choice(CATEGORIES),
+                status=rnd.choice(list(models.TransactionStatus)),
+            ))
+        for transaction in rnd.sample(created, 40):
+            crud.delete_transaction(db, transaction.id)
+        daily_index.range_totals(db, START, END)
+
+        archive.archive_year(db, ARCHIVED_YEAR)
+        # 보관 이후 그 해에 추가된 거래는 현재 테이블에 남음
+        for _ in range(20):
+            crud.create_transaction(db, _transaction(rnd).model_copy(update={"date": datetime(ARCHIVED_YEAR, 6, 15)}))
+        db.rollback()
+
+        assert daily_index.check_consistency(db, samples=100, seed=44) == []
+        for start, end in [(START, END), (date(ARCHIVED_YEAR, 3, 1), date(ARCHIVED_YEAR + 1, 2, 28)),
+                           (date(ARCHIVED_YEAR, 6, 15), date(ARCHIVED_YEAR, 6, 15))]:
+            assert sorted(daily_index.range_totals(db, start, end)) == _plain_sums(db, start, end)
+    finally:
+        db.close()
@@ -0,0 +1,13 @@
+"""금액 컬럼 반올림이 SQLite round()와 일치"""
+import pytest
+from sqlalchemy import text
+
+from backend.app import models
+from backend.app.database import engine
+
+
+@pytest.mark.parametrize("amount", [0.5, 1.5, 2.5, -0.5, -2.5, 2.675, 1234.4999, 1e6 + 0.5, 7, 0.1 + 0.2])
+def test_won_rounds_like_sqlite(amount):
+    with engine.connect() as conn:
+        expected = conn.execute(text("SELECT CAST(round(:amount) AS INTEGER)"), {"amount": amount}).scalar()
+    assert models.Won().process_bind_param(amount, engine.dialect) == expected
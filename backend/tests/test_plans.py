@@ -0,0 +1,58 @@
+"""재무 계획 일괄 저장과 (연, 월, 카테고리) 중복 정리 마이그레이션"""
+from sqlalchemy import create_engine, text
+
+from backend.app import crud, migrations, models, schemas
+from backend.app.database import Base, SessionLocal, init_db
+
+
+def test_bulk_upsert_keeps_last_duplicate():
+    init_db()
+    db = SessionLocal()
+    try:
+        plans = crud.upsert_budget_plans(db, [
+            schemas.BudgetPlanCreate(year=2031, month=1, category="식비", planned_amount=100),
+            schemas.BudgetPlanCreate(year=2031, month=1, category="교통", planned_amount=50),
+            schemas.BudgetPlanCreate(year=2031, month=1, category="식비", planned_amount=200),
+        ])
+        assert [(p.category, p.planned_amount) for p in plans] == [("교통", 50), ("식비", 200)]
+
+        stored = crud.get_budget_plans(db, year=2031, month=1)
+        assert sorted((p.category, p.planned_amount) for p in stored) == [("교통", 50), ("식비", 200)]
+
+        # 기존 계획 갱신에서도 중복 요청은 계획 하나로 반환
+        plans = crud.upsert_budget_plans(db, [
+            schemas.BudgetPlanCreate(year=2031, month=1, category="식비", planned_amount=300),
+            schemas.BudgetPlanCreate(year=2031, month=1, category="식비", planned_amount=400),
+        ])
+        assert [(p.category, p.planned_amount) for p in plans] == [("식비", 400)]
+        assert plans[0].id == next(p.id for p in stored if p.category == "식비")
+    finally:
+        db.close()
+
+
+def test_unique_period_migration_keeps_latest_duplicate(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    Base.metadata.create_all(bind=engine, tables=[models.Category.__table__, models.Transaction.__table__])
+    with engine.begin() as conn:
+        # 유니크 제약이 생기기 전의 budget_plans
+        conn.execute(text("""
+            CREATE TABLE budget_plans (
+                id INTEGER PRIMARY KEY, year INTEGER NOT NULL, month INTEGER NOT NULL,
+                category VARCHAR NOT NULL, planned_amount FLOAT NOT NULL, description VARCHAR,
+                created_at DATETIME, updated_at DATETIME
+            )
+        """))
+        conn.execute(text("""
+            INSERT INTO budget_plans (id, year, month, category, planned_amount, updated_at) VALUES
+                (1, 2024, 1, '식비', 100, '2024-01-01 00:00:00'),
+                (2, 2024, 1, '식비', 300, '2024-03-01 00:00:00'),
+                (3, 2024, 1, '식비', 200, '2024-02-01 00:00:00'),
+                (4, 2024, 2, '식비', 500, '2024-01-01 00:00:00')
+        """))
+
+    assert "budget_plans_unique_period" in migrations.run_migrations(engine)
+    assert migrations.run_migrations(engine) == []
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, month, planned_amount FROM budget_plans ORDER BY id")).all()
+    assert [tuple(r) for r in rows] == [(2, 1, 300), (4, 2, 500)]
+    engine.dispose()
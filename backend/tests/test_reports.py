@@ -0,0 +1,61 @@
+"""CSV 리포트 캐시와 압축본 전송"""
+import csv
+import io
+import os
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from backend.app import crud, models, schemas
+from backend.app.core import compression, reports
+from backend.app.database import SessionLocal, init_db
+from backend.app.main import app
+
+YEAR, MONTH = 2033, 5
+
+
+def test_csv_report_is_served_precompressed():
+    init_db()
+    db = SessionLocal()
+    try:
+        crud.create_transactions(db, [
+            schemas.TransactionCreate(
+                date=datetime(YEAR, MONTH, day), description=f"리포트 거래 {day}", amount=1000 * day,
+                category=["식비", "교통", "급여"][day % 3],
+                type=models.TransactionType.INCOME if day % 3 == 2 else models.TransactionType.EXPENSE,
+            )
+            for day in range(1, 29)
+        ])
+        stats = crud.get_monthly_stats(db, YEAR, MONTH)
+    finally:
+        db.close()
+
+    client = TestClient(app)
+    response = client.get(
+        "/api/excel/export/monthly-report", params={"year": YEAR, "month": MONTH, "format": "csv"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert rows[0] == ["구분", "항목", "금액", "비율(%)"]
+    assert ["요약", "총 지출", str(stats.total_expense), ""] in rows
+
+    with SessionLocal() as db:
+        path = reports.monthly_report(db, YEAR, MONTH, "csv")
+        xlsx = reports.monthly_report(db, YEAR, MONTH)
+        period = reports.period_report(db, YEAR, (MONTH + 2) // 3, "csv")
+    assert path + compression.SUFFIXES["gzip"] in compression.variant_paths(path)
+    assert os.path.getsize(path + compression.SUFFIXES["gzip"]) < os.path.getsize(path) * compression.PRECOMPRESS_MAX_RATIO
+    assert compression.variant_paths(xlsx) == []
+    assert compression.variant_paths(period)
+
+    # 압축을 받지 않는 클라이언트는 원본
+    plain = client.get(
+        "/api/excel/export/period-report", params={"year": YEAR, "quarter": (MONTH + 2) // 3, "format": "csv"},
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert "content-encoding" not in plain.headers
+    with open(period, "rb") as f:
+        assert plain.content == f.read()
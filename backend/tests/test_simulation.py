@@ -0,0 +1,38 @@
+"""자산 목표 분석 결과 캐시"""
+from datetime import datetime
+
+from backend.app import crud, models, schemas
+from backend.app.core import reports
+from backend.app.database import SessionLocal, init_db
+
+
+def test_goal_analysis_is_cached_until_goal_or_regulars_change(monkeypatch):
+    init_db()
+    db = SessionLocal()
+    calls = []
+    analyze = crud.analyze_asset_goal
+    monkeypatch.setattr(crud, "analyze_asset_goal", lambda db, goal: calls.append(goal.id) or analyze(db, goal))
+    try:
+        goal = crud.create_asset_goal(db, schemas.AssetGoalCreate(
+            title="비상금", target_amount=10_000_000, target_date=datetime(datetime.now().year + 2, 1, 1),
+        ))
+        first = reports.goal_analysis(db, goal)
+        assert reports.goal_analysis(db, crud.get_asset_goal(db, goal.id)) is first
+        assert calls == [goal.id]
+
+        # 정기 거래가 바뀌면 다시 계산
+        regular = crud.create_regular_transaction(db, schemas.RegularTransactionCreate(
+            description="월급", amount=3_000_000, type=models.TransactionType.INCOME, start_date=datetime(2024, 1, 1),
+        ))
+        with_income = reports.goal_analysis(db, crud.get_asset_goal(db, goal.id))
+        assert with_income.final_amount > first.final_amount
+        crud.delete_regular_transaction(db, regular.id)
+        assert reports.goal_analysis(db, crud.get_asset_goal(db, goal.id)).final_amount == first.final_amount
+
+        # 같은 초 안의 목표 수정도 반영
+        crud.update_asset_goal(db, goal.id, schemas.AssetGoalUpdate(current_amount=500_000))
+        updated = reports.goal_analysis(db, crud.get_asset_goal(db, goal.id))
+        assert updated.final_amount == first.final_amount + 500_000
+        assert len(calls) == 4
+    finally:
+        db.close()
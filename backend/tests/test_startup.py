@@ -0,0 +1,8 @@
+"""기동 시간 예산 (backend.benchmarks.startup)"""
+from backend.benchmarks import startup
+
+
+def test_startup_within_budget(tmp_path):
+    # 전체 임포트 시간은 대부분 프레임워크 몫이라 기기마다 달라서 벤치마크 스크립트에서만 검사
+    result = startup.check(str(tmp_path), include_total=False)
+    assert result["failures"] == []
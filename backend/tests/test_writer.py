@@ -0,0 +1,72 @@
+"""writer 그룹 커밋 큐: 호출자 컨텍스트 전달, 스레드 실패 복구, 대기 시간 제한"""
+import threading
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from contextvars import ContextVar
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from backend.app import config
+from backend.app.core import writer
+
+request_id: ContextVar[str] = ContextVar("request_id", default="")
+
+
+@pytest.fixture
+def bind(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'writer.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (value TEXT)"))
+    yield engine
+    writer.discard(engine)
+    engine.dispose()
+
+
+def _insert(session, value):
+    session.execute(text("INSERT INTO items VALUES (:value)"), {"value": value})
+    return request_id.get()
+
+
+def test_write_runs_in_callers_context(bind):
+    request_id.set("request-1")
+    assert writer.execute(Session(bind=bind), _insert, "a") == "request-1"
+
+
+def test_writer_restarts_after_thread_failure(bind, monkeypatch):
+    connect = bind.connect
+    calls = []
+
+    def failing_connect():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("connect failed")
+        return connect()
+
+    monkeypatch.setattr(bind, "connect", failing_connect)
+    queue = writer.get_writer(bind)
+    with pytest.raises(RuntimeError, match="connect failed"):
+        queue.submit(_insert, "a").result(timeout=5)
+
+    # 죽은 스레드 대신 새 writer 스레드가 시작되어 이후 쓰기가 처리됨
+    queue.submit(_insert, "b").result(timeout=5)
+    with bind.connect() as conn:
+        assert conn.execute(text("SELECT value FROM items")).scalars().all() == ["b"]
+
+
+def test_execute_gives_up_after_timeout(bind, monkeypatch):
+    monkeypatch.setattr(config, "WRITE_TIMEOUT_S", 0.1)
+    release = threading.Event()
+
+    def blocked(session):
+        release.wait(5)
+
+    db = Session(bind=bind)
+    started = time.monotonic()
+    try:
+        with pytest.raises(FuturesTimeoutError):
+            writer.execute(db, blocked)
+        assert time.monotonic() - started < 2
+    finally:
+        release.set()
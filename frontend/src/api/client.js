@@ -20,6 +20,14 @@ export const transactionsAPI = {
         apiClient.get('/api/transactions/stats/monthly', { params: { year, month } }),
     getCategoryStats: (year, month, type) =>
         apiClient.get('/api/transactions/stats/category', { params: { year, month, type } }),
+    // 임의 기간 통계 (params: start_date, end_date 또는 days)
+    getRangeStats: (params = {}) => apiClient.get('/api/transactions/stats/range', { params }),
+    getSpendingStats: (months = 3) =>
+        apiClient.get('/api/transactions/stats/spending', { params: { months } }),
+    getAnomalies: (params = {}) => apiClient.get('/api/transactions/anomalies', { params }),
+    // 누적 잔액 시계열 (params: interval, start_date, end_date, opening_balance, exclude_category 배열)
+    getBalanceSeries: (params = {}) =>
+        apiClient.get('/api/transactions/balance-series', { params, paramsSerializer: { indexes: null } }),
 };
 
 // Budget Plans API
@@ -29,6 +37,9 @@ export const budgetPlansAPI = {
     create: (data) => apiClient.post('/api/plans/', data),
     update: (id, data) => apiClient.put(`/api/plans/${id}`, data),
     delete: (id) => apiClient.delete(`/api/plans/${id}`),
+    bulkUpsert: (plans) => apiClient.post('/api/plans/bulk', plans),
+    rollover: (data) => apiClient.post('/api/plans/rollover', data),
+    fromHistory: (data) => apiClient.post('/api/plans/from-history', data),
 };
 
 // Excel API
@@ -42,6 +53,19 @@ export const excelAPI = {
             },
         });
     },
+    // 여러 파일 또는 ZIP 묶음 임포트 (파일 간 중복 거래는 한 번만 저장)
+    importBatch: (files) => {
+        const formData = new FormData();
+        Array.from(files).forEach((file) => formData.append('files', file));
+        return apiClient.post('/api/excel/import/batch', formData, {
+            headers: {
+                'Content-Type': 'multipart/form-data',
+            },
+        });
+    },
+    getJob: (jobId) => apiClient.get(`/api/excel/jobs/${jobId}`),
+    // 임포트 진행률 스트림 (progress/done 이벤트, data는 작업 JSON)
+    jobEvents: (jobId) => new EventSource(`${API_BASE_URL}/api/excel/jobs/${jobId}/events`),
     exportTransactions: (params = {}) => {
         return apiClient.get('/api/excel/export/transactions', {
             params,
@@ -54,6 +78,13 @@ export const excelAPI = {
             responseType: 'blob',
         });
     },
+    // 분기/연간 리포트 (quarter 생략 시 연간)
+    exportPeriodReport: (year, quarter) => {
+        return apiClient.get('/api/excel/export/period-report', {
+            params: { year, quarter },
+            responseType: 'blob',
+        });
+    },
 };
 
 // Regular Transactions API
@@ -63,6 +94,11 @@ export const regularTransactionsAPI = {
     create: (data) => apiClient.post('/api/regular/', data),
     update: (id, data) => apiClient.put(`/api/regular/${id}`, data),
     delete: (id) => apiClient.delete(`/api/regular/${id}`),
+    // 거래 내역에서 감지한 정기 거래 후보
+    getCandidates: (params = {}) => apiClient.get('/api/regular/candidates', { params }),
+    detectCandidates: () => apiClient.post('/api/regular/candidates/detect'),
+    acceptCandidate: (id) => apiClient.post(`/api/regular/candidates/${id}/accept`),
+    deleteCandidate: (id) => apiClient.delete(`/api/regular/candidates/${id}`),
 };
 
 // Asset Simulation API
@@ -78,4 +114,9 @@ export const taxAPI = {
     calculate: (data) => apiClient.post('/api/tax/calculate', data),
 };
 
+// Sync API (since: 이전 응답의 seq)
+export const syncAPI = {
+    getChanges: (since = 0, limit = 1000) => apiClient.get('/api/sync/', { params: { since, limit } }),
+};
+
 export default apiClient;
@@ -7,24 +7,34 @@ export default function ExcelImport() {
     const [messageType, setMessageType] = useState(''); // 'success' or 'error'
 
     const handleFileUpload = async (e) => {
-        const file = e.target.files[0];
-        if (!file) return;
+        const files = Array.from(e.target.files || []);
+        if (files.length === 0) return;
+        const isBatch = files.length > 1 || files[0].name.toLowerCase().endsWith('.zip');
 
         try {
             setUploading(true);
             setMessage('');
 
-            const response = await excelAPI.import(file);
-            setMessage(`성공적으로 ${response.data.count}건의 거래를 가져왔습니다.`);
-            setMessageType('success');
+            const response = isBatch ? await excelAPI.importBatch(files) : await excelAPI.import(files[0]);
 
             // Clear file input
             e.target.value = '';
 
-            // Reload page after 2 seconds
-            setTimeout(() => {
-                window.location.reload();
-            }, 2000);
+            const job = await waitForJob(response.data.id);
+            if (job.status === 'completed') {
+                setMessage(`성공적으로 ${job.rows_inserted}건의 거래를 가져왔습니다.`
+                    + (job.rows_duplicate ? ` (중복 ${job.rows_duplicate}건 제외)` : '')
+                    + (job.rows_failed ? ` (${job.rows_failed}건 실패)` : ''));
+                setMessageType('success');
+
+                // Reload page after 2 seconds
+                setTimeout(() => {
+                    window.location.reload();
+                }, 2000);
+            } else {
+                setMessage('파일 가져오기에 실패했습니다: ' + job.error);
+                setMessageType('error');
+            }
         } catch (error) {
             console.error('Failed to import file:', error);
             setMessage('파일 가져오기에 실패했습니다: ' + (error.response?.data?.detail || error.message));
@@ -34,6 +44,31 @@ export default function ExcelImport() {
         }
     };
 
+    // 임포트 작업 진행률을 표시하고 완료/실패 시 작업 정보 반환
+    const waitForJob = (jobId) => new Promise((resolve, reject) => {
+        const events = excelAPI.jobEvents(jobId);
+        events.addEventListener('progress', (event) => {
+            const job = JSON.parse(event.data);
+            setMessage(job.rows_total
+                ? `가져오는 중... ${job.rows_inserted} / ${job.rows_total - job.rows_failed - job.rows_duplicate}건 저장`
+                : `파일을 읽는 중... ${job.rows_parsed}행`);
+            setMessageType('success');
+        });
+        events.addEventListener('done', (event) => {
+            events.close();
+            resolve(JSON.parse(event.data));
+        });
+        events.onerror = () => {
+            // 스트림이 끊기면 상태를 한 번 더 확인
+            events.close();
+            excelAPI.getJob(jobId).then(({ data }) => (
+                data.status === 'completed' || data.status === 'failed'
+                    ? resolve(data)
+                    : reject(new Error('진행 상황 연결이 끊어졌습니다.'))
+            ), reject);
+        };
+    });
+
     const handleExportTransactions = async () => {
         try {
             const response = await excelAPI.exportTransactions();
@@ -83,6 +118,30 @@ export default function ExcelImport() {
         }
     };
 
+    const handleExportAnnualReport = async () => {
+        const year = new Date().getFullYear();
+
+        try {
+            const response = await excelAPI.exportPeriodReport(year);
+
+            const url = window.URL.createObjectURL(new Blob([response.data]));
+            const link = document.createElement('a');
+            link.href = url;
+            link.setAttribute('download', `annual_${year}_report.xlsx`);
+            document.body.appendChild(link);
+            link.click();
+            link.remove();
+            window.URL.revokeObjectURL(url);
+
+            setMessage('연간 리포트를 성공적으로 다운로드했습니다.');
+            setMessageType('success');
+        } catch (error) {
+            console.error('Failed to export report:', error);
+            setMessage('다운로드에 실패했습니다.');
+            setMessageType('error');
+        }
+    };
+
     return (
         <div>
             <h1 style={{ fontSize: '2rem', fontWeight: '700', marginBottom: 'var(--spacing-lg)' }}>
@@ -129,9 +188,9 @@ export default function ExcelImport() {
                         onDrop={(e) => {
                             e.preventDefault();
                             e.currentTarget.style.borderColor = 'var(--border)';
-                            const file = e.dataTransfer.files[0];
-                            if (file) {
-                                const fakeEvent = { target: { files: [file] } };
+                            const files = e.dataTransfer.files;
+                            if (files.length > 0) {
+                                const fakeEvent = { target: { files } };
                                 handleFileUpload(fakeEvent);
                             }
                         }}
@@ -141,14 +200,15 @@ export default function ExcelImport() {
                             파일을 드래그하거나 클릭하여 업로드
                         </p>
                         <p style={{ color: 'var(--text-tertiary)', fontSize: '0.875rem', marginBottom: 'var(--spacing-md)' }}>
-                            지원 형식: CSV, XLSX, XLS
+                            지원 형식: CSV, XLSX, XLS, ZIP (여러 파일 선택 가능)
                         </p>
 
                         <label className="btn btn-primary" style={{ cursor: 'pointer' }}>
                             {uploading ? '업로드 중...' : '파일 선택'}
                             <input
                                 type="file"
-                                accept=".csv,.xlsx,.xls"
+                                accept=".csv,.xlsx,.xls,.zip"
+                                multiple
                                 onChange={handleFileUpload}
                                 disabled={uploading}
                                 style={{ display: 'none' }}
@@ -192,6 +252,20 @@ export default function ExcelImport() {
                             </div>
                             <span style={{ fontSize: '1.5rem' }}>📊</span>
                         </button>
+
+                        <button
+                            className="btn btn-secondary"
+                            onClick={handleExportAnnualReport}
+                            style={{ justifyContent: 'space-between', padding: 'var(--spacing-md)' }}
+                        >
+                            <div>
+                                <div style={{ fontWeight: '600' }}>올해 연간 리포트</div>
+                                <div style={{ fontSize: '0.875rem', color: 'var(--text-tertiary)', marginTop: '0.25rem' }}>
+                                    월별 시트와 연간 요약, 카테고리별 지출 추이 다운로드
+                                </div>
+                            </div>
+                            <span style={{ fontSize: '1.5rem' }}>📅</span>
+                        </button>
                     </div>
                 </div>
 
@@ -203,7 +277,8 @@ export default function ExcelImport() {
                     <ul style={{ color: 'var(--text-secondary)', fontSize: '0.875rem', paddingLeft: 'var(--spacing-md)', lineHeight: '1.8' }}>
                         <li>카카오페이 앱에서 다운로드한 CSV 파일을 그대로 업로드할 수 있습니다.</li>
                         <li>파일 업로드 시 거래 내역이 자동으로 분류되어 저장됩니다.</li>
-                        <li>중복된 거래도 함께 가져오므로, 업로드 전 확인하세요.</li>
+                        <li>여러 달의 내역서를 한 번에(또는 ZIP으로 묶어) 올리면 파일 간 겹치는 거래는 한 번만 저장됩니다.</li>
+                        <li>이미 가져온 거래와의 중복은 확인하지 않으므로, 업로드 전 확인하세요.</li>
                     </ul>
                 </div>
             </div>